@@ -0,0 +1,5 @@
+"""
+Benchmark suite for the FreshFridge hot paths.
+
+Run ``python -m benchmarks.bench_freshfridge --help`` for options.
+"""
@@ -0,0 +1,230 @@
+"""
+Reproducible benchmarks for inventory, alert, persistence and reporting hot paths.
+
+Examples::
+
+    # run every benchmark at 1k, 100k and 1M items and print JSON
+    python -m benchmarks.bench_freshfridge
+
+    # record a baseline, then fail (exit status 1) if a later run is >25% slower
+    python -m benchmarks.bench_freshfridge --sizes 1000 100000 --save-baseline baseline.json
+    python -m benchmarks.bench_freshfridge --sizes 1000 100000 --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from freshfridge.alerts.expiry import ExpiryAlerts
+from freshfridge.alerts.lowstock import LowStockAlerts
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.concurrent import ConcurrentInventory
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.inventory.persistence import InventoryPersistence
+from freshfridge.inventory.sqlite_store import SQLiteInventory
+from freshfridge.reporting.consumption import ConsumptionTracker
+from freshfridge.reporting.shopping_list import ShoppingListReport
+from freshfridge.reporting.summary import SummaryReport
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+BACKENDS = {
+    "operations": InventoryOperations,
+    "columnar": ColumnarInventory,
+    "concurrent": ConcurrentInventory,
+    "sqlite": SQLiteInventory,
+}
+UNITS = ["pcs", "L", "mL", "kg", "g", "pack", "carton", "bottle", "jar", "box"]
+UNIT_WEIGHTS = [30, 12, 6, 10, 10, 12, 6, 6, 4, 4]
+
+
+def generate_rows(size: int, seed: int = 533, today: date = None):
+    """
+    Return 'size' synthetic (name, quantity, unit, expiry_date) rows.
+
+    Expiry offsets follow a gamma distribution (mostly days to a few weeks,
+    with a long tail of shelf-stable goods) and about 5% of items are
+    already expired. Quantities are log-normal, rounded to 0.5.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    rows = []
+    for i in range(size):
+        if rng.random() < 0.05:
+            offset = -rng.randint(1, 14)
+        else:
+            offset = int(rng.gammavariate(1.5, 10))
+        quantity = max(0.5, round(rng.lognormvariate(1.0, 0.9) * 2) / 2)
+        unit = rng.choices(UNITS, UNIT_WEIGHTS)[0]
+        rows.append((f"item-{i:07d}", quantity, unit, (today + timedelta(days=offset)).isoformat()))
+    return rows
+
+
+def generate_thresholds(rows, fraction: float = 0.2, seed: int = 533) -> dict:
+    """Return thresholds for a random 'fraction' of the rows' items."""
+    rng = random.Random(seed + 1)
+    return {
+        name: round(quantity * rng.uniform(0.5, 2.0), 1)
+        for name, quantity, _, _ in rows
+        if rng.random() < fraction
+    }
+
+
+def _timed(func, repeat: int):
+    """Run 'func' 'repeat' times; return the best wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, backend: str = "operations", repeat: int = 3) -> dict:
+    """Run the whole suite and return the results as a JSON-ready dict."""
+    factory = BACKENDS[backend]
+    results = {}
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            rows = generate_rows(size)
+            thresholds = generate_thresholds(rows)
+            # consume part of every tenth item; none reaches zero, so saved
+            # files can be loaded back through add_item's positive check
+            uses = [(name, quantity / 4) for name, quantity, _, _ in rows[::10]]
+            path = os.path.join(tmpdir, f"inventory-{size}.json")
+
+            def add_items_one_by_one():
+                inventory = factory()
+                for row in rows:
+                    inventory.add_item(*row)
+                return inventory
+
+            timings = {"add_item": _timed(add_items_one_by_one, 1)}
+            inventory = factory()
+            inventory.add_items(rows)
+
+            def use_all():
+                for name, amount in uses:
+                    inventory.use_item(name, amount)
+
+            timings["use_item"] = _timed(use_all, 1)
+            timings["save_inventory"] = _timed(
+                lambda: InventoryPersistence.save_inventory(inventory, path), repeat
+            )
+            timings["save_inventory_streaming"] = _timed(
+                lambda: InventoryPersistence.save_inventory(inventory, path, streaming=True), repeat
+            )
+            name, quantity = rows[0][0], rows[0][1]
+
+            def save_one_change():
+                inventory.set_quantity(name, quantity)
+                InventoryPersistence.save_delta(inventory, path)
+
+            timings["save_delta"] = _timed(save_one_change, repeat)
+            timings["load_inventory"] = _timed(
+                lambda: InventoryPersistence.load_inventory(factory(), path), repeat
+            )
+            parts_path = os.path.join(tmpdir, f"inventory-{size}.parts")
+            InventoryPersistence.save_inventory(inventory, parts_path)
+            timings["load_partitioned"] = _timed(
+                lambda: InventoryPersistence.load_inventory(factory(), parts_path), repeat
+            )
+            timings["check_expiring"] = _timed(
+                lambda: ExpiryAlerts().check_expiring(inventory, within_days=3), repeat
+            )
+            timings["low_stock_alert"] = _timed(
+                lambda: LowStockAlerts().low_stock_alert(inventory, thresholds), repeat
+            )
+            timings["request_summary"] = _timed(
+                lambda: SummaryReport(inventory).request_summary(), repeat
+            )
+            timings["generate_shopping_list"] = _timed(
+                lambda: ShoppingListReport(inventory).generate_shopping_list(thresholds), repeat
+            )
+            tracker = ConsumptionTracker(inventory)
+            for name, amount in uses:
+                tracker.record_use(name, amount)
+            timings["forecast_shopping_list"] = _timed(
+                lambda: ShoppingListReport(inventory).forecast_shopping_list(tracker), repeat
+            )
+            tracker.detach()
+            results[str(size)] = {
+                name: {"seconds": seconds, "per_item_us": seconds / size * 1e6}
+                for name, seconds in timings.items()
+            }
+            close = getattr(inventory, "close", None)
+            if close is not None:
+                close()
+    finally:
+        shutil.rmtree(tmpdir)
+    return {
+        "backend": backend,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25):
+    """
+    Return a list of regression messages for benchmarks that are more than
+    'tolerance' (a fraction) slower than the baseline.
+    """
+    regressions = []
+    for size, timings in current["results"].items():
+        base_timings = baseline.get("results", {}).get(size, {})
+        for name, timing in timings.items():
+            base = base_timings.get(name)
+            if base is None or base["seconds"] <= 0:
+                continue
+            ratio = timing["seconds"] / base["seconds"]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{name} @ {size} items: {timing['seconds']:.6f}s vs "
+                    f"baseline {base['seconds']:.6f}s ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="operations")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before failing (default 0.25 = 25%%)")
+    parser.add_argument("--save-baseline", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.sizes, args.backend, args.repeat)
+    text = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION: {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,4 +6,25 @@ This package provides tools for:
 - Expiry alerts
 - Low-stock alerts
 - Reporting and shopping list generation
+
+Sub-packages are imported on first attribute access (PEP 562), so
+``import freshfridge`` stays cheap for short-lived command-line runs.
 """
+
+import importlib
+
+_SUBMODULES = ("inventory", "alerts", "reporting", "instrumentation")
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,4 +4,34 @@ Alerts sub-package.
 Includes:
 - Expiry alerts
 - Low-stock alerts
+- Scheduled expiry notifications
+
+Classes are loaded from their modules on first access (PEP 562).
 """
+
+import importlib
+
+_EXPORTS = {
+    "ExpiryAlerts": "expiry",
+    "LowStockAlerts": "lowstock",
+    "ThresholdRegistry": "thresholds",
+    "ThresholdStore": "thresholds",
+    "ExpiryNotifier": "notifier",
+    "ExpiryEvent": "notifier",
+    "FileSink": "notifier",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
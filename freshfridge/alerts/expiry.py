@@ -7,16 +7,23 @@ class ExpiryAlerts:
     def check_expiring(self, inventory, within_days: int = 3):
         """
         Return a list of items that will expire within the next 'within_days' days.
+
+        Items come back soonest-expiring first, straight from the inventory's
+        expiry index, so only the matching items are visited.
         """
-        return [
-            item
-            for item in inventory.items.values()
-            if item.is_expiring_within(within_days)
-        ]
+        return inventory.expiring_within(within_days)
 
-    def mark_expired(self, inventory):
-        """Return a list of items that are already expired."""
-        return [item for item in inventory.items.values() if item.is_expired()]
+    def mark_expired(self, inventory, waste_log=None):
+        """
+        Return a list of items that are already expired. With a 'waste_log'
+        (reporting.waste.WasteLog), expired items are logged as waste, each
+        once per expiry date.
+        """
+        expired = inventory.expired_items()
+        if waste_log is not None:
+            for item in expired:
+                waste_log.record_expired(item)
+        return expired
 
     def days_until_expiry(self, item) -> int:
         """Return the number of days until the item expires."""
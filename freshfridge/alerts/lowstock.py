@@ -1,21 +1,22 @@
+from .thresholds import below_thresholds
+
+
 class LowStockAlerts:
     """Provides low-stock alert functionality."""
 
     def low_stock_alert(self, inventory, thresholds: dict):
         """Return list of (name, current_qty, threshold) for items below threshold."""
-        if not isinstance(thresholds, dict):
-            raise TypeError("thresholds must be a dictionary")
-        alerts = []
-        for name, item in inventory.items.items():
-            if name in thresholds and item.quantity < thresholds[name]:
-                alerts.append((name, item.quantity, thresholds[name]))
-        return alerts
+        return below_thresholds(inventory, thresholds)
 
     def update_thresholds(self, thresholds: dict, new_thresholds: dict) -> dict:
-        """Update a thresholds dictionary with new values."""
+        """
+        Update a thresholds dictionary with new values.
+
+        A ThresholdRegistry re-checks the updated items as part of update().
+        """
         thresholds.update(new_thresholds)
         return thresholds
 
     def items_at_zero(self, inventory):
         """Return list of items that have quantity equal to zero."""
-        return [item for item in inventory.items.values() if item.quantity == 0]
+        return [inventory.get_item(record[0]) for record in inventory.iter_records() if record[1] == 0]
@@ -0,0 +1,193 @@
+import heapq
+import json
+import threading
+from datetime import date, datetime, timedelta
+
+EXPIRING = "expiring"
+EXPIRED = "expired"
+
+
+class ExpiryEvent:
+    """An item crossed the "expiring within N days" or the "expired" boundary."""
+
+    __slots__ = ("kind", "name", "quantity", "unit", "expiry_ordinal", "at")
+
+    def __init__(self, kind: str, name: str, quantity: float, unit: str, expiry_ordinal: int, at: datetime):
+        self.kind = kind
+        self.name = name
+        self.quantity = quantity
+        self.unit = unit
+        self.expiry_ordinal = expiry_ordinal
+        self.at = at
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "quantity": self.quantity,
+            "unit": self.unit,
+            "expiry_date": date.fromordinal(self.expiry_ordinal).isoformat(),
+            "at": self.at.isoformat(),
+        }
+
+    def __repr__(self) -> str:
+        return f"ExpiryEvent({self.kind!r}, {self.name!r}, expiry_ordinal={self.expiry_ordinal})"
+
+
+class FileSink:
+    """Subscriber that appends each event to a file as one JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ExpiryEvent) -> None:
+        line = json.dumps(event.as_dict()) + "\n"
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+
+
+class ExpiryNotifier:
+    """
+    Sends events when items start expiring within 'within_days' days and
+    when they expire, without rescanning the inventory.
+
+    An item expiring on day E is reported by ExpiryAlerts.check_expiring
+    once the current time is past midnight of day E - (within_days + 1),
+    and by mark_expired once it is past midnight of day E. The notifier
+    keeps those boundary times in a min-heap and follows inventory changes
+    through InventoryOperations.subscribe(), so each wake-up only touches
+    the items whose state actually changed. Boundaries that are already
+    past when an item is added fire on the next poll.
+
+    Subscribers are callables, objects with a ``put`` method (such as
+    ``queue.Queue``) or a FileSink. Call poll() to deliver due events, or
+    start() a background thread that sleeps until the next boundary.
+    """
+
+    def __init__(self, inventory, within_days: int = 3):
+        self.inventory = inventory
+        self.within_days = within_days
+        self._subscribers = []
+        self._heap = []          # (boundary, kind, name, generation)
+        self._scheduled = {}     # name -> (expiry_ordinal, generation)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._running = False
+        inventory.subscribe(self._on_change)
+        self._schedule_all()
+
+    def subscribe(self, target) -> None:
+        """Deliver events to a callable, a queue-like object or a FileSink."""
+        self._subscribers.append(target.put if hasattr(target, "put") else target)
+
+    def unsubscribe(self, target) -> None:
+        """Stop delivering events to a target passed to subscribe()."""
+        self._subscribers.remove(target.put if hasattr(target, "put") else target)
+
+    def detach(self) -> None:
+        """Stop the background thread and stop following the inventory."""
+        self.stop()
+        self.inventory.unsubscribe(self._on_change)
+
+    def next_boundary(self):
+        """Return the datetime of the next pending boundary, or None."""
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def poll(self, now: datetime = None):
+        """Deliver and return the events whose boundary is before 'now'."""
+        if now is None:
+            now = datetime.today()
+        due = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] < now:
+                boundary, kind, name, generation = heapq.heappop(heap)
+                scheduled = self._scheduled.get(name)
+                if scheduled is not None and scheduled[1] == generation:
+                    due.append((boundary, kind, name, scheduled[0]))
+        events = []
+        for boundary, kind, name, ordinal in due:
+            item = self.inventory.get_item(name)
+            if item is not None:
+                events.append(ExpiryEvent(kind, name, item.quantity, item.unit, ordinal, boundary))
+        for event in events:
+            for subscriber in self._subscribers:
+                subscriber(event)
+        return events
+
+    def start(self) -> None:
+        """Deliver events from a background thread until stop() is called."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while self._running:
+            self.poll()
+            boundary = self.next_boundary()
+            timeout = 3600.0
+            if boundary is not None:
+                # Sleep until just past the boundary, but re-check hourly
+                # in case the clock jumps
+                timeout = min(timeout, max(0.0, (boundary - datetime.today()).total_seconds()) + 0.001)
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def _on_change(self, op: str, item, amount: float = None) -> None:
+        """Inventory listener: reschedule items whose expiry date changed."""
+        if op == "reset":
+            with self._lock:
+                self._heap, self._scheduled = [], {}
+            self._schedule_all()
+        elif op == "remove":
+            with self._lock:
+                self._scheduled.pop(item.name, None)
+        else:
+            scheduled = self._scheduled.get(item.name)
+            if scheduled is None or scheduled[0] != item.expiry_ordinal:
+                with self._lock:
+                    self._schedule(item.name, item.expiry_ordinal)
+                self._wake.set()
+
+    def _schedule_all(self) -> None:
+        with self._lock:
+            for name, _, _, ordinal in self.inventory.iter_records():
+                self._schedule(name, ordinal)
+        self._wake.set()
+
+    def _schedule(self, name: str, ordinal: int) -> None:
+        """Push both boundaries of an item. Caller holds the lock."""
+        self._generation += 1
+        self._scheduled[name] = (ordinal, self._generation)
+        expired_at = datetime.fromordinal(ordinal)
+        heapq.heappush(self._heap, (expired_at - timedelta(days=self.within_days + 1), EXPIRING, name, self._generation))
+        heapq.heappush(self._heap, (expired_at, EXPIRED, name, self._generation))
+        if len(self._heap) > 4 * len(self._scheduled) + 64:
+            # Mostly entries of rescheduled or removed items; rebuild
+            self._heap = [entry for entry in self._heap if self._scheduled.get(entry[2], (0, 0))[1] == entry[3]]
+            heapq.heapify(self._heap)
+
+    def _drop_stale(self) -> None:
+        """Pop heap entries of removed or rescheduled items. Caller holds the lock."""
+        heap = self._heap
+        while heap:
+            _, _, name, generation = heap[0]
+            scheduled = self._scheduled.get(name)
+            if scheduled is not None and scheduled[1] == generation:
+                return
+            heapq.heappop(heap)
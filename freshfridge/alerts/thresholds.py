@@ -0,0 +1,327 @@
+class ThresholdRegistry(dict):
+    """
+    Low-stock thresholds dictionary that tracks one inventory.
+
+    It behaves like the plain ``{name: threshold}`` dictionaries accepted by
+    LowStockAlerts and ShoppingListReport, but it also subscribes to the
+    inventory and keeps the set of items below their threshold up to date
+    on every quantity or threshold change. Low-stock alerts and shopping
+    lists for that inventory then cost O(k) for k low items instead of a
+    scan over the whole inventory. 'version' changes with every threshold
+    change, so reports cache results by it instead of hashing every entry.
+    """
+
+    def __init__(self, inventory, thresholds: dict = None):
+        super().__init__()
+        self.inventory = inventory
+        # name -> current quantity, for items below their threshold
+        self._low = {}
+        self._version = 0
+        self._token = object()  # hashable identity for cache keys
+        inventory.subscribe(self._on_change)
+        if thresholds:
+            self.update(thresholds)
+
+    def detach(self) -> None:
+        """Stop tracking the inventory."""
+        self.inventory.unsubscribe(self._on_change)
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every threshold change."""
+        return self._version
+
+    def low_items(self):
+        """Return (name, quantity, threshold) for items below their threshold."""
+        return [(name, quantity, self[name]) for name, quantity in self._low.items()]
+
+    def __setitem__(self, name: str, threshold: float) -> None:
+        super().__setitem__(name, threshold)
+        self._version += 1
+        item = self.inventory.get_item(name)
+        self._check(name, None if item is None else item.quantity)
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._version += 1
+        self._low.pop(name, None)
+
+    def update(self, *args, **kwargs) -> None:
+        for name, threshold in dict(*args, **kwargs).items():
+            self[name] = threshold
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, name: str, threshold: float = None):
+        if name not in self:
+            self[name] = threshold
+        return self[name]
+
+    def pop(self, name: str, *default):
+        self._low.pop(name, None)
+        self._version += 1
+        return super().pop(name, *default)
+
+    def popitem(self):
+        name, threshold = super().popitem()
+        self._version += 1
+        self._low.pop(name, None)
+        return name, threshold
+
+    def clear(self) -> None:
+        super().clear()
+        self._version += 1
+        self._low.clear()
+
+    def _check(self, name: str, quantity) -> None:
+        """Record whether 'name' is currently below its threshold."""
+        if quantity is not None and name in self and quantity < self[name]:
+            self._low[name] = quantity
+        else:
+            self._low.pop(name, None)
+
+    def _on_change(self, op: str, item, amount: float = None) -> None:
+        """Inventory listener."""
+        if op == "reset":
+            self._low.clear()
+            for name in self:
+                item = self.inventory.get_item(name)
+                self._check(name, None if item is None else item.quantity)
+        elif op == "remove":
+            self._low.pop(item.name, None)
+        else:
+            self._check(item.name, item.quantity)
+
+
+class ThresholdStore:
+    """
+    Low-stock thresholds with per-category and per-location defaults.
+
+    A threshold is looked up in this order: the item's own threshold, the
+    default of the item's category, the default of the location, and the
+    global default. Each change bumps 'version' and drops the precomputed
+    lookup tables; a table maps every item with an own or category
+    threshold to its resolved value, so resolving a name afterwards is a
+    single dictionary lookup.
+
+    for_inventory() returns the resolved ``{name: threshold}`` dictionary
+    for one inventory (cached until the store or the inventory changes);
+    LowStockAlerts and ShoppingListReport accept a store directly and use
+    it. The store is saved with the inventory by InventoryPersistence and
+    InventoryJournal when passed as 'thresholds'.
+    """
+
+    def __init__(
+        self,
+        items: dict = None,
+        categories: dict = None,
+        item_categories: dict = None,
+        locations: dict = None,
+        default: float = None,
+    ):
+        self._items = dict(items or {})
+        self._categories = dict(categories or {})
+        self._item_categories = dict(item_categories or {})
+        self._locations = dict(locations or {})
+        self._default = default
+        self._version = 0
+        self._tables = {}       # location -> (name -> threshold, fallback)
+        self._resolved = {}     # location -> (inventory, versions, thresholds)
+        self._listeners = []
+        self._synced = (None, 0)  # (file, version) the saved thresholds match
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever a threshold or category changes."""
+        return self._version
+
+    @property
+    def synced_path(self):
+        """The file whose saved thresholds match the store, or None."""
+        path, version = self._synced
+        return path if version == self._version else None
+
+    def mark_clean(self, path: str = None) -> None:
+        """Note that the store now matches the thresholds saved in 'path'."""
+        self._synced = (path, self._version)
+
+    @property
+    def default(self):
+        """Threshold for items without any other threshold, or None."""
+        return self._default
+
+    @default.setter
+    def default(self, threshold: float) -> None:
+        self._default = threshold
+        self._changed()
+
+    def subscribe(self, callback) -> None:
+        """Call 'callback(store)' after every change."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Remove a callback registered with subscribe()."""
+        self._listeners.remove(callback)
+
+    def set_item(self, name: str, threshold: float) -> None:
+        """Set the threshold of one item, overriding any default."""
+        self._items[name] = threshold
+        self._changed()
+
+    def set_category(self, category: str, threshold: float) -> None:
+        """Set the default threshold of a category."""
+        self._categories[category] = threshold
+        self._changed()
+
+    def set_location(self, location: str, threshold: float) -> None:
+        """Set the default threshold of a location."""
+        self._locations[location] = threshold
+        self._changed()
+
+    def assign_category(self, name: str, category: str) -> None:
+        """Put an item in a category (None removes it from its category)."""
+        if category is None:
+            self._item_categories.pop(name, None)
+        else:
+            self._item_categories[name] = category
+        self._changed()
+
+    def discard_item(self, name: str) -> None:
+        """Remove an item's own threshold, if it has one."""
+        if self._items.pop(name, None) is not None:
+            self._changed()
+
+    def discard_category(self, category: str) -> None:
+        """Remove a category's default threshold, if it has one."""
+        if self._categories.pop(category, None) is not None:
+            self._changed()
+
+    def discard_location(self, location: str) -> None:
+        """Remove a location's default threshold, if it has one."""
+        if self._locations.pop(location, None) is not None:
+            self._changed()
+
+    def category_of(self, name: str):
+        """Return the category of an item, or None."""
+        return self._item_categories.get(name)
+
+    def resolve(self, name: str, location: str = None):
+        """Return the threshold that applies to 'name' at 'location', or None."""
+        table, fallback = self._table(location)
+        return table.get(name, fallback)
+
+    def for_inventory(self, inventory, location: str = None) -> dict:
+        """
+        Return the resolved {name: threshold} dictionary for 'inventory' at
+        'location'. Without a location or global default it is the lookup
+        table itself; otherwise every item of the inventory is included.
+        The dictionary is cached and must not be modified.
+        """
+        table, fallback = self._table(location)
+        if fallback is None:
+            return table
+        versions = (self._version, getattr(inventory, "version", None))
+        cached = self._resolved.get(location)
+        if cached is not None and cached[0] is inventory and cached[1] == versions \
+                and isinstance(versions[1], int):
+            return cached[2]
+        resolved = {name: table.get(name, fallback) for name, _, _, _ in inventory.iter_records()}
+        self._resolved[location] = (inventory, versions, resolved)
+        return resolved
+
+    def to_dict(self) -> dict:
+        """Return the store as a JSON-serializable dictionary."""
+        data = {}
+        if self._default is not None:
+            data["default"] = self._default
+        for key, value in (
+            ("items", self._items),
+            ("categories", self._categories),
+            ("item_categories", self._item_categories),
+            ("locations", self._locations),
+        ):
+            if value:
+                data[key] = dict(value)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Create a store from a to_dict() dictionary."""
+        store = cls()
+        store.load_dict(data)
+        return store
+
+    def load_dict(self, data: dict) -> None:
+        """Replace the contents of the store with a to_dict() dictionary."""
+        self._items = dict(data.get("items", {}))
+        self._categories = dict(data.get("categories", {}))
+        self._item_categories = dict(data.get("item_categories", {}))
+        self._locations = dict(data.get("locations", {}))
+        self._default = data.get("default")
+        self._changed()
+
+    def copy(self):
+        """Return an independent copy of the store (without its listeners)."""
+        return type(self).from_dict(self.to_dict())
+
+    def __bool__(self) -> bool:
+        """True if any threshold, default or item category is set."""
+        return bool(
+            self._items or self._categories or self._locations or self._item_categories
+            or self._default is not None
+        )
+
+    def _table(self, location):
+        """Return the (name -> threshold, fallback) lookup table for a location."""
+        entry = self._tables.get(location)
+        if entry is None:
+            table = {}
+            categories = self._categories
+            for name, category in self._item_categories.items():
+                threshold = categories.get(category)
+                if threshold is not None:
+                    table[name] = threshold
+            table.update(self._items)
+            fallback = self._locations.get(location, self._default) if location is not None else self._default
+            entry = self._tables[location] = (table, fallback)
+        return entry
+
+    def _changed(self) -> None:
+        self._version += 1
+        self._tables.clear()
+        self._resolved.clear()
+        for callback in self._listeners:
+            callback(self)
+
+
+def threshold_key(thresholds):
+    """
+    Return a hashable key for the current contents of a thresholds argument:
+    the version of a ThresholdStore or ThresholdRegistry, or the entries of
+    a plain dictionary. Raise TypeError for anything else.
+    """
+    if isinstance(thresholds, ThresholdStore):
+        return thresholds, thresholds.version
+    if isinstance(thresholds, ThresholdRegistry):
+        return thresholds._token, thresholds.version
+    if not isinstance(thresholds, dict):
+        raise TypeError("thresholds must be a dictionary")
+    return frozenset(thresholds.items())
+
+
+def below_thresholds(inventory, thresholds: dict):
+    """
+    Return (name, quantity, threshold) for items of 'inventory' below their
+    threshold, reading them straight from a ThresholdRegistry that tracks
+    this inventory, or querying the inventory otherwise. A ThresholdStore
+    is resolved for the inventory first.
+    """
+    if isinstance(thresholds, ThresholdStore):
+        thresholds = thresholds.for_inventory(inventory)
+    if not isinstance(thresholds, dict):
+        raise TypeError("thresholds must be a dictionary")
+    if isinstance(thresholds, ThresholdRegistry) and thresholds.inventory is inventory:
+        return thresholds.low_items()
+    return inventory.below_thresholds(thresholds)
@@ -0,0 +1,299 @@
+"""
+Optional call counts, latency histograms and profiling for FreshFridge.
+
+Instrumentation is off by default and then costs nothing: ``enable()``
+replaces the public methods of the inventory, persistence, alert and
+reporting classes (and the expiry date parser) with timing wrappers, and
+``disable()`` puts the originals back. Usage::
+
+    from freshfridge import instrumentation
+
+    instrumentation.enable()
+    ...  # use the package as usual
+    print(instrumentation.to_prometheus())
+
+    with instrumentation.profile_block("shop", memory=True):
+        report.generate_shopping_list(thresholds)
+    print(instrumentation.snapshot()["profiles"]["shop"]["cprofile"])
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds (in seconds) of the latency histogram buckets
+BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0, float("inf"))
+
+_lock = threading.Lock()
+_metrics = {}
+_profiles = {}
+_patched = []   # (owner, attribute, original value) to restore on disable()
+_enabled = False
+
+
+class _Metric:
+    """Counters of one instrumented function."""
+
+    __slots__ = ("calls", "errors", "seconds", "items", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.items = 0
+        self.buckets = [0] * len(BUCKETS)
+
+    def as_dict(self) -> dict:
+        cumulative, total = {}, 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            total += count
+            cumulative["+Inf" if bound == float("inf") else repr(bound)] = total
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "items": self.items,
+            "buckets": cumulative,
+        }
+
+
+def _count_items(result) -> int:
+    """Number of items a call returned or applied (0 if unknown)."""
+    if isinstance(result, (list, dict)):
+        return len(result)
+    applied = getattr(result, "applied", None)
+    return applied if isinstance(applied, int) else 0
+
+
+def record(name: str, seconds: float, items: int = 0, error: bool = False) -> None:
+    """Add one call of 'name' to the metrics."""
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = _Metric()
+        metric.calls += 1
+        metric.errors += error
+        metric.seconds += seconds
+        metric.items += items
+        metric.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+
+def _timed(name: str, func):
+    """Return a wrapper of 'func' that records its calls under 'name'."""
+    clock = time.perf_counter
+
+    if inspect.isgeneratorfunction(func):
+        # Time the whole iteration and count the yielded items
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            start, count, error = clock(), 0, True
+            try:
+                for value in func(*args, **kwargs):
+                    count += 1
+                    yield value
+                error = False
+            finally:
+                record(name, clock() - start, count, error)
+
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            record(name, clock() - start, error=True)
+            raise
+        record(name, clock() - start, _count_items(result))
+        return result
+
+    return wrapper
+
+
+def _default_targets():
+    from .alerts.expiry import ExpiryAlerts
+    from .alerts.lowstock import LowStockAlerts
+    from .inventory.operations import InventoryOperations
+    from .inventory.persistence import InventoryPersistence
+    from .reporting.base_report import BaseReport
+
+    return [InventoryOperations, InventoryPersistence, ExpiryAlerts, LowStockAlerts, BaseReport]
+
+
+def _with_subclasses(classes):
+    seen, stack = [], list(classes)
+    while stack:
+        cls = stack.pop(0)
+        if cls not in seen:
+            seen.append(cls)
+            stack.extend(cls.__subclasses__())
+    return seen
+
+
+def _patch_class(cls) -> None:
+    """Wrap the public methods defined directly in 'cls'."""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") and attr != "__len__":
+            continue
+        name = f"{cls.__name__}.{attr}"
+        if isinstance(value, staticmethod):
+            wrapped = staticmethod(_timed(name, value.__func__))
+        elif isinstance(value, classmethod):
+            wrapped = classmethod(_timed(name, value.__func__))
+        elif callable(value) and not isinstance(value, type):
+            wrapped = _timed(name, value)
+        else:
+            continue  # properties and plain attributes
+        _patched.append((cls, attr, value))
+        setattr(cls, attr, wrapped)
+
+
+def _patch_function(func, name: str) -> None:
+    """
+    Wrap a module-level function wherever a freshfridge module imported it.
+    The cache_info() and cache_clear() of an lru_cache'd function are kept.
+    """
+    wrapped = _timed(name, func)
+    for attr in ("cache_info", "cache_clear", "cache_parameters"):
+        if hasattr(func, attr):
+            setattr(wrapped, attr, getattr(func, attr))
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not module_name.startswith(__package__ + "."):
+            continue
+        for attr, value in list(vars(module).items()):
+            if value is func:
+                _patched.append((module, attr, value))
+                setattr(module, attr, wrapped)
+
+
+def enabled() -> bool:
+    """Return True while instrumentation is enabled."""
+    return _enabled
+
+
+def enable(classes=None) -> None:
+    """
+    Start recording the public methods of 'classes' (and their subclasses).
+
+    By default these are InventoryOperations, InventoryPersistence,
+    ExpiryAlerts, LowStockAlerts and BaseReport, plus expiry date parsing.
+    Subclasses and modules imported after enable() are not instrumented.
+    Calling enable() again while enabled does nothing.
+    """
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    for cls in _with_subclasses(classes or _default_targets()):
+        _patch_class(cls)
+    if classes is None:
+        from .inventory.items import expiry_to_ordinal
+
+        _patch_function(expiry_to_ordinal, "expiry_to_ordinal")
+
+
+def disable() -> None:
+    """Restore the original methods; recorded metrics are kept."""
+    global _enabled
+    _enabled = False
+    while _patched:
+        owner, attr, value = _patched.pop()
+        setattr(owner, attr, value)
+
+
+def reset() -> None:
+    """Forget all recorded metrics and profiles."""
+    with _lock:
+        _metrics.clear()
+        _profiles.clear()
+
+
+@contextmanager
+def profile_block(name: str, cpu: bool = True, memory: bool = False, top: int = 20):
+    """
+    Profile the code in the ``with`` block and store the result under 'name'.
+
+    With 'cpu', the block runs under cProfile and the 'top' functions by
+    cumulative time are kept as text. With 'memory', tracemalloc records the
+    peak traced memory and the 'top' allocation sites. Results are available
+    through snapshot()["profiles"]. The block's duration is also recorded as
+    a metric called "block.<name>".
+    """
+    profiler = cProfile.Profile() if cpu else None
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        seconds = time.perf_counter() - start
+        result = {"seconds": seconds}
+        if profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            result["cprofile"] = out.getvalue()
+        if memory:
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+            result["top_allocations"] = [str(stat) for stat in stats]
+            if started_tracing:
+                tracemalloc.stop()
+        record("block." + name, seconds)
+        with _lock:
+            _profiles[name] = result
+
+
+def snapshot() -> dict:
+    """Return a copy of all metrics and profiles as plain dictionaries."""
+    with _lock:
+        return {
+            "enabled": enabled(),
+            "metrics": {name: metric.as_dict() for name, metric in sorted(_metrics.items())},
+            "profiles": {name: dict(result) for name, result in _profiles.items()},
+        }
+
+
+def to_json(indent: int = 2) -> str:
+    """Return snapshot() as a JSON document."""
+    return json.dumps(snapshot(), indent=indent)
+
+
+def to_prometheus(prefix: str = "freshfridge") -> str:
+    """Return the metrics in the Prometheus text exposition format."""
+    metrics = snapshot()["metrics"]
+    lines = [
+        f"# HELP {prefix}_call_seconds Latency of instrumented calls.",
+        f"# TYPE {prefix}_call_seconds histogram",
+    ]
+    for name, metric in metrics.items():
+        label = f'function="{name}"'
+        for bound, count in metric["buckets"].items():
+            lines.append(f'{prefix}_call_seconds_bucket{{{label},le="{bound}"}} {count}')
+        lines.append(f"{prefix}_call_seconds_sum{{{label}}} {metric['seconds']!r}")
+        lines.append(f"{prefix}_call_seconds_count{{{label}}} {metric['calls']}")
+    for field, help_text in (
+        ("errors", "Instrumented calls that raised an exception."),
+        ("items", "Items returned or applied by instrumented calls."),
+    ):
+        lines.append(f"# HELP {prefix}_call_{field}_total {help_text}")
+        lines.append(f"# TYPE {prefix}_call_{field}_total counter")
+        for name, metric in metrics.items():
+            lines.append(f'{prefix}_call_{field}_total{{function="{name}"}} {metric[field]}')
+    return "\n".join(lines) + "\n"
@@ -5,4 +5,45 @@ Includes:
 - Item classes (with inheritance)
 - Inventory operations
 - Persistence tools
+
+The classes below are importable from the sub-package directly; each one
+is loaded from its module on first access (PEP 562), so importing the
+sub-package does not pull in sqlite3, mmap or asyncio.
 """
+
+import importlib
+
+_EXPORTS = {
+    "BaseItem": "items",
+    "FreshItem": "items",
+    "InvalidExpiryDateError": "items",
+    "BatchResult": "operations",
+    "InventoryOperations": "operations",
+    "ColumnarInventory": "columnar",
+    "SQLiteInventory": "sqlite_store",
+    "ConcurrentInventory": "concurrent",
+    "LotInventory": "lots",
+    "InventoryPersistence": "persistence",
+    "RecordSnapshot": "persistence",
+    "MappedInventory": "binary",
+    "InventoryJournal": "journal",
+    "ShardedInventory": "sharded",
+    "load_partitioned": "partitioned",
+    "save_partitioned": "partitioned",
+    "AsyncInventoryService": "async_service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,162 @@
+import asyncio
+import os
+
+from ..alerts.expiry import ExpiryAlerts
+from ..alerts.lowstock import LowStockAlerts
+from ..reporting.shopping_list import ShoppingListReport
+from ..reporting.summary import SummaryReport
+from .operations import InventoryOperations
+from .persistence import DELTA_SUFFIX, InventoryPersistence, RecordSnapshot, _detect_format, _saved_lots
+
+
+class AsyncInventoryService:
+    """
+    asyncio facade over an inventory and its JSON file.
+
+    Changes are applied to the in-memory inventory immediately. Saving is
+    coalesced: the first change after a save starts a timer of 'save_delay'
+    seconds, and every change made before it fires is written by that one
+    save. The inventory is copied on the event loop, then JSON encoding and
+    file writes run in an executor, so the loop is never blocked on disk.
+
+    Usage::
+
+        service = AsyncInventoryService(path="inventory.json")
+        await service.load()
+        await service.add_item("Milk", 2, "L", "2025-12-18")
+        await service.close()
+    """
+
+    def __init__(
+        self,
+        inventory=None,
+        path: str = "inventory.json",
+        save_delay: float = 0.5,
+        executor=None,
+    ):
+        self.inventory = inventory if inventory is not None else InventoryOperations()
+        self.path = path
+        self.save_delay = save_delay
+        self.executor = executor
+        self.save_count = 0
+        self._dirty = False
+        self._save_task = None
+        self._flush_requested = None
+
+    async def load(self) -> None:
+        """Load the inventory file in an executor."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor, InventoryPersistence.load_inventory, self.inventory, self.path
+        )
+
+    async def add_item(self, name: str, quantity: float, unit: str, expiry_date: str) -> None:
+        """Create or overwrite an item and schedule a save."""
+        self.inventory.add_item(name, quantity, unit, expiry_date)
+        self._changed()
+
+    async def use_item(self, name: str, quantity: float) -> None:
+        """Reduce the quantity of an item and schedule a save."""
+        self.inventory.use_item(name, quantity)
+        self._changed()
+
+    async def remove_item(self, name: str) -> None:
+        """Remove an item and schedule a save."""
+        self.inventory.remove_item(name)
+        self._changed()
+
+    async def add_items(self, rows=None, **kwargs):
+        """Bulk version of add_item; returns the BatchResult."""
+        result = self.inventory.add_items(rows, **kwargs)
+        if result.applied:
+            self._changed()
+        return result
+
+    async def use_items(self, rows=None, **kwargs):
+        """Bulk version of use_item; returns the BatchResult."""
+        result = self.inventory.use_items(rows, **kwargs)
+        if result.applied:
+            self._changed()
+        return result
+
+    async def remove_items(self, names, **kwargs):
+        """Bulk version of remove_item; returns the BatchResult."""
+        result = self.inventory.remove_items(names, **kwargs)
+        if result.applied:
+            self._changed()
+        return result
+
+    async def check_expiring(self, within_days: int = 3):
+        """Return items expiring within 'within_days' days."""
+        return ExpiryAlerts().check_expiring(self.inventory, within_days)
+
+    async def mark_expired(self):
+        """Return items that are already expired."""
+        return ExpiryAlerts().mark_expired(self.inventory)
+
+    async def low_stock_alert(self, thresholds: dict):
+        """Return (name, quantity, threshold) for items below their threshold."""
+        return LowStockAlerts().low_stock_alert(self.inventory, thresholds)
+
+    async def request_summary(self):
+        """Return the inventory summary as a list of dictionaries."""
+        return SummaryReport(self.inventory).request_summary()
+
+    async def generate_shopping_list(self, thresholds: dict):
+        """Return the shopping list for 'thresholds'."""
+        return ShoppingListReport(self.inventory).generate_shopping_list(thresholds)
+
+    async def flush(self) -> None:
+        """Write pending changes now and wait until they are on disk."""
+        if self._dirty and self._save_task is None:
+            self._start_saver()
+        if self._save_task is not None:
+            self._flush_requested.set()
+            await asyncio.shield(self._save_task)
+
+    async def close(self) -> None:
+        """Flush pending changes."""
+        await self.flush()
+
+    def _changed(self) -> None:
+        self._dirty = True
+        if self._save_task is None:
+            self._start_saver()
+
+    def _start_saver(self) -> None:
+        if self._flush_requested is None:
+            self._flush_requested = asyncio.Event()
+        self._save_task = asyncio.get_running_loop().create_task(self._save_loop())
+
+    async def _save_loop(self) -> None:
+        """Write coalesced saves until no changes are pending."""
+        loop = asyncio.get_running_loop()
+        try:
+            while self._dirty:
+                if not self._flush_requested.is_set():
+                    try:
+                        await asyncio.wait_for(self._flush_requested.wait(), self.save_delay)
+                    except asyncio.TimeoutError:
+                        pass
+                self._dirty = False
+                snapshot = RecordSnapshot(self.inventory.iter_records(), _saved_lots(self.inventory))
+                try:
+                    await loop.run_in_executor(self.executor, self._write, snapshot)
+                except BaseException:
+                    self._dirty = True  # retried by the next change or flush
+                    raise
+                self.save_count += 1
+        finally:
+            self._flush_requested.clear()
+            self._save_task = None
+
+    def _write(self, snapshot: RecordSnapshot) -> None:
+        """Replace the inventory file atomically (runs in the executor)."""
+        tmp_path = self.path + ".tmp"
+        InventoryPersistence.save_inventory(
+            snapshot, tmp_path, fmt=_detect_format(self.path), streaming=True
+        )
+        os.replace(tmp_path, self.path)
+        # The full file supersedes any delta saves
+        if os.path.exists(self.path + DELTA_SUFFIX):
+            os.remove(self.path + DELTA_SUFFIX)
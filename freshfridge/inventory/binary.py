@@ -0,0 +1,384 @@
+"""
+Compact binary inventory snapshots that open through ``mmap``.
+
+A snapshot file holds a header followed by fixed-width, 8-byte aligned
+little-endian columns and a UTF-8 string table::
+
+    header        magic, item count, unit count
+    quantity      float64 per item
+    expiry        int32 day ordinal per item
+    unit          uint16 code per item, indexing the unit table
+    order         uint32 row numbers sorted by (expiry, name)
+    name offsets  uint64 per item + 1, into the string table
+    unit offsets  uint64 per unit + 1, into the string table
+    strings       item names followed by unit names
+    metadata      optional: METADATA_MAGIC and a UTF-8 JSON object, such as
+                  the low-stock thresholds saved with the inventory
+
+Convert between formats with::
+
+    python -m freshfridge.inventory.binary to-binary inventory.json inventory.ffb
+    python -m freshfridge.inventory.binary to-json inventory.ffb inventory.json
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from array import array
+from datetime import datetime
+
+from .items import FreshItem, cutoff_ordinal
+from .operations import InventoryOperations, _RunningSum
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to plain memoryview scans
+    np = None
+
+MAGIC = b"FFINV\x00\x00\x01"
+METADATA_MAGIC = b"FFMETA\x00\x01"
+_HEADER = struct.Struct("<8sQQ")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _layout(count: int, unit_count: int):
+    """Return {section: (offset, typecode, length)} and the string table offset."""
+    sections = {}
+    offset = _HEADER.size
+    for section, typecode, length in (
+        ("quantity", "d", count),
+        ("expiry", "i", count),
+        ("unit", "H", count),
+        ("order", "I", count),
+        ("name_offsets", "Q", count + 1),
+        ("unit_offsets", "Q", unit_count + 1),
+    ):
+        sections[section] = (offset, typecode, length)
+        offset += struct.calcsize(typecode) * length
+        offset += -offset % 8
+    return sections, offset
+
+
+def write_binary(records, path: str, metadata: dict = None) -> None:
+    """
+    Write (name, quantity, unit, expiry_ordinal) records as a binary
+    snapshot, followed by the JSON-serializable 'metadata' if given.
+    'metadata' may also be a function, called once every record is read,
+    that returns the metadata or None.
+    """
+    names, units, unit_codes = [], [], {}
+    columns = {
+        "quantity": array("d"),
+        "expiry": array("i"),
+        "unit": array("H"),
+    }
+    for name, quantity, unit, ordinal in records:
+        code = unit_codes.get(unit)
+        if code is None:
+            if len(units) > 0xFFFF:
+                raise ValueError("A binary snapshot holds at most 65536 distinct units")
+            code = unit_codes[unit] = len(units)
+            units.append(unit.encode("utf-8"))
+        names.append(name.encode("utf-8"))
+        columns["quantity"].append(quantity)
+        columns["expiry"].append(ordinal)
+        columns["unit"].append(code)
+
+    expiry = columns["expiry"]
+    # UTF-8 byte order matches str order, so this is the (expiry, name) order
+    columns["order"] = array("I", sorted(range(len(names)), key=lambda row: (expiry[row], names[row])))
+    offsets = array("Q", [0])
+    for value in names + units:
+        offsets.append(offsets[-1] + len(value))
+    columns["name_offsets"] = offsets[:len(names) + 1]
+    columns["unit_offsets"] = array("Q", (offset - offsets[len(names)] for offset in offsets[len(names):]))
+
+    sections, strings_offset = _layout(len(names), len(units))
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(names), len(units)))
+        for section, (offset, _, _) in sections.items():
+            column = columns[section]
+            if not _LITTLE_ENDIAN:
+                column = array(column.typecode, column)
+                column.byteswap()
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(column.tobytes())
+        f.write(b"\0" * (strings_offset - f.tell()))
+        f.write(b"".join(names))
+        f.write(b"".join(units))
+        if callable(metadata):
+            metadata = metadata()
+        if metadata is not None:
+            f.write(METADATA_MAGIC)
+            f.write(json.dumps(metadata, separators=(",", ":")).encode("utf-8"))
+
+
+class MappedInventory(InventoryOperations):
+    """
+    Inventory served straight from a memory-mapped binary snapshot.
+
+    Opening only maps the file and reads the header and unit table, so even
+    very large snapshots open almost instantly. Queries read the mapped
+    columns in place (through NumPy when it is installed); expiry queries
+    binary-search the stored (expiry, name) order. Name lookups build a
+    name-to-row dictionary the first time they are needed.
+
+    The first change copies every item into memory and releases the file;
+    from then on the inventory behaves like InventoryOperations. Call
+    close() to release the file without copying it.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._rows = None
+        self._metadata = None
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = [memoryview(self._map)]
+        try:
+            self._open(self._views[0])
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self, view) -> None:
+        """Set up column views over the mapped file."""
+        if len(view) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a binary inventory snapshot")
+        magic, count, unit_count = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a binary inventory snapshot")
+        sections, strings_offset = _layout(count, unit_count)
+        if len(view) < strings_offset:
+            raise ValueError(f"{self.path} is truncated")
+        for section, (offset, typecode, length) in sections.items():
+            data = view[offset:offset + struct.calcsize(typecode) * length]
+            if _LITTLE_ENDIAN:
+                self._views.append(data)
+                column = data.cast(typecode)
+                self._views.append(column)
+            else:
+                column = array(typecode, bytes(data))
+                column.byteswap()
+            setattr(self, "_" + section, column)
+        self._count = count
+        self._strings = view[strings_offset:]
+        self._views.append(self._strings)
+        names_end = self._name_offsets[count]
+        if len(self._strings) < names_end + self._unit_offsets[unit_count]:
+            raise ValueError(f"{self.path} is truncated")
+        self._units = [
+            str(self._strings[names_end + self._unit_offsets[code]:names_end + self._unit_offsets[code + 1]], "utf-8")
+            for code in range(unit_count)
+        ]
+        trailer = self._strings[names_end + self._unit_offsets[unit_count]:]
+        if trailer[:len(METADATA_MAGIC)] == METADATA_MAGIC:
+            # Copied so it stays readable after the file is released
+            self._metadata = bytes(trailer[len(METADATA_MAGIC):])
+
+    @property
+    def metadata(self) -> dict:
+        """The metadata dictionary stored after the items (empty if none)."""
+        if self._metadata is None:
+            return {}
+        return json.loads(self._metadata)
+
+    @property
+    def mapped(self) -> bool:
+        """True while items are served from the mapped file."""
+        return self._map is not None
+
+    def close(self) -> None:
+        """Release the mapped file. Unless materialize() ran first, the inventory is left empty."""
+        if self._map is None:
+            return
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+        self._map = None
+        self._rows = None
+
+    def materialize(self) -> None:
+        """Copy every item into memory and release the mapped file."""
+        if self._map is None:
+            return
+        records = list(self._iter_mapped())
+        self._expiry_index = [(records[row][3], records[row][0]) for row in self._order]
+        self._items = {record[0]: FreshItem.from_ordinal(*record) for record in records}
+        self._total = _RunningSum(record[1] for record in records)
+        self.close()
+
+    @property
+    def items(self):
+        """Dictionary mapping item names to FreshItem objects."""
+        if self._map is None:
+            return self._items
+        return {record[0]: FreshItem.from_ordinal(*record) for record in self._iter_mapped()}
+
+    @items.setter
+    def items(self, new_items: dict) -> None:
+        self.close()
+        InventoryOperations.items.fset(self, new_items)
+
+    def add_item(self, name: str, quantity: float, unit: str, expiry_date: str) -> None:
+        """Create or overwrite an item in the inventory."""
+        self.materialize()
+        super().add_item(name, quantity, unit, expiry_date)
+
+    def use_item(self, name: str, quantity: float) -> None:
+        """Reduce the quantity of an item if it exists."""
+        self.materialize()
+        super().use_item(name, quantity)
+
+    def set_quantity(self, name: str, quantity: float) -> None:
+        """Set the quantity of an item if it exists (not going below zero)."""
+        self.materialize()
+        super().set_quantity(name, quantity)
+
+    def remove_item(self, name: str) -> None:
+        """Completely remove an item from the inventory."""
+        self.materialize()
+        super().remove_item(name)
+
+    def _apply_adds(self, rows) -> None:
+        self.materialize()
+        super()._apply_adds(rows)
+
+    def _apply_uses(self, rows) -> None:
+        self.materialize()
+        super()._apply_uses(rows)
+
+    def _apply_removes(self, names) -> None:
+        self.materialize()
+        super()._apply_removes(names)
+
+    def _existing(self, names) -> set:
+        """Return the subset of 'names' that are in the inventory."""
+        if self._map is None:
+            return super()._existing(names)
+        rows = self._row_numbers()
+        return {name for name in names if name in rows}
+
+    def get_item(self, name: str):
+        """Return the item called 'name' as a FreshItem, or None."""
+        if self._map is None:
+            return super().get_item(name)
+        row = self._row_numbers().get(name)
+        return None if row is None else FreshItem.from_ordinal(*self._record(row))
+
+    def list_items(self):
+        """Return a list of all FreshItem objects."""
+        if self._map is None:
+            return super().list_items()
+        return [FreshItem.from_ordinal(*record) for record in self._iter_mapped()]
+
+    def iter_records(self):
+        """Yield (name, quantity, unit, expiry_ordinal) for every item."""
+        if self._map is None:
+            return super().iter_records()
+        return self._iter_mapped()
+
+    def iter_by_expiry(self):
+        """Yield (name, quantity, unit, expiry_ordinal) records, soonest-expiring first."""
+        if self._map is None:
+            return super().iter_by_expiry()
+        return (self._record(row) for row in self._order)
+
+    def __len__(self) -> int:
+        """Return the number of distinct items."""
+        return self._count if self._map is not None else super().__len__()
+
+    def __contains__(self, name: str) -> bool:
+        """Return True if an item called 'name' exists."""
+        return name in self._row_numbers() if self._map is not None else super().__contains__(name)
+
+    def below_thresholds(self, thresholds: dict):
+        """Return (name, quantity, threshold) for items below their threshold."""
+        if self._map is None:
+            return super().below_thresholds(thresholds)
+        rows = self._row_numbers()
+        quantity = self._quantity
+        hits = []
+        for name, threshold in thresholds.items():
+            row = rows.get(name)
+            if row is not None and quantity[row] < threshold:
+                hits.append((row, name, threshold))
+        hits.sort()
+        return [(name, quantity[row], threshold) for row, name, threshold in hits]
+
+    def total_quantity(self) -> float:
+        """Return the sum of quantities of all items."""
+        if self._map is None:
+            return super().total_quantity()
+        if np is not None and self._count:
+            return float(np.frombuffer(self._quantity, dtype=np.float64).sum())
+        return sum(self._quantity)
+
+    def _expiring_before(self, cutoff: datetime):
+        """Return items whose expiry date is strictly before 'cutoff'."""
+        if self._map is None:
+            return super()._expiring_before(cutoff)
+        bound = cutoff_ordinal(cutoff)
+        expiry, order = self._expiry, self._order
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if expiry[order[middle]] < bound:
+                low = middle + 1
+            else:
+                high = middle
+        return [FreshItem.from_ordinal(*self._record(order[i])) for i in range(low)]
+
+    def _name(self, row: int) -> str:
+        """Decode the name of one row from the string table."""
+        offsets = self._name_offsets
+        return str(self._strings[offsets[row]:offsets[row + 1]], "utf-8")
+
+    def _record(self, row: int):
+        """Return (name, quantity, unit, expiry_ordinal) for one row."""
+        return self._name(row), self._quantity[row], self._units[self._unit[row]], self._expiry[row]
+
+    def _iter_mapped(self):
+        """Yield the records of the mapped file in their stored order."""
+        offsets = self._name_offsets
+        names_end = offsets[self._count]
+        names = str(self._strings[:names_end], "utf-8")
+        if len(names) != names_end:
+            # Non-ASCII names: byte offsets are not character offsets
+            names = None
+        quantity, unit, expiry, units = self._quantity, self._unit, self._expiry, self._units
+        start = 0
+        for row in range(self._count):
+            end = offsets[row + 1]
+            name = names[start:end] if names is not None else self._name(row)
+            yield name, quantity[row], units[unit[row]], expiry[row]
+            start = end
+
+    def _row_numbers(self) -> dict:
+        """Return the name-to-row dictionary, building it on first use."""
+        if self._rows is None:
+            self._rows = {self._name(row): row for row in range(self._count)}
+        return self._rows
+
+
+def main(argv=None) -> int:
+    """Convert inventory files between the JSON and binary formats."""
+    from .persistence import InventoryPersistence
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("command", choices=("to-binary", "to-json", "to-jsonl"))
+    parser.add_argument("source")
+    parser.add_argument("target")
+    args = parser.parse_args(argv)
+    fmt = {"to-binary": "binary", "to-json": "json", "to-jsonl": "jsonl"}[args.command]
+    count = InventoryPersistence.convert(args.source, args.target, dst_fmt=fmt)
+    print(f"Wrote {count} items to {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
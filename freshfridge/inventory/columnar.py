@@ -0,0 +1,251 @@
+from array import array
+from datetime import datetime
+from types import MappingProxyType
+
+from .items import FreshItem, cutoff_ordinal, expiry_to_ordinal
+from .operations import InventoryOperations, _RunningSum
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to plain array.array scans
+    np = None
+
+
+class ColumnarInventory(InventoryOperations):
+    """
+    Inventory stored as parallel columns instead of FreshItem objects.
+
+    Quantities and expiry day ordinals live in ``array.array`` buffers, and
+    units are interned to integer codes. When NumPy is installed, queries
+    view those buffers with ``numpy.frombuffer`` and run as vectorized masks;
+    total_quantity() reads an exact running total, as in InventoryOperations.
+    The public API matches InventoryOperations, except that ``items`` is a
+    read-only view of FreshItem objects built from the columns. The view
+    is cached until the inventory's version changes, and changes made to
+    its items are not written back; get_item(), ``in`` and len() read the
+    columns directly.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._clear()
+        self._view = (None, None)    # (version, read-only items view)
+
+    def _clear(self) -> None:
+        """Drop every row."""
+        self._row = {}               # name -> row number
+        self._names = []             # row number -> name
+        self._quantity = array("d")
+        self._expiry = array("q")    # proleptic Gregorian day ordinals
+        self._unit = array("q")      # codes into self._units
+        self._units = []
+        self._unit_codes = {}
+        self._total = _RunningSum()
+
+    @property
+    def items(self):
+        """Read-only mapping of item names to FreshItem objects, rebuilt when the version changes."""
+        version, view = self._view
+        if view is None or version != self._version:
+            view = MappingProxyType({name: self._make_item(row) for name, row in self._row.items()})
+            self._view = (self._version, view)
+        return view
+
+    @items.setter
+    def items(self, new_items: dict) -> None:
+        self._clear()
+        for name, item in new_items.items():
+            self._append(name, item.quantity, item.unit, item.expiry_ordinal)
+        self._notify("reset", None)
+
+    def add_item(self, name: str, quantity: float, unit: str, expiry_date: str) -> None:
+        """Create or overwrite an item in the inventory."""
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        ordinal = expiry_to_ordinal(expiry_date)
+        self._put(name, quantity, unit, ordinal)
+        if self._listeners:
+            self._notify("add", self._make_item(self._row[name]))
+        else:
+            self._changed("add", name)
+
+    def use_item(self, name: str, quantity: float) -> None:
+        """Reduce the quantity of an item if it exists."""
+        row = self._row.get(name)
+        if row is not None:
+            before = self._quantity[row]
+            self._quantity[row] = max(0, before - quantity)
+            self._total -= before - self._quantity[row]
+            if self._listeners:
+                self._notify("use", self._make_item(row), before - self._quantity[row])
+            else:
+                self._changed("use", name)
+
+    def set_quantity(self, name: str, quantity: float) -> None:
+        """Set the quantity of an item if it exists (not going below zero)."""
+        row = self._row.get(name)
+        if row is not None:
+            self._total -= self._quantity[row]
+            self._quantity[row] = max(0, quantity)
+            self._total += self._quantity[row]
+            if self._listeners:
+                self._notify("set", self._make_item(row))
+            else:
+                self._changed("set", name)
+
+    def remove_item(self, name: str) -> None:
+        """Completely remove an item from the inventory."""
+        row = self._row.get(name)
+        if row is None:
+            return
+        if self._listeners:
+            removed = self._make_item(row)
+        self._total -= self._quantity[row]
+        del self._row[name]
+        # Move the last row into the freed slot so removal stays O(1)
+        last = len(self._names) - 1
+        if row != last:
+            moved = self._names[last]
+            self._names[row] = moved
+            self._quantity[row] = self._quantity[last]
+            self._expiry[row] = self._expiry[last]
+            self._unit[row] = self._unit[last]
+            self._row[moved] = row
+        self._names.pop()
+        self._quantity.pop()
+        self._expiry.pop()
+        self._unit.pop()
+        if self._listeners:
+            self._notify("remove", removed)
+        else:
+            self._changed("remove", name)
+
+    def _existing(self, names) -> set:
+        """Return the subset of 'names' that are in the inventory."""
+        return {name for name in names if name in self._row}
+
+    def _apply_adds(self, rows) -> None:
+        """Store validated (name, quantity, unit, expiry_ordinal) rows."""
+        for name, quantity, unit, ordinal in rows:
+            self._put(name, quantity, unit, ordinal)
+            if self._listeners:
+                self._notify("add", self._make_item(self._row[name]))
+            else:
+                self._changed("add", name)
+
+    def _apply_removes(self, names) -> None:
+        """Remove existing, distinct item names."""
+        for name in names:
+            self.remove_item(name)
+
+    def get_item(self, name: str):
+        """Return the item called 'name' as a FreshItem, or None."""
+        row = self._row.get(name)
+        return None if row is None else self._make_item(row)
+
+    def list_items(self):
+        """Return a list of all items as FreshItem objects."""
+        return [self._make_item(row) for row in range(len(self._names))]
+
+    def iter_records(self):
+        """Yield (name, quantity, unit, expiry_ordinal) for every item."""
+        units = self._units
+        for row, name in enumerate(self._names):
+            yield name, self._quantity[row], units[self._unit[row]], self._expiry[row]
+
+    def iter_by_expiry(self):
+        """Yield (name, quantity, unit, expiry_ordinal) records, soonest-expiring first."""
+        names, expiry = self._names, self._expiry
+        rows = sorted(range(len(names)), key=lambda row: (expiry[row], names[row]))
+        units = self._units
+        for row in rows:
+            yield names[row], self._quantity[row], units[self._unit[row]], expiry[row]
+
+    def __len__(self) -> int:
+        """Return the number of distinct items."""
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        """Return True if an item called 'name' exists."""
+        return name in self._row
+
+    def below_thresholds(self, thresholds: dict):
+        """Return (name, quantity, threshold) for items below their threshold."""
+        rows = []
+        limits = []
+        for name, threshold in thresholds.items():
+            row = self._row.get(name)
+            if row is not None:
+                rows.append(row)
+                limits.append(threshold)
+        if not rows:
+            return []
+        if np is not None:
+            quantity = np.frombuffer(self._quantity, dtype=np.float64)
+            rows = np.asarray(rows, dtype=np.intp)
+            limits = np.asarray(limits, dtype=np.float64)
+            hits = np.flatnonzero(quantity[rows] < limits).tolist()
+            rows = rows.tolist()
+        else:
+            quantity = self._quantity
+            hits = [i for i, row in enumerate(rows) if quantity[row] < limits[i]]
+        hits.sort(key=rows.__getitem__)
+        return [
+            (self._names[rows[i]], self._quantity[rows[i]], thresholds[self._names[rows[i]]])
+            for i in hits
+        ]
+
+    def total_quantity(self) -> float:
+        """Return the sum of quantities of all items (an exact running total)."""
+        return self._total.value()
+
+    def _expiring_before(self, cutoff: datetime):
+        """Return items whose expiry date is strictly before 'cutoff'."""
+        if not self._names:
+            return []
+        bound = cutoff_ordinal(cutoff)
+        if np is not None:
+            expiry = np.frombuffer(self._expiry, dtype=np.int64)
+            rows = np.flatnonzero(expiry < bound).tolist()
+        else:
+            rows = [row for row, day in enumerate(self._expiry) if day < bound]
+        rows.sort(key=lambda row: (self._expiry[row], self._names[row]))
+        return [self._make_item(row) for row in rows]
+
+    def _put(self, name: str, quantity: float, unit: str, ordinal: int) -> None:
+        """Add a row for an item, or overwrite its existing row."""
+        row = self._row.get(name)
+        if row is None:
+            self._append(name, quantity, unit, ordinal)
+        else:
+            self._total -= self._quantity[row]
+            self._quantity[row] = quantity
+            self._expiry[row] = ordinal
+            self._unit[row] = self._intern_unit(unit)
+            self._total += self._quantity[row]
+
+    def _append(self, name: str, quantity: float, unit: str, ordinal: int) -> None:
+        """Add a new row for an item that is not yet stored."""
+        self._row[name] = len(self._names)
+        self._names.append(name)
+        self._quantity.append(quantity)
+        self._total += self._quantity[-1]
+        self._expiry.append(ordinal)
+        self._unit.append(self._intern_unit(unit))
+
+    def _intern_unit(self, unit: str) -> int:
+        """Return the integer code for 'unit', assigning one if needed."""
+        code = self._unit_codes.get(unit)
+        if code is None:
+            code = self._unit_codes[unit] = len(self._units)
+            self._units.append(unit)
+        return code
+
+    def _make_item(self, row: int) -> FreshItem:
+        """Build a FreshItem from the columns of one row."""
+        return FreshItem.from_ordinal(
+            self._names[row],
+            self._quantity[row],
+            self._units[self._unit[row]],
+            self._expiry[row],
+        )
@@ -0,0 +1,196 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+
+from .items import FreshItem, cutoff_ordinal
+from .operations import InventoryOperations, _RunningSum
+
+
+class ConcurrentInventory(InventoryOperations):
+    """
+    Inventory that several threads can change and query at the same time.
+
+    Changes to one item are serialized by a lock chosen from 'stripes'
+    locks by the item name's hash, so threads working on different items
+    rarely wait for each other. Queries never take the item locks; they
+    work on a copy of the item dictionary taken in a single step, so they
+    cannot fail with "dictionary changed size during iteration". For the
+    same reason ``items`` returns a snapshot copy here, not the live
+    dictionary. The version counter and the change sets used by delta
+    saves are shared by all items and updated under one lock, as is the
+    exact running total of quantities. Listeners run after the item's lock
+    is released, on a copy of the listener list, so a callback may change
+    the inventory itself.
+    """
+
+    def __init__(self, stripes: int = 64):
+        super().__init__()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        # Guards self._expiry_index, which every item shares
+        self._index_lock = threading.Lock()
+        # Guards the version and the dirty/removed sets; reentrant since a
+        # "reset" change calls mark_clean()
+        self._changes_lock = threading.RLock()
+        # Guards self._total
+        self._total_lock = threading.Lock()
+
+    def _lock_for(self, name: str):
+        return self._stripes[hash(name) % len(self._stripes)]
+
+    @property
+    def items(self):
+        """Snapshot copy of the dictionary mapping names to FreshItem objects."""
+        return self._items.copy()
+
+    @items.setter
+    def items(self, new_items: dict) -> None:
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            with self._index_lock:
+                self._items = dict(new_items)
+                self._expiry_index = sorted(
+                    (item.expiry_ordinal, name) for name, item in new_items.items()
+                )
+            with self._total_lock:
+                self._total = _RunningSum(item.quantity for item in new_items.values())
+        finally:
+            for lock in self._stripes:
+                lock.release()
+        self._notify("reset", None)
+
+    def add_item(self, name: str, quantity: float, unit: str, expiry_date: str) -> None:
+        """Create or overwrite an item in the inventory."""
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        self._store(name, FreshItem(name, quantity, unit, expiry_date))
+
+    def use_item(self, name: str, quantity: float) -> None:
+        """Atomically reduce the quantity of an item if it exists."""
+        with self._lock_for(name):
+            item = self._items.get(name)
+            if item is None:
+                return
+            before = item.quantity
+            item.reduce_quantity(quantity)
+            used = before - item.quantity
+            self._add_total(-used)
+            self._changed("use", name)
+        self._call_listeners("use", item, used)
+
+    def set_quantity(self, name: str, quantity: float) -> None:
+        """Set the quantity of an item if it exists (not going below zero)."""
+        with self._lock_for(name):
+            item = self._items.get(name)
+            if item is None:
+                return
+            before = item.quantity
+            item.quantity = max(0, quantity)
+            self._add_total(item.quantity - before)
+            self._changed("set", name)
+        self._call_listeners("set", item)
+
+    def remove_item(self, name: str) -> None:
+        """Completely remove an item from the inventory."""
+        with self._lock_for(name):
+            item = self._items.pop(name, None)
+            if item is None:
+                return
+            with self._index_lock:
+                self._drop_key((item.expiry_ordinal, name))
+            self._add_total(-item.quantity)
+            self._changed("remove", name)
+        self._call_listeners("remove", item)
+
+    def list_items(self):
+        """Return a list of all FreshItem objects."""
+        return list(self._items.copy().values())
+
+    def iter_records(self):
+        """Yield (name, quantity, unit, expiry_ordinal) for a snapshot of items."""
+        for name, item in self._items.copy().items():
+            yield name, item.quantity, item.unit, item.expiry_ordinal
+
+    def below_thresholds(self, thresholds: dict):
+        """Return (name, quantity, threshold) for items below their threshold."""
+        alerts = []
+        for name, item in self._items.copy().items():
+            if name in thresholds:
+                quantity = item.quantity  # read once; writers may change it
+                if quantity < thresholds[name]:
+                    alerts.append((name, quantity, thresholds[name]))
+        return alerts
+
+    def total_quantity(self) -> float:
+        """Return the sum of quantities of all items (an exact running total)."""
+        with self._total_lock:
+            return self._total.value()
+
+    def changes(self):
+        """Return copies of the (dirty, removed) name sets, taken together."""
+        with self._changes_lock:
+            return super().changes()
+
+    def mark_clean(self, path: str = None) -> None:
+        """Forget tracked changes; the inventory now matches the file at 'path'."""
+        with self._changes_lock:
+            super().mark_clean(path)
+
+    def _changed(self, op: str, name) -> None:
+        with self._changes_lock:
+            super()._changed(op, name)
+
+    def _changed_many(self, op: str, names) -> None:
+        with self._changes_lock:
+            super()._changed_many(op, names)
+
+    def _notify(self, op: str, item, amount: float = None) -> None:
+        self._changed(op, None if item is None else item.name)
+        self._call_listeners(op, item, amount)
+
+    def _call_listeners(self, op: str, item, amount: float = None) -> None:
+        """Run the listeners of a change; the caller holds no item lock."""
+        for callback in list(self._listeners):
+            callback(op, item, amount)
+
+    def _add_total(self, amount: float) -> None:
+        with self._total_lock:
+            self._total += amount
+
+    def _expiring_before(self, cutoff: datetime):
+        """Return items whose expiry date is strictly before 'cutoff'."""
+        with self._index_lock:
+            end = bisect_left(self._expiry_index, (cutoff_ordinal(cutoff),))
+            keys = self._expiry_index[:end]
+        # An item may be removed after the index was read; skip it then
+        found = (self._items.get(name) for _, name in keys)
+        return [item for item in found if item is not None]
+
+    def _apply_adds(self, rows) -> None:
+        """Store validated (name, quantity, unit, expiry_ordinal) rows."""
+        for name, quantity, unit, ordinal in rows:
+            self._store(name, FreshItem.from_ordinal(name, quantity, unit, ordinal))
+
+    def _apply_removes(self, names) -> None:
+        """Remove existing, distinct item names."""
+        for name in names:
+            self.remove_item(name)
+
+    def _store(self, name: str, item: FreshItem) -> None:
+        """Insert or replace one item under its lock."""
+        with self._lock_for(name):
+            old = self._items.get(name)
+            with self._index_lock:
+                if old is not None:
+                    self._drop_key((old.expiry_ordinal, name))
+                insort(self._expiry_index, (item.expiry_ordinal, name))
+            self._items[name] = item
+            self._add_total(item.quantity - (0 if old is None else old.quantity))
+            self._changed("add", name)
+        self._call_listeners("add", item)
+
+    def _drop_key(self, key) -> None:
+        """Remove one expiry index entry. Caller holds the index lock."""
+        pos = bisect_left(self._expiry_index, key)
+        if pos < len(self._expiry_index) and self._expiry_index[pos] == key:
+            del self._expiry_index[pos]
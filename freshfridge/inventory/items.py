@@ -1,12 +1,58 @@
-from datetime import datetime
+from datetime import date, datetime, time
+from functools import lru_cache
 
 class InvalidExpiryDateError(Exception):
     """Raised when the expiry date format is invalid."""
     pass
 
+
+@lru_cache(maxsize=4096)
+def expiry_to_ordinal(expiry_date: str) -> int:
+    """
+    Convert a 'YYYY-MM-DD' string to a proleptic Gregorian day ordinal.
+
+    Well-formed ISO dates are sliced directly instead of going through
+    strptime; anything else falls back to strptime so the accepted formats
+    do not change. Results are memoized, since inventories repeat the same
+    handful of dates many times.
+    """
+    try:
+        if (
+            len(expiry_date) == 10
+            and expiry_date[4] == "-"
+            and expiry_date[7] == "-"
+            and expiry_date[:4].isdigit()
+            and expiry_date[5:7].isdigit()
+            and expiry_date[8:].isdigit()
+        ):
+            return date(
+                int(expiry_date[:4]), int(expiry_date[5:7]), int(expiry_date[8:])
+            ).toordinal()
+        return datetime.strptime(expiry_date, "%Y-%m-%d").toordinal()
+    except ValueError as e:
+        raise InvalidExpiryDateError(
+            f"Invalid expiry date format: '{expiry_date}'. Must be YYYY-MM-DD"
+        ) from e
+
+
+def cutoff_ordinal(cutoff: datetime) -> int:
+    """
+    Return the first day ordinal whose midnight is not before 'cutoff'.
+
+    An item expiring on day ``d`` has ``expiry_date < cutoff`` exactly when
+    ``d < cutoff_ordinal(cutoff)``.
+    """
+    bound = cutoff.toordinal()
+    if cutoff.time() != time(0):
+        bound += 1
+    return bound
+
+
 class BaseItem:
     """Parent class storing basic item information."""
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         self.name = name
 
@@ -20,18 +66,44 @@ class FreshItem(BaseItem):
     Child class with quantity, unit, and expiry date.
 
     Demonstrates inheritance (BaseItem -> FreshItem).
+
+    The expiry date is stored as an integer day ordinal (``expiry_ordinal``);
+    the ``expiry_date`` datetime is only built the first time it is read.
+    Inventories index items by expiry, so the date is read-only; change it
+    through the inventory's set_expiry().
     """
 
+    __slots__ = ("quantity", "unit", "expiry_ordinal", "_expiry_date")
+
     def __init__(self, name: str, quantity: float, unit: str, expiry_date: str):
         super().__init__(name)
         self.quantity = quantity
         self.unit = unit
-        try:
-            self.expiry_date = datetime.strptime(expiry_date, "%Y-%m-%d")
-        except ValueError as e:
-            raise InvalidExpiryDateError(
-                f"Invalid expiry date format: '{expiry_date}'. Must be YYYY-MM-DD"
-            ) from e
+        self.expiry_ordinal = expiry_to_ordinal(expiry_date)
+        self._expiry_date = None
+
+    @classmethod
+    def from_ordinal(cls, name: str, quantity: float, unit: str, expiry_ordinal: int):
+        """Create an item from an already parsed expiry day ordinal."""
+        item = cls.__new__(cls)
+        item.name = name
+        item.quantity = quantity
+        item.unit = unit
+        item.expiry_ordinal = expiry_ordinal
+        item._expiry_date = None
+        return item
+
+    @property
+    def expiry_date(self) -> datetime:
+        """Expiry date as a datetime at midnight."""
+        if self._expiry_date is None:
+            self._expiry_date = datetime.fromordinal(self.expiry_ordinal)
+        return self._expiry_date
+
+    def _set_expiry_ordinal(self, expiry_ordinal: int) -> None:
+        """Change the expiry date; only the inventory holding the item calls this."""
+        self.expiry_ordinal = expiry_ordinal
+        self._expiry_date = None
 
     def reduce_quantity(self, amount: float) -> None:
         """Reduce quantity by a given amount (not going below zero)."""
@@ -39,8 +111,8 @@ class FreshItem(BaseItem):
 
     def is_expiring_within(self, days: int) -> bool:
         """Return True if the item expires within the next 'days' days."""
-        return (self.expiry_date - datetime.today()).days <= days
+        return self.expiry_ordinal < cutoff_ordinal(datetime.today()) + days + 1
 
     def is_expired(self) -> bool:
         """Return True if the item is already expired."""
-        return self.expiry_date < datetime.today()
+        return self.expiry_ordinal < cutoff_ordinal(datetime.today())
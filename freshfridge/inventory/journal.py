@@ -0,0 +1,275 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date
+
+from .persistence import (
+    _COMPACT,
+    DELTA_SUFFIX,
+    InventoryPersistence,
+    RecordSnapshot,
+    _detect_format,
+    _lots_field,
+    _replay_records,
+    _saved_lots,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryJournal:
+    """
+    Write-ahead log of inventory changes on top of a JSON snapshot.
+
+    Every add/use/set/remove on the inventory is appended to the log as one
+    compact JSON array. Records hold the resulting state rather than the
+    delta, so replaying a record twice is harmless:
+
+    - ``["a", name, quantity, unit, expiry_date]``, with the item's lots
+      as a sixth field when it holds several (LotInventory)
+    - ``["q", name, quantity]``
+    - ``["r", name]``
+    - ``["t", thresholds]`` (the whole ThresholdStore.to_dict())
+
+    Records are buffered and written with a single fsync once 'commit_every'
+    records are pending or 'commit_interval' seconds have passed (group
+    commit). After 'compact_every' records the log is rotated and a
+    background thread writes a fresh snapshot, after which the rotated log is
+    deleted. An error in the background thread is logged, and raised from
+    the next commit(), compact() or close(); a failed snapshot keeps the
+    rotated log, so its records are replayed by the next open().
+
+    Usage::
+
+        with InventoryJournal(inventory, "inventory.json"):
+            inventory.add_item("Milk", 2, "L", "2025-12-18")
+    """
+
+    def __init__(
+        self,
+        inventory,
+        snapshot_path: str = "inventory.json",
+        log_path: str = None,
+        commit_every: int = 100,
+        commit_interval: float = 0.05,
+        compact_every: int = 100000,
+        thresholds=None,
+    ):
+        self.inventory = inventory
+        self.thresholds = thresholds
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path or snapshot_path + ".log"
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._pending = []
+        self._first_pending = 0.0
+        self._logged = 0        # records in the current log file
+        self._log = None
+        self._snapshot_job = None
+        self._snapshot_thresholds = None
+        self._idle = threading.Event()   # set while no snapshot is pending
+        self._idle.set()
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = True
+        self._error = None      # raised by the next commit(), compact() or close()
+
+    @property
+    def _rotated_path(self) -> str:
+        return self.log_path + ".old"
+
+    def open(self):
+        """Replay the snapshot and logs into the inventory and start logging."""
+        InventoryPersistence.load_inventory(self.inventory, self.snapshot_path, thresholds=self.thresholds)
+        for path in (self._rotated_path, self.log_path):
+            self._logged += self.replay(self.inventory, path, self.thresholds)
+        self._log = open(self.log_path, "a")
+        self._closed = False
+        self.inventory.subscribe(self._record)
+        if self.thresholds is not None:
+            self.thresholds.subscribe(self._record_thresholds)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        if os.path.exists(self._rotated_path):
+            self.compact()
+        return self
+
+    def close(self) -> None:
+        """Commit pending records, finish any snapshot and stop logging."""
+        if self._closed:
+            return
+        self.inventory.unsubscribe(self._record)
+        if self.thresholds is not None:
+            self.thresholds.unsubscribe(self._record_thresholds)
+        with self._lock:
+            self._commit()
+            self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._log.close()
+        self._raise_error()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def commit(self) -> None:
+        """Write and fsync all buffered records now."""
+        with self._lock:
+            self._commit()
+        self._raise_error()
+
+    def compact(self, wait: bool = True) -> None:
+        """
+        Fold the log into a new snapshot.
+
+        The inventory is copied in the calling thread; the snapshot itself is
+        written by the background thread. With 'wait', block until it is done.
+        """
+        self._idle.wait()
+        with self._lock:
+            self._rotate()
+        if wait:
+            self._idle.wait()
+            self._raise_error()
+
+    @staticmethod
+    def replay(inventory, path: str, thresholds=None) -> int:
+        """
+        Apply the records of a log file to 'inventory' (and threshold
+        records to the 'thresholds' store, if given); return their count.
+
+        A torn final record left by a crash is cut off the file.
+        """
+        try:
+            with open(path, "rb") as f:
+                count, good_size = _replay_records(inventory, f, thresholds)
+                torn = good_size != os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return 0
+        if torn:
+            os.truncate(path, good_size)
+        return count
+
+    def _record(self, op: str, item, amount: float = None) -> None:
+        """Inventory listener: buffer one log record for a change."""
+        if op == "reset":
+            # The whole inventory was replaced; only a new snapshot captures it
+            self.compact(wait=False)
+            return
+        if op == "add":
+            record = ["a", item.name, item.quantity, item.unit,
+                      date.fromordinal(item.expiry_ordinal).isoformat()]
+            lots = _saved_lots(self.inventory, [item.name]).get(item.name)
+            if lots is not None:
+                record.append(_lots_field(lots))
+        elif op == "remove":
+            record = ["r", item.name]
+        else:
+            record = ["q", item.name, item.quantity]
+        self._append(record)
+
+    def _record_thresholds(self, thresholds) -> None:
+        """ThresholdStore listener: log the store's new contents."""
+        self._append(["t", thresholds.to_dict()])
+
+    def _append(self, record) -> None:
+        """Buffer one log record, committing or rotating when due."""
+        with self._lock:
+            if not self._pending:
+                self._first_pending = time.monotonic()
+            self._pending.append(_COMPACT(record))
+            if len(self._pending) >= self.commit_every:
+                self._commit()
+            if self._logged >= self.compact_every and self._snapshot_job is None:
+                self._rotate()
+
+    def _commit(self) -> None:
+        """Write pending records and fsync the log. Caller holds the lock."""
+        if not self._pending or self._closed:
+            return
+        self._pending.append("")
+        self._log.write("\n".join(self._pending))
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._logged += len(self._pending) - 1
+        self._pending = []
+
+    def _rotate(self) -> None:
+        """
+        Move the current log aside and queue a snapshot of the inventory.
+        Caller holds the lock.
+        """
+        self._commit()
+        self._log.close()
+        if os.path.exists(self._rotated_path):
+            # An earlier snapshot did not finish; keep its records too
+            with open(self.log_path, "r") as src, open(self._rotated_path, "a") as dst:
+                dst.write(src.read())
+            os.remove(self.log_path)
+        elif os.path.exists(self.log_path):
+            os.replace(self.log_path, self._rotated_path)
+        self._log = open(self.log_path, "a")
+        self._logged = 0
+        self._snapshot_job = RecordSnapshot(self.inventory.iter_records(), _saved_lots(self.inventory))
+        self._snapshot_thresholds = None if self.thresholds is None else self.thresholds.copy()
+        self._idle.clear()
+        self._wake.set()
+
+    def _run(self) -> None:
+        """Background thread: time-based group commit and snapshot writing."""
+        while True:
+            self._wake.wait(self.commit_interval)
+            self._wake.clear()
+            with self._lock:
+                closed = self._closed
+                try:
+                    if self._pending and time.monotonic() - self._first_pending >= self.commit_interval:
+                        self._commit()
+                except Exception as e:
+                    self._failed("Committing the journal", e)
+            if self._snapshot_job is not None:
+                try:
+                    self._write_snapshot(self._snapshot_job)
+                except Exception as e:
+                    # The rotated log is kept and replayed next time
+                    self._failed("Writing the snapshot", e)
+                finally:
+                    self._snapshot_job = None
+                    self._idle.set()
+            if closed:
+                return
+
+    def _failed(self, action: str, error: Exception) -> None:
+        """Log an error of the background thread and keep it for the caller."""
+        logger.error("%s %s failed", action, self.snapshot_path, exc_info=error)
+        self._error = error
+
+    def _raise_error(self) -> None:
+        """Raise the last error of the background thread, once."""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _write_snapshot(self, job: RecordSnapshot) -> None:
+        """Atomically replace the snapshot file, then drop its patch file and the rotated log."""
+        tmp_path = self.snapshot_path + ".tmp"
+        InventoryPersistence.save_inventory(
+            job, tmp_path, fmt=_detect_format(self.snapshot_path), streaming=True,
+            thresholds=self._snapshot_thresholds,
+        )
+        with open(tmp_path, "r") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # The full snapshot supersedes any delta saves
+        if os.path.exists(self.snapshot_path + DELTA_SUFFIX):
+            os.remove(self.snapshot_path + DELTA_SUFFIX)
+        with self._lock:
+            if os.path.exists(self._rotated_path):
+                os.remove(self._rotated_path)
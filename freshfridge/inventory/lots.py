@@ -0,0 +1,263 @@
+import heapq
+from datetime import datetime
+from itertools import count
+
+from .items import FreshItem, cutoff_ordinal, expiry_to_ordinal
+from .operations import InventoryOperations, _RunningSum
+
+# Fields of a lot: [expiry_ordinal, sequence number, quantity]
+_EXPIRY, _SEQ, _QUANTITY = 0, 1, 2
+
+
+class LotInventory(InventoryOperations):
+    """
+    Inventory where an item can hold several lots with their own expiry dates.
+
+    add_item() adds a lot instead of overwriting the item, and use_item()
+    consumes lots first-expired-first-out (FEFO). Each item keeps its lots
+    in a min-heap ordered by expiry, so using an item costs O(log lots) per
+    lot touched. Every lot also has a key in a global min-heap of
+    (expiry_ordinal, name, seq); keys of dropped lots stay there until they
+    outnumber the live ones and the heap is compacted. Adding or dropping a
+    lot costs O(log lots) amortized, and expiry alerts return one FreshItem
+    per lot, visiting only the heap entries that expire before the cutoff.
+
+    The FreshItem objects in ``items`` are per-item aggregates: 'quantity'
+    is the maintained sum of the lots and 'expiry_date' the earliest lot's
+    date. The unit is that of the most recently added lot. iter_records()
+    yields aggregates too; iter_lots() yields one record per lot. Saves,
+    delta saves and the journal store the lots of multi-lot items in a
+    "lots" field next to the aggregate record (see saved_lots()), and loads
+    into a LotInventory restore them with restore_lots().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lots = {}        # name -> heap of [expiry_ordinal, seq, quantity]
+        self._by_seq = {}      # seq -> lot
+        self._seq = count()
+
+    @property
+    def items(self):
+        """Dictionary mapping item names to aggregate FreshItem objects."""
+        return self._items
+
+    @items.setter
+    def items(self, new_items: dict) -> None:
+        self._items, self._lots, self._by_seq = {}, {}, {}
+        self._expiry_index = []
+        self._total = _RunningSum()
+        self._apply_adds(
+            [(name, item.quantity, item.unit, item.expiry_ordinal) for name, item in new_items.items()],
+            notify=False,
+        )
+        self._notify("reset", None)
+
+    def add_item(self, name: str, quantity: float, unit: str, expiry_date: str) -> None:
+        """Add a lot of an item; lots with other expiry dates are kept."""
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        key = self._add_lot(name, quantity, unit, expiry_to_ordinal(expiry_date))
+        heapq.heappush(self._expiry_index, key)
+        self._notify("add", self._items[name])
+
+    def use_item(self, name: str, quantity: float) -> None:
+        """
+        Reduce the quantity of an item if it exists, taking from the lot that
+        expires first. Emptied lots are dropped, except the item's last one.
+        """
+        item = self._items.get(name)
+        if item is not None:
+            used = self._consume(name, item, quantity)
+            self._notify("use", item, used)
+
+    def set_quantity(self, name: str, quantity: float) -> None:
+        """
+        Set the total quantity of an item if it exists (not going below zero).
+        A decrease is consumed FEFO; an increase goes to the latest lot.
+        """
+        item = self._items.get(name)
+        if item is None:
+            return
+        quantity = max(0, quantity)
+        if quantity < item.quantity:
+            self._consume(name, item, item.quantity - quantity)
+        elif quantity > item.quantity:
+            latest = max(self._lots[name])
+            extra = quantity - item.quantity
+            latest[_QUANTITY] += extra
+            item.quantity += extra
+            self._total += extra
+        self._notify("set", item)
+
+    def set_expiry(self, name: str, expiry_date: str) -> None:
+        """Merge the lots of an item, if it exists, into one expiring on 'expiry_date'."""
+        item = self._items.get(name)
+        if item is not None:
+            ordinal = expiry_to_ordinal(expiry_date)
+            self._forget(name)
+            self._apply_adds([(name, item.quantity, item.unit, ordinal)])
+            self._prune()
+
+    def remove_item(self, name: str) -> None:
+        """Remove an item and all of its lots."""
+        if name in self._items:
+            self._notify("remove", self._forget(name))
+            self._prune()
+
+    def lots(self, name: str):
+        """Return the lots of an item as FreshItem objects, soonest-expiring first."""
+        item = self._items.get(name)
+        if item is None:
+            return []
+        return [
+            FreshItem.from_ordinal(name, lot[_QUANTITY], item.unit, lot[_EXPIRY])
+            for lot in sorted(self._lots[name])
+        ]
+
+    def lot_count(self) -> int:
+        """Return the number of lots over all items."""
+        return len(self._by_seq)
+
+    def iter_lots(self):
+        """Yield (name, quantity, unit, expiry_ordinal) for every lot, by expiry."""
+        items, by_seq = self._items, self._by_seq
+        for ordinal, name, seq in sorted(key for key in self._expiry_index if key[2] in by_seq):
+            lot = by_seq.get(seq)
+            if lot is not None:
+                yield name, lot[_QUANTITY], items[name].unit, ordinal
+
+    def saved_lots(self, names=None) -> dict:
+        """
+        Return {name: [(quantity, expiry_ordinal), ...]} (soonest first) for
+        the items, of 'names' or all, that hold more than one lot; saving
+        writes these next to the aggregate records so lots survive a reload.
+        """
+        lots = self._lots
+        if names is None:
+            names = lots
+        return {
+            name: [(lot[_QUANTITY], lot[_EXPIRY]) for lot in sorted(lots[name])]
+            for name in names
+            if len(lots.get(name, ())) > 1
+        }
+
+    def restore_lots(self, name: str, unit: str, lots) -> None:
+        """Replace an item with saved (quantity, expiry_ordinal) lots."""
+        self.remove_item(name)
+        self._apply_adds([(name, quantity, unit, ordinal) for quantity, ordinal in lots])
+
+    def iter_by_expiry(self):
+        """Yield aggregate records of items, ordered by their earliest lot."""
+        items = self._items
+        for _, name in sorted((item.expiry_ordinal, name) for name, item in items.items()):
+            item = items.get(name)
+            if item is not None:
+                yield name, item.quantity, item.unit, item.expiry_ordinal
+
+    def _apply_adds(self, rows, notify: bool = True) -> None:
+        """
+        Add validated (name, quantity, unit, expiry_ordinal) rows as lots.
+        Listeners are notified once the expiry heap holds the whole batch.
+        """
+        keys = []
+        try:
+            for name, quantity, unit, ordinal in rows:
+                keys.append(self._add_lot(name, quantity, unit, ordinal))
+        finally:
+            heap = self._expiry_index
+            if len(keys) * 8 > len(heap):
+                # A large batch: re-heapify once in O(n)
+                heap.extend(keys)
+                heapq.heapify(heap)
+            else:
+                for key in keys:
+                    heapq.heappush(heap, key)
+            if notify:
+                for _, name, _ in keys:
+                    self._notify("add", self._items[name])
+
+    def _apply_removes(self, names) -> None:
+        """Remove existing, distinct item names and all of their lots."""
+        for name in names:
+            self._notify("remove", self._forget(name))
+        self._prune()
+
+    def _expiring_before(self, cutoff: datetime):
+        """Return one FreshItem per lot expiring strictly before 'cutoff'."""
+        bound = cutoff_ordinal(cutoff)
+        heap, items, by_seq = self._expiry_index, self._items, self._by_seq
+        size = len(heap)
+        keys, stack = [], [0] if heap else []
+        while stack:
+            # Every child of an entry expiring at or after the cutoff does too
+            pos = stack.pop()
+            key = heap[pos]
+            if key[0] < bound:
+                if key[2] in by_seq:
+                    keys.append(key)
+                stack.extend(child for child in (2 * pos + 1, 2 * pos + 2) if child < size)
+        keys.sort()
+        return [
+            FreshItem.from_ordinal(name, by_seq[seq][_QUANTITY], items[name].unit, ordinal)
+            for ordinal, name, seq in keys
+        ]
+
+    def _add_lot(self, name: str, quantity: float, unit: str, ordinal: int):
+        """Add one lot, updating the aggregate item; return its index key."""
+        seq = next(self._seq)
+        lot = [ordinal, seq, quantity]
+        self._by_seq[seq] = lot
+        item = self._items.get(name)
+        if item is None:
+            self._items[name] = FreshItem.from_ordinal(name, quantity, unit, ordinal)
+            self._lots[name] = [lot]
+        else:
+            heap = self._lots[name]
+            if len(heap) == 1 and heap[0][_QUANTITY] == 0:
+                # The item's only lot was used up; the new lot replaces it
+                del self._by_seq[heap[0][_SEQ]]
+                heap[0] = lot
+            else:
+                heapq.heappush(heap, lot)
+            item.quantity += quantity
+            item.unit = unit
+            if heap[0][_EXPIRY] != item.expiry_ordinal:
+                item._set_expiry_ordinal(heap[0][_EXPIRY])
+        self._total += quantity
+        return (ordinal, name, seq)
+
+    def _consume(self, name: str, item: FreshItem, quantity: float) -> float:
+        """Take up to 'quantity' from an item's lots FEFO; return the amount used."""
+        heap = self._lots[name]
+        used = 0
+        while used < quantity:
+            lot = heap[0]
+            take = min(lot[_QUANTITY], quantity - used)
+            lot[_QUANTITY] -= take
+            used += take
+            if lot[_QUANTITY] > 0 or len(heap) == 1:
+                break
+            heapq.heappop(heap)
+            del self._by_seq[lot[_SEQ]]
+        self._prune()
+        if heap[0][_EXPIRY] != item.expiry_ordinal:
+            item._set_expiry_ordinal(heap[0][_EXPIRY])
+        item.quantity = max(0, item.quantity - used)
+        self._total -= used
+        return used
+
+    def _forget(self, name: str) -> FreshItem:
+        """Drop an item and its lots (their index keys go stale); return the item."""
+        for lot in self._lots.pop(name):
+            del self._by_seq[lot[_SEQ]]
+        item = self._items.pop(name)
+        self._total -= item.quantity
+        return item
+
+    def _prune(self) -> None:
+        """Compact the expiry heap once stale keys outnumber the live lots."""
+        by_seq = self._by_seq
+        if len(self._expiry_index) > 2 * len(by_seq) + 64:
+            self._expiry_index = [key for key in self._expiry_index if key[2] in by_seq]
+            heapq.heapify(self._expiry_index)
@@ -1,4 +1,76 @@
-from .items import FreshItem
+import math
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+
+from .items import FreshItem, InvalidExpiryDateError, cutoff_ordinal, expiry_to_ordinal
+
+
+class BatchResult:
+    """
+    Outcome of a bulk operation: the number of rows applied, and a
+    (row index, name, exception) tuple for every rejected row.
+    """
+
+    def __init__(self, applied: int = 0, errors=None):
+        self.applied = applied
+        self.errors = errors if errors is not None else []
+
+    @property
+    def ok(self) -> bool:
+        """True if no row was rejected."""
+        return not self.errors
+
+    def __repr__(self) -> str:
+        return f"BatchResult(applied={self.applied}, errors={len(self.errors)})"
+
+
+class _RunningSum:
+    """
+    Exact running sum of quantities, updated with += and -=.
+
+    It keeps the non-overlapping partial sums math.fsum() uses, so adding
+    and later subtracting the same quantities gives back exactly the old
+    total instead of accumulating rounding error.
+    """
+
+    __slots__ = ("_partials",)
+
+    def __init__(self, values=()):
+        self._partials = []
+        for value in values:
+            self += value
+
+    def __iadd__(self, value):
+        partials, i = self._partials, 0
+        for partial in partials:
+            if abs(value) < abs(partial):
+                value, partial = partial, value
+            high = value + partial
+            low = partial - (high - value)
+            if low:
+                partials[i] = low
+                i += 1
+            value = high
+        partials[i:] = [value]
+        return self
+
+    def __isub__(self, value):
+        return self.__iadd__(-value)
+
+    def value(self) -> float:
+        """Return the correctly rounded sum."""
+        return math.fsum(self._partials)
+
+
+def _batch_rows(rows, *columns):
+    """Return 'rows', or the given equal-length columns zipped into rows."""
+    if rows is not None:
+        return rows
+    if any(column is None for column in columns):
+        raise TypeError("Pass either rows or every column")
+    if len(set(len(column) for column in columns)) > 1:
+        raise ValueError("Columns must all have the same length")
+    return zip(*columns)
 
 
 class InventoryOperations:
@@ -6,24 +78,374 @@ class InventoryOperations:
 
     def __init__(self):
         # Dictionary: name -> FreshItem
-        self.items = {}
+        self._items = {}
+        # Sorted list of (expiry_ordinal, name), kept in step with self._items
+        self._expiry_index = []
+        # Callbacks notified as callback(op, item, amount) after each change
+        self._listeners = []
+        # Bumped by every change; lets callers cache results per version
+        self._version = 0
+        # Exact running sum of all quantities, kept up to date by every change
+        self._total = _RunningSum()
+        # Names changed or removed since the last mark_clean(), and the file
+        # that clean state matches (None: only a full save is safe)
+        self._dirty = set()
+        self._removed = set()
+        self._synced_path = None
+
+    @property
+    def version(self) -> int:
+        """Number that increases whenever the inventory changes."""
+        return self._version
+
+    @property
+    def items(self):
+        """Dictionary mapping item names to FreshItem objects."""
+        return self._items
+
+    @items.setter
+    def items(self, new_items: dict) -> None:
+        self._items = new_items
+        self._expiry_index = sorted(
+            (item.expiry_ordinal, name) for name, item in new_items.items()
+        )
+        self._total = _RunningSum(item.quantity for item in new_items.values())
+        self._notify("reset", None)
 
     def add_item(self, name: str, quantity: float, unit: str, expiry_date: str) -> None:
         """Create or overwrite an item in the inventory."""
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
-        self.items[name] = FreshItem(name, quantity, unit, expiry_date)
+        item = FreshItem(name, quantity, unit, expiry_date)
+        old = self._items.get(name)
+        if old is not None:
+            self._unindex(name)
+            self._total -= old.quantity
+        self._items[name] = item
+        self._total += quantity
+        insort(self._expiry_index, (item.expiry_ordinal, name))
+        self._notify("add", item)
+
+    def add_items(
+        self,
+        rows=None,
+        *,
+        names=None,
+        quantities=None,
+        units=None,
+        expiry_dates=None,
+        atomic: bool = False,
+    ):
+        """
+        Create or overwrite many items in one batch.
+
+        Pass either 'rows' of (name, quantity, unit, expiry_date) or the four
+        columns as separate sequences. All rows are validated first, parsing
+        each distinct expiry date once; invalid rows are reported in the
+        returned BatchResult instead of raising. With 'atomic', nothing is
+        applied unless every row is valid.
+        """
+        rows = _batch_rows(rows, names, quantities, units, expiry_dates)
+        parsed, errors = [], []
+        ordinals = {}
+        for index, row in enumerate(rows):
+            name = None
+            try:
+                name, quantity, unit, expiry_date = row
+                if not isinstance(name, str):
+                    raise TypeError("Item name must be a string")
+                if quantity <= 0:
+                    raise ValueError("Quantity must be positive")
+                ordinal = ordinals.get(expiry_date)
+                if ordinal is None:
+                    ordinal = ordinals[expiry_date] = expiry_to_ordinal(expiry_date)
+            except (TypeError, ValueError, InvalidExpiryDateError) as e:
+                errors.append((index, name, e))
+                continue
+            parsed.append((name, quantity, unit, ordinal))
+        if errors and atomic:
+            return BatchResult(0, errors)
+        self._apply_adds(parsed)
+        return BatchResult(len(parsed), errors)
 
     def use_item(self, name: str, quantity: float) -> None:
         """Reduce the quantity of an item if it exists."""
-        if name in self.items:
-            self.items[name].reduce_quantity(quantity)
+        # Quantity changes never move an item within the expiry index.
+        item = self._items.get(name)
+        if item is not None:
+            before = item.quantity
+            item.reduce_quantity(quantity)
+            self._total -= before - item.quantity
+            self._notify("use", item, before - item.quantity)
+
+    def use_items(self, rows=None, *, names=None, quantities=None, atomic: bool = False):
+        """
+        Use many items in one batch, from (name, quantity) 'rows' or from
+        'names' and 'quantities' columns.
+
+        Rows naming unknown items or negative quantities are reported in the
+        returned BatchResult. With 'atomic', nothing is applied unless every
+        row is valid.
+        """
+        rows = _batch_rows(rows, names, quantities)
+        parsed, errors = [], []
+        for index, row in enumerate(rows):
+            name = None
+            try:
+                name, quantity = row
+                if not isinstance(name, str):
+                    raise TypeError("Item name must be a string")
+                if quantity < 0:
+                    raise ValueError("Quantity to use must not be negative")
+            except (TypeError, ValueError) as e:
+                errors.append((index, name, e))
+                continue
+            parsed.append((index, name, quantity))
+        existing = self._existing(name for _, name, _ in parsed)
+        valid = []
+        for index, name, quantity in parsed:
+            if name in existing:
+                valid.append((name, quantity))
+            else:
+                errors.append((index, name, KeyError(name)))
+        errors.sort(key=lambda error: error[0])
+        if errors and atomic:
+            return BatchResult(0, errors)
+        self._apply_uses(valid)
+        return BatchResult(len(valid), errors)
+
+    def set_quantity(self, name: str, quantity: float) -> None:
+        """Set the quantity of an item if it exists (not going below zero)."""
+        item = self._items.get(name)
+        if item is not None:
+            self._total -= item.quantity
+            item.quantity = max(0, quantity)
+            self._total += item.quantity
+            self._notify("set", item)
+
+    def set_expiry(self, name: str, expiry_date: str) -> None:
+        """
+        Change the expiry date of an item if it exists. The item is stored
+        again under its new date (notified as "add"), keeping the expiry
+        index in order.
+        """
+        item = self.get_item(name)
+        if item is not None:
+            self._apply_adds([(name, item.quantity, item.unit, expiry_to_ordinal(expiry_date))])
 
     def remove_item(self, name: str) -> None:
         """Completely remove an item from the inventory."""
-        if name in self.items:
-            del self.items[name]
+        if name in self._items:
+            self._unindex(name)
+            item = self._items.pop(name)
+            self._total -= item.quantity
+            self._notify("remove", item)
+
+    def remove_items(self, names, atomic: bool = False):
+        """
+        Remove many items in one batch. Unknown names are reported in the
+        returned BatchResult; with 'atomic', nothing is removed unless every
+        name exists. Repeated names are removed once and are not errors.
+        """
+        names = list(names)
+        existing = self._existing(name for name in names if isinstance(name, str))
+        valid, errors, seen = [], [], set()
+        for index, name in enumerate(names):
+            if isinstance(name, str) and name in existing:
+                if name not in seen:
+                    valid.append(name)
+                    seen.add(name)
+            else:
+                errors.append((index, name, KeyError(name)))
+        if errors and atomic:
+            return BatchResult(0, errors)
+        self._apply_removes(valid)
+        return BatchResult(len(valid), errors)
+
+    def _existing(self, names) -> set:
+        """Return the subset of 'names' that are in the inventory."""
+        return {name for name in names if name in self._items}
+
+    def _apply_adds(self, rows) -> None:
+        """
+        Store validated (name, quantity, unit, expiry_ordinal) rows. Listeners
+        are notified once the expiry index holds the whole batch.
+        """
+        items = self._items
+        added = []
+        try:
+            for name, quantity, unit, ordinal in rows:
+                item = FreshItem.from_ordinal(name, quantity, unit, ordinal)
+                old = items.get(name)
+                if old is not None:
+                    self._unindex(name)
+                    self._total -= old.quantity
+                items[name] = item
+                self._total += quantity
+                added.append(item)
+        finally:
+            # Merge the index once; drop keys of rows replaced later in the batch
+            # (dict.fromkeys keeps the order, so presorted rows stay cheap to sort)
+            keys = list(dict.fromkeys(
+                (item.expiry_ordinal, item.name) for item in added if items[item.name] is item
+            ))
+            keys.sort()
+            self._expiry_index.extend(keys)
+            self._expiry_index.sort()
+            if self._listeners:
+                for item in added:
+                    self._notify("add", item)
+            else:
+                self._changed_many("add", [item.name for item in added])
+
+    def _apply_uses(self, rows) -> None:
+        """Apply validated (name, quantity) rows for existing items."""
+        for name, quantity in rows:
+            self.use_item(name, quantity)
+
+    def _apply_removes(self, names) -> None:
+        """Remove existing, distinct item names."""
+        # Small batches unindex item by item; large ones filter the index once
+        one_by_one = len(names) * 32 < len(self._expiry_index)
+        removed, dropped = [], set()
+        for name in names:
+            if one_by_one:
+                self._unindex(name)
+            item = self._items.pop(name)
+            self._total -= item.quantity
+            removed.append(item)
+            dropped.add((item.expiry_ordinal, name))
+        if not one_by_one:
+            self._expiry_index = [key for key in self._expiry_index if key not in dropped]
+        for item in removed:
+            self._notify("remove", item)
+
+    def get_item(self, name: str):
+        """Return the FreshItem called 'name', or None if it does not exist."""
+        return self._items.get(name)
 
     def list_items(self):
         """Return a list of all FreshItem objects."""
-        return list(self.items.values())
+        return list(self._items.values())
+
+    def iter_records(self):
+        """Yield (name, quantity, unit, expiry_ordinal) for every item."""
+        for name, item in self._items.items():
+            yield name, item.quantity, item.unit, item.expiry_ordinal
+
+    def iter_by_expiry(self):
+        """Yield (name, quantity, unit, expiry_ordinal) records, soonest-expiring first."""
+        items = self._items
+        # Walk a copy of the expiry index; skip items removed meanwhile
+        for ordinal, name in self._expiry_index[:]:
+            item = items.get(name)
+            if item is not None:
+                yield name, item.quantity, item.unit, ordinal
+
+    def __len__(self) -> int:
+        """Return the number of distinct items."""
+        return len(self._items)
+
+    def __contains__(self, name: str) -> bool:
+        """Return True if an item called 'name' exists."""
+        return name in self._items
+
+    def below_thresholds(self, thresholds: dict):
+        """Return (name, quantity, threshold) for items below their threshold."""
+        return [
+            (name, item.quantity, thresholds[name])
+            for name, item in self._items.items()
+            if name in thresholds and item.quantity < thresholds[name]
+        ]
+
+    def total_quantity(self) -> float:
+        """Return the sum of quantities of all items (an exact running total)."""
+        return self._total.value()
+
+    def subscribe(self, callback) -> None:
+        """
+        Call 'callback(op, item, amount)' after every change to the inventory.
+
+        'op' is "add", "use", "set", "remove" or "reset" (the whole ``items``
+        dictionary was replaced; 'item' is None). 'amount' is the quantity
+        actually consumed for "use" and None otherwise.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Stop calling a callback registered with subscribe()."""
+        self._listeners.remove(callback)
+
+    def changes(self):
+        """
+        Return (dirty, removed): copies of the sets of item names added or
+        changed, and removed, since the last mark_clean().
+        """
+        return set(self._dirty), set(self._removed)
+
+    @property
+    def synced_path(self):
+        """
+        File the inventory matched at the last mark_clean(), or None if the
+        whole ``items`` dictionary was replaced since.
+        """
+        return self._synced_path
+
+    def mark_clean(self, path: str = None) -> None:
+        """Forget tracked changes; the inventory now matches the file at 'path'."""
+        self._dirty.clear()
+        self._removed.clear()
+        self._synced_path = path
+
+    def _changed(self, op: str, name) -> None:
+        """Bump the version and track 'name' for delta saves."""
+        self._version += 1
+        if op == "remove":
+            self._dirty.discard(name)
+            self._removed.add(name)
+        elif op == "reset":
+            self.mark_clean(None)
+        else:
+            self._dirty.add(name)
+            self._removed.discard(name)
+
+    def _changed_many(self, op: str, names) -> None:
+        """Track a batch of changed names, bumping the version once."""
+        if names:
+            if op == "remove":
+                self._dirty.difference_update(names)
+                self._removed.update(names)
+            else:
+                self._dirty.update(names)
+                self._removed.difference_update(names)
+            self._version += 1
+
+    def _notify(self, op: str, item, amount: float = None) -> None:
+        self._changed(op, None if item is None else item.name)
+        for callback in self._listeners:
+            callback(op, item, amount)
+
+    def expiring_within(self, days: int, now: datetime = None):
+        """Return items expiring within the next 'days' days, soonest first."""
+        if now is None:
+            now = datetime.today()
+        # (expiry - now).days <= days  <=>  expiry < now + (days + 1)
+        return self._expiring_before(now + timedelta(days=days + 1))
+
+    def expired_items(self, now: datetime = None):
+        """Return items that are already expired, oldest first."""
+        if now is None:
+            now = datetime.today()
+        return self._expiring_before(now)
+
+    def _expiring_before(self, cutoff: datetime):
+        """Return items whose expiry date is strictly before 'cutoff'."""
+        end = bisect_left(self._expiry_index, (cutoff_ordinal(cutoff),))
+        return [self._items[name] for _, name in self._expiry_index[:end]]
+
+    def _unindex(self, name: str) -> None:
+        """Drop the expiry index entry of an existing item."""
+        key = (self._items[name].expiry_ordinal, name)
+        pos = bisect_left(self._expiry_index, key)
+        if pos < len(self._expiry_index) and self._expiry_index[pos] == key:
+            del self._expiry_index[pos]
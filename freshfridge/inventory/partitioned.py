@@ -0,0 +1,226 @@
+"""
+Partitioned inventory files that load in parallel.
+
+A partitioned inventory is a directory holding a manifest and N part files.
+Items are assigned to parts by the CRC-32 of their UTF-8 name, and each part
+is an ordinary JSON Lines inventory file::
+
+    inventory.parts/
+        manifest.json       {"format": ..., "partitions": N, "parts": [...], ...}
+        part-00000.jsonl
+        part-00001.jsonl
+        ...
+
+load_partitioned() decodes the parts in a process pool. Each worker returns
+a compact columnar chunk (a list of names, arrays of quantities and expiry
+ordinals, and unit codes) instead of pickled FreshItem objects, and the
+chunks are merged into the inventory through its add_items() bulk API.
+"""
+
+import json
+import os
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from .items import expiry_to_ordinal
+
+MANIFEST = "manifest.json"
+FORMAT = "freshfridge-partitioned"
+FORMAT_VERSION = 1
+_COMPACT = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def partition_of(name: str, partitions: int) -> int:
+    """Return the part number of an item name."""
+    return zlib.crc32(name.encode("utf-8")) % partitions
+
+
+def is_partitioned(path: str) -> bool:
+    """True if 'path' is a directory holding a partitioned inventory manifest."""
+    return os.path.isfile(os.path.join(path, MANIFEST))
+
+
+def read_manifest(directory: str) -> dict:
+    """Read and check the manifest of a partitioned inventory."""
+    with open(os.path.join(directory, MANIFEST), "r") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT or manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{directory} does not hold a supported partitioned inventory")
+    return manifest
+
+
+def save_partitioned(inventory, directory: str, partitions: int = 8, thresholds=None) -> dict:
+    """
+    Write 'inventory' (anything with iter_records()) into 'directory' as
+    'partitions' part files and a manifest; return the manifest.
+
+    The manifest is written last, so an interrupted save leaves the previous
+    manifest (and, for the same partition count, a mix of old and new
+    parts) rather than a manifest pointing at missing parts. Parts listed by
+    the previous manifest that are no longer used are deleted.
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be at least 1")
+    os.makedirs(directory, exist_ok=True)
+    old_parts = []
+    if is_partitioned(directory):
+        old_parts = [part["file"] for part in read_manifest(directory)["parts"]]
+
+    dates = {}
+    lines = [[] for _ in range(partitions)]
+    # Items held as several lots (LotInventory) keep them in a "lots" field
+    lots = inventory.saved_lots() if hasattr(inventory, "saved_lots") else {}
+    for name, quantity, unit, ordinal in inventory.iter_records():
+        expiry = dates.get(ordinal)
+        if expiry is None:
+            expiry = dates[ordinal] = date.fromordinal(ordinal).isoformat()
+        record = {"name": name, "quantity": quantity, "unit": unit, "expiry_date": expiry}
+        if name in lots:
+            record["lots"] = [[q, date.fromordinal(o).isoformat()] for q, o in lots[name]]
+        lines[partition_of(name, partitions)].append((ordinal, name, _COMPACT(record)))
+
+    parts = []
+    for number, part_lines in enumerate(lines):
+        # Parts are written in expiry order, so merging them into the
+        # sorted expiry index is a cheap run merge rather than a full sort
+        part_lines.sort()
+        file_name = f"part-{number:05d}.jsonl"
+        with open(os.path.join(directory, file_name), "w", buffering=1 << 20) as f:
+            for _, _, line in part_lines:
+                f.write(line)
+                f.write("\n")
+        parts.append({"file": file_name, "items": len(part_lines)})
+
+    manifest = {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "hash": "crc32",
+        "partitions": partitions,
+        "items": sum(part["items"] for part in parts),
+        "parts": parts,
+    }
+    if thresholds is not None:
+        manifest["thresholds"] = thresholds.to_dict()
+    tmp_path = os.path.join(directory, MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST))
+
+    used = {part["file"] for part in parts}
+    for file_name in old_parts:
+        if file_name not in used and os.path.exists(os.path.join(directory, file_name)):
+            os.remove(os.path.join(directory, file_name))
+    return manifest
+
+
+def decode_part(path: str):
+    """
+    Decode one part file into a columnar chunk::
+
+        (names, quantities array("d"), expiry ordinals array("i"),
+         unit codes array("H"), units, lots)
+
+    where 'lots' maps the names of items saved with several lots to their
+    (quantity, expiry_ordinal) lots. This runs in the worker processes;
+    arrays and a list of strings pickle far more compactly than FreshItem
+    objects.
+    """
+    names = []
+    quantities = array("d")
+    expiry = array("i")
+    codes = array("H")
+    units, unit_codes, ordinals, lots = [], {}, {}, {}
+    loads = json.loads
+    with open(path, "r", buffering=1 << 20) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = loads(line)
+            name, quantity, unit, expiry_date = (
+                record["name"], record["quantity"], record["unit"], record["expiry_date"]
+            )
+            if not isinstance(name, str):
+                raise ValueError(f"{path}:{number}: item name must be a string")
+            if quantity < 0:
+                raise ValueError(f"{path}:{number}: quantity must not be negative")
+            ordinal = ordinals.get(expiry_date)
+            if ordinal is None:
+                ordinal = ordinals[expiry_date] = expiry_to_ordinal(expiry_date)
+            code = unit_codes.get(unit)
+            if code is None:
+                if len(units) > 0xFFFF:
+                    raise ValueError(f"{path}: a part holds at most 65536 distinct units")
+                code = unit_codes[unit] = len(units)
+                units.append(unit)
+            if "lots" in record:
+                lots[name] = [(q, expiry_to_ordinal(d)) for q, d in record["lots"]]
+            names.append(name)
+            quantities.append(quantity)
+            expiry.append(ordinal)
+            codes.append(code)
+    return names, quantities, expiry, codes, units, lots
+
+
+def merge_chunk(inventory, chunk) -> int:
+    """
+    Add a decode_part() chunk to 'inventory' with one add_items() call and
+    return the number of items. Items saved with lots go through
+    restore_lots() in inventories that keep lots, and used-up items, which
+    add_items() rejects, are added with quantity 1 and then set to 0.
+    """
+    names, quantities, expiry, codes, units, lots = chunk
+    keeps_lots = bool(lots) and hasattr(inventory, "restore_lots")
+    rows, used_up, dates = [], [], {}
+    for name, quantity, code, ordinal in zip(names, quantities, codes, expiry):
+        if keeps_lots and name in lots:
+            inventory.restore_lots(name, units[code], lots[name])
+            continue
+        expiry_date = dates.get(ordinal)
+        if expiry_date is None:
+            expiry_date = dates[ordinal] = date.fromordinal(ordinal).isoformat()
+        if quantity == 0:
+            used_up.append(name)
+            quantity = 1
+        rows.append((name, quantity, units[code], expiry_date))
+    result = inventory.add_items(rows)
+    if result.errors:
+        raise result.errors[0][2]
+    for name in used_up:
+        inventory.set_quantity(name, 0)
+    return len(names)
+
+
+def load_partitioned(inventory, directory: str, processes: int = None, thresholds=None) -> int:
+    """
+    Load a partitioned inventory into 'inventory' (an InventoryOperations
+    backend) and return the number of items loaded.
+
+    Parts are decoded by a pool of 'processes' worker processes (by default
+    one per CPU) and merged in part order as they arrive; with 0 or 1
+    processes, or a single part, they are decoded in this process. The
+    manifest's thresholds are loaded into 'thresholds' if given.
+    """
+    manifest = read_manifest(directory)
+    if thresholds is not None and "thresholds" in manifest:
+        thresholds.load_dict(manifest["thresholds"])
+    paths = [os.path.join(directory, part["file"]) for part in manifest["parts"]]
+    fresh = hasattr(inventory, "mark_clean") and len(inventory) == 0 and inventory.changes() == (set(), set())
+    if processes is None:
+        processes = os.cpu_count() or 1
+    count = 0
+    try:
+        if processes <= 1 or len(paths) <= 1:
+            for path in paths:
+                count += merge_chunk(inventory, decode_part(path))
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                for chunk in pool.map(decode_part, paths):
+                    count += merge_chunk(inventory, chunk)
+    except json.JSONDecodeError:
+        raise ValueError(f"Invalid JSON format in {directory}")
+    if fresh:
+        # Nothing to save back yet; a directory cannot take delta saves
+        inventory.mark_clean(None)
+    return count
@@ -1,53 +1,609 @@
 import json
+import os
+import re
+from datetime import date
+
+from ..alerts.thresholds import ThresholdStore
+from .binary import MappedInventory, write_binary
+from .items import expiry_to_ordinal
+from .partitioned import is_partitioned, load_partitioned, read_manifest, save_partitioned
+
+_WHITESPACE = re.compile(r"\s*")
+_COMPACT = json.JSONEncoder(separators=(",", ":")).encode
+_JSONL_SUFFIXES = (".jsonl", ".ndjson")
+_BINARY_SUFFIXES = (".ffb",)
+_PARTITIONED_SUFFIXES = (".parts",)
+# Reserved entry holding the low-stock thresholds; never loaded as an item
+THRESHOLDS_KEY = "__thresholds__"
+# Patch file of delta saves, next to the inventory file
+DELTA_SUFFIX = ".delta"
+
+
+def _detect_format(path: str, fmt: str = None) -> str:
+    """
+    Return 'json', 'jsonl', 'binary' or 'partitioned', guessing from the
+    file extension (or a directory path) if needed.
+    """
+    if fmt is None:
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix in _JSONL_SUFFIXES:
+            fmt = "jsonl"
+        elif suffix in _BINARY_SUFFIXES:
+            fmt = "binary"
+        elif suffix in _PARTITIONED_SUFFIXES or os.path.isdir(path):
+            fmt = "partitioned"
+        else:
+            fmt = "json"
+    if fmt not in ("json", "jsonl", "binary", "partitioned"):
+        raise ValueError(f"Unknown inventory format: {fmt!r}")
+    return fmt
+
+
+def _iter_object_members(f, chunk_size: int = 1 << 16):
+    """
+    Yield (key, value) pairs of the top-level JSON object in file 'f',
+    reading it in chunks so only one member is held in memory at a time.
+    """
+    decode = json.JSONDecoder().raw_decode
+    buf, pos = "", 0
+
+    def peek():
+        # Return the next non-whitespace character, reading more if needed
+        nonlocal buf, pos
+        if pos < len(buf) and buf[pos] not in " \t\n\r":
+            return buf[pos]
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise json.JSONDecodeError("Unexpected end of data", buf, pos)
+            buf, pos = chunk, 0
+
+    def value():
+        nonlocal buf, pos
+        peek()
+        while True:
+            try:
+                result, end = decode(buf, pos)
+            except json.JSONDecodeError:
+                result, end = None, None
+            # A number at the end of the buffer may continue in the next chunk
+            if end is None or (end == len(buf) and not isinstance(result, (str, dict, list))):
+                chunk = f.read(chunk_size)
+                if chunk:
+                    buf, pos = buf[pos:] + chunk, 0
+                    continue
+                if end is None:
+                    decode(buf, pos)  # re-raise the decoding error
+            pos = end
+            return result
+
+    def expect(char):
+        nonlocal pos
+        if peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", buf, pos)
+        pos += 1
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        key = value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name", buf, pos)
+        expect(":")
+        yield key, value()
+        if peek() == "}":
+            return
+        expect(",")
+
+
+def _saved_lots(inventory, names=None) -> dict:
+    """
+    Return {name: [(quantity, expiry_ordinal), ...]} for the items (of
+    'names', or all) that 'inventory' holds as several lots; see
+    LotInventory.saved_lots(). Other inventories have none.
+    """
+    saved_lots = getattr(inventory, "saved_lots", None)
+    return {} if saved_lots is None else saved_lots(names)
+
+
+def _lots_field(lots):
+    """Saved form of (quantity, expiry_ordinal) lots: [[quantity, "YYYY-MM-DD"], ...]."""
+    return [[quantity, date.fromordinal(ordinal).isoformat()] for quantity, ordinal in lots]
+
+
+def _restore_item(inventory, name: str, quantity: float, unit: str, expiry_date: str, lots=None) -> None:
+    """
+    Add a saved item, including used-up ones that add_item() rejects. Saved
+    'lots' are restored as lots by inventories that keep them, and the
+    aggregate record is used otherwise.
+    """
+    if lots is not None and hasattr(inventory, "restore_lots"):
+        inventory.restore_lots(name, unit, [(q, expiry_to_ordinal(expiry)) for q, expiry in lots])
+    elif quantity > 0:
+        inventory.add_item(name, quantity, unit, expiry_date)
+    else:
+        inventory.add_item(name, 1, unit, expiry_date)
+        inventory.set_quantity(name, quantity)
+
+
+def _replay_records(inventory, f, thresholds=None):
+    """
+    Apply change records from the binary file 'f' to 'inventory': one
+    compact JSON array per line, as written by save_delta() and
+    InventoryJournal::
+
+        ["a", name, quantity, unit, expiry_date]   item state
+        ["a", name, quantity, unit, expiry_date, lots]   ... with its lots
+        ["q", name, quantity]                      new quantity
+        ["r", name]                                removal
+        ["t", thresholds]                          ThresholdStore.to_dict()
+
+    Stop at a torn or unreadable final record. Return (records applied,
+    bytes consumed).
+    """
+    count = good_size = 0
+    for line in f:
+        if not line.endswith(b"\n"):
+            break
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break
+        op = record[0]
+        if op == "a":
+            name, quantity, unit, expiry = record[1:5]
+            # Remove first so backends that add to an existing item (lots)
+            # end up with exactly the recorded state
+            inventory.remove_item(name)
+            _restore_item(inventory, name, quantity, unit, expiry, record[5] if len(record) > 5 else None)
+        elif op == "q":
+            inventory.set_quantity(record[1], record[2])
+        elif op == "r":
+            inventory.remove_item(record[1])
+        elif op == "t" and thresholds is not None:
+            thresholds.load_dict(record[1])
+        count += 1
+        good_size += len(line)
+    return count, good_size
+
+
+class RecordSnapshot:
+    """
+    Frozen copy of inventory records that can be saved like an inventory,
+    for writing a consistent file while the live inventory keeps changing.
+    """
+
+    def __init__(self, records, lots: dict = None):
+        self._records = list(records)
+        self._lots = lots or {}
+
+    def iter_records(self):
+        """Yield the stored (name, quantity, unit, expiry_ordinal) records."""
+        return iter(self._records)
+
+    def saved_lots(self, names=None) -> dict:
+        """Return the stored lots (see LotInventory.saved_lots())."""
+        if names is None:
+            return self._lots
+        return {name: self._lots[name] for name in names if name in self._lots}
+
+    def __len__(self) -> int:
+        return len(self._records)
 
 
 class InventoryPersistence:
     """Provides loading and saving functionality for inventory."""
 
     @staticmethod
-    def save_inventory(inventory, path: str = "inventory.json") -> None:
-        """Save inventory to a JSON file."""
-        data = {}
-        for name, item in inventory.items.items():
-            data[name] = {
-                "quantity": item.quantity,
-                "unit": item.unit,
-                "expiry_date": item.expiry_date.strftime("%Y-%m-%d"),
-            }
+    def save_inventory(
+        inventory,
+        path: str = "inventory.json",
+        fmt: str = None,
+        streaming: bool = False,
+        thresholds: ThresholdStore = None,
+    ) -> None:
+        """
+        Save inventory to a JSON file.
+
+        'fmt' is "json", "jsonl" (JSON Lines, one item per line), "binary"
+        (see open_binary()) or "partitioned" (a directory of part files, see
+        the partitioned module) and is guessed from the file extension
+        (.jsonl/.ndjson, .ffb, .parts) when omitted. With 'streaming', or
+        for JSON Lines, entries are written straight from the inventory with
+        compact separators instead of building the whole document first.
+
+        A ThresholdStore passed as 'thresholds' is saved in the same file,
+        under the reserved THRESHOLDS_KEY entry (binary: as metadata).
+        """
+        fmt = _detect_format(path, fmt)
         try:
-            with open(path, "w") as f:
-                json.dump(data, f, indent=2)
+            if fmt == "partitioned":
+                save_partitioned(inventory, path, thresholds=thresholds)
+            elif fmt == "binary":
+                metadata = {}
+                if thresholds is not None:
+                    metadata["thresholds"] = thresholds.to_dict()
+                lots = _saved_lots(inventory)
+                if lots:
+                    metadata["lots"] = {name: _lots_field(item_lots) for name, item_lots in lots.items()}
+                write_binary(inventory.iter_records(), path, metadata or None)
+            elif fmt == "json" and not streaming:
+                data = InventoryPersistence.inventory_to_dict(inventory)
+                if thresholds is not None:
+                    data[THRESHOLDS_KEY] = thresholds.to_dict()
+                with open(path, "w") as f:
+                    json.dump(data, f, indent=2)
+            else:
+                with open(path, "w", buffering=1 << 20) as f:
+                    InventoryPersistence._write_records(inventory, f, fmt, thresholds)
+            # The full file supersedes any delta saves
+            if os.path.exists(path + DELTA_SUFFIX):
+                os.remove(path + DELTA_SUFFIX)
         except PermissionError:
             raise PermissionError(f"Cannot write to {path}: permission denied")
         except OSError as e:
             raise OSError(f"Failed to save inventory: {e}")
+        # Partitioned directories take no delta saves
+        synced = None if fmt == "partitioned" else os.path.abspath(path)
+        if hasattr(inventory, "mark_clean"):
+            inventory.mark_clean(synced)
+        if thresholds is not None:
+            thresholds.mark_clean(synced)
 
     @staticmethod
-    def load_inventory(inventory, path: str = "inventory.json") -> None:
-        """Load inventory from a JSON file if it exists."""
+    def save_delta(
+        inventory,
+        path: str = "inventory.json",
+        fmt: str = None,
+        thresholds: ThresholdStore = None,
+        compact_ratio: float = 0.5,
+    ) -> int:
+        """
+        Save only the items changed since the inventory was last loaded from
+        or saved to 'path', by appending change records to the patch file
+        ``path + DELTA_SUFFIX``; load_inventory() applies it after the file.
+        'thresholds', if given, is appended too unless it is unchanged since
+        it was last loaded from or saved to 'path'.
+
+        A full save_inventory() is done instead (folding in and deleting the
+        patch) when the inventory is not known to match 'path' - it was never
+        loaded from or saved there, or its ``items`` were replaced - or when
+        the patch has grown past 'compact_ratio' times the size of the file.
+        Return the number of records written.
+        """
+        delta_path = path + DELTA_SUFFIX
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            for name, info in data.items():
-                inventory.add_item(
-                    name,
-                    info["quantity"],
-                    info["unit"],
-                    info["expiry_date"],
+            base_size = os.path.getsize(path)
+            delta_size = os.path.getsize(delta_path) if os.path.exists(delta_path) else 0
+        except OSError:
+            base_size = None
+        if (
+            base_size is None
+            or inventory.synced_path != os.path.abspath(path)
+            or delta_size > compact_ratio * base_size
+        ):
+            InventoryPersistence.save_inventory(inventory, path, fmt, thresholds=thresholds)
+            return len(inventory)
+        dirty, removed = inventory.changes()
+        records = [_COMPACT(["r", name]) for name in removed]
+        lots = _saved_lots(inventory, dirty)
+        for name in dirty:
+            item = inventory.get_item(name)
+            if item is not None:
+                expiry = date.fromordinal(item.expiry_ordinal).isoformat()
+                record = ["a", name, item.quantity, item.unit, expiry]
+                if name in lots:
+                    record.append(_lots_field(lots[name]))
+                records.append(_COMPACT(record))
+        if thresholds is not None and thresholds.synced_path != os.path.abspath(path):
+            records.append(_COMPACT(["t", thresholds.to_dict()]))
+        if records:
+            records.append("")
+            try:
+                with open(delta_path, "a") as f:
+                    f.write("\n".join(records))
+            except OSError as e:
+                raise OSError(f"Failed to save inventory: {e}")
+        inventory.mark_clean(os.path.abspath(path))
+        if thresholds is not None:
+            thresholds.mark_clean(os.path.abspath(path))
+        return max(0, len(records) - 1)
+
+    @staticmethod
+    def compact(inventory_factory, path: str = "inventory.json", fmt: str = None) -> bool:
+        """
+        Fold the patch file of 'path' into the file itself, loading it into
+        an inventory made by 'inventory_factory'. Return False if there was
+        no patch to fold.
+        """
+        if not os.path.exists(path + DELTA_SUFFIX):
+            return False
+        inventory, thresholds = inventory_factory(), ThresholdStore()
+        InventoryPersistence.load_inventory(inventory, path, fmt, thresholds=thresholds)
+        InventoryPersistence.save_inventory(inventory, path, fmt, thresholds=thresholds if thresholds else None)
+        return True
+
+    @staticmethod
+    def load_inventory(
+        inventory,
+        path: str = "inventory.json",
+        fmt: str = None,
+        streaming: bool = False,
+        batch_size: int = 10000,
+        thresholds: ThresholdStore = None,
+    ) -> None:
+        """
+        Load inventory from a JSON file if it exists.
+
+        With 'streaming', or for JSON Lines and binary files, entries are
+        parsed one at a time and inserted with inventory.add_items() in
+        batches of 'batch_size'. Saved thresholds are loaded into the
+        'thresholds' store if one is given, and skipped otherwise.
+
+        Records of delta saves (see save_delta()) are applied afterwards.
+        An inventory that was empty and unchanged before loading is marked
+        clean, so later delta saves to 'path' only write what changes.
+
+        Partitioned inventories are decoded in parallel by load_partitioned().
+        """
+        fmt = _detect_format(path, fmt)
+        if fmt == "partitioned":
+            if is_partitioned(path):
+                load_partitioned(inventory, path, thresholds=thresholds)
+            return
+        fresh = hasattr(inventory, "mark_clean") and len(inventory) == 0 and inventory.changes() == (set(), set())
+        loaded = thresholds.version if thresholds is not None else None
+        try:
+            if fmt == "json" and not streaming:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                saved = data.pop(THRESHOLDS_KEY, None)
+                if saved is not None and thresholds is not None:
+                    thresholds.load_dict(saved)
+                InventoryPersistence._add_entries(inventory, (
+                    (name, info["quantity"], info["unit"], info["expiry_date"], info.get("lots"))
+                    for name, info in data.items()
+                ), len(data))
+            else:
+                InventoryPersistence._add_entries(
+                    inventory, InventoryPersistence._iter_saved(path, fmt, thresholds), batch_size
                 )
+            with open(path + DELTA_SUFFIX, "rb") as f:
+                _replay_records(inventory, f, thresholds)
         except FileNotFoundError:
             pass  # do nothing if there's nothing
         except json.JSONDecodeError:
             raise ValueError(f"Invalid JSON format in {path}")
+        if fresh and os.path.exists(path):
+            inventory.mark_clean(os.path.abspath(path))
+        if thresholds is not None and thresholds.version != loaded:
+            # load_dict() replaced the store with what 'path' holds
+            thresholds.mark_clean(os.path.abspath(path))
+
+    @staticmethod
+    def iter_entries(path: str, fmt: str = None, thresholds: ThresholdStore = None):
+        """
+        Yield (name, quantity, unit, expiry_date) for each saved item,
+        reading the file incrementally. Items saved with several lots come
+        back as one aggregate entry. Saved thresholds are loaded into
+        'thresholds' if given.
+        """
+        for name, quantity, unit, expiry, _ in InventoryPersistence._iter_saved(path, fmt, thresholds):
+            yield name, quantity, unit, expiry
+
+    @staticmethod
+    def _iter_saved(path: str, fmt: str = None, thresholds: ThresholdStore = None):
+        """Like iter_entries(), with the saved lots (or None) as a fifth field."""
+        fmt = _detect_format(path, fmt)
+        if fmt == "partitioned":
+            manifest = read_manifest(path)
+            if thresholds is not None and "thresholds" in manifest:
+                thresholds.load_dict(manifest["thresholds"])
+            for part in manifest["parts"]:
+                yield from InventoryPersistence._iter_saved(os.path.join(path, part["file"]), "jsonl")
+            return
+        if fmt == "binary":
+            inventory = MappedInventory(path)
+            try:
+                metadata = inventory.metadata
+                saved = metadata.get("thresholds")
+                if saved is not None and thresholds is not None:
+                    thresholds.load_dict(saved)
+                lots = metadata.get("lots", {})
+                dates = {}
+                for name, quantity, unit, ordinal in inventory.iter_records():
+                    expiry = dates.get(ordinal)
+                    if expiry is None:
+                        expiry = dates[ordinal] = date.fromordinal(ordinal).isoformat()
+                    yield name, quantity, unit, expiry, lots.get(name)
+            finally:
+                inventory.close()
+            return
+        with open(path, "r") as f:
+            if fmt == "jsonl":
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        if THRESHOLDS_KEY in record:
+                            if thresholds is not None:
+                                thresholds.load_dict(record[THRESHOLDS_KEY])
+                            continue
+                        yield (
+                            record["name"],
+                            record["quantity"],
+                            record["unit"],
+                            record["expiry_date"],
+                            record.get("lots"),
+                        )
+            else:
+                for name, info in _iter_object_members(f):
+                    if name == THRESHOLDS_KEY:
+                        if thresholds is not None:
+                            thresholds.load_dict(info)
+                        continue
+                    yield name, info["quantity"], info["unit"], info["expiry_date"], info.get("lots")
+
+    @staticmethod
+    def open_binary(path: str) -> MappedInventory:
+        """
+        Open a binary snapshot as a MappedInventory, which answers queries
+        straight from the memory-mapped file instead of loading it.
+        """
+        return MappedInventory(path)
+
+    @staticmethod
+    def convert(src: str, dst: str, src_fmt: str = None, dst_fmt: str = None) -> int:
+        """
+        Convert an inventory file between the json, jsonl, binary and
+        partitioned formats without building an inventory; return the number
+        of items written. Saved thresholds are carried over.
+
+        Entries are streamed from the source file straight into the
+        destination writer. Only the binary writer's compact columns, or a
+        partitioned destination's records (its parts are sorted), are held
+        in memory.
+        """
+        dst_fmt = _detect_format(dst, dst_fmt)
+        thresholds = ThresholdStore()
+        count = 0
+
+        def entries():
+            nonlocal count
+            for name, quantity, unit, expiry, lots in InventoryPersistence._iter_saved(src, src_fmt, thresholds):
+                count += 1
+                yield name, quantity, unit, expiry_to_ordinal(expiry), lots
+
+        def saved_thresholds():
+            # Complete only once the source has been read to the end
+            return thresholds if thresholds else None
+
+        if dst_fmt == "partitioned":
+            records, lots = [], {}
+            for name, quantity, unit, ordinal, saved in entries():
+                records.append((name, quantity, unit, ordinal))
+                if saved is not None:
+                    lots[name] = [(q, expiry_to_ordinal(d)) for q, d in saved]
+            save_partitioned(RecordSnapshot(records, lots), dst, thresholds=saved_thresholds())
+            return count
+        # Write next to 'dst' and swap it in, so a bad source entry leaves
+        # no half-written file behind
+        tmp = dst + ".tmp"
+        try:
+            if dst_fmt == "binary":
+                metadata = {}
+
+                def records():
+                    for name, quantity, unit, ordinal, saved in entries():
+                        if saved is not None:
+                            metadata.setdefault("lots", {})[name] = saved
+                        yield name, quantity, unit, ordinal
+                    if thresholds:
+                        metadata["thresholds"] = thresholds.to_dict()
+
+                write_binary(records(), tmp, lambda: metadata or None)
+            else:
+                with open(tmp, "w", buffering=1 << 20) as f:
+                    InventoryPersistence._write_entries(entries(), f, dst_fmt, saved_thresholds)
+            os.replace(tmp, dst)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        if os.path.exists(dst + DELTA_SUFFIX):
+            os.remove(dst + DELTA_SUFFIX)
+        return count
 
     @staticmethod
     def inventory_to_dict(inventory) -> dict:
         """Convert current inventory into a plain Python dictionary."""
         result = {}
-        for name, item in inventory.items.items():
+        lots = _saved_lots(inventory)
+        for name, quantity, unit, ordinal in inventory.iter_records():
             result[name] = {
-                "quantity": item.quantity,
-                "unit": item.unit,
-                "expiry_date": item.expiry_date.strftime("%Y-%m-%d"),
+                "quantity": quantity,
+                "unit": unit,
+                "expiry_date": date.fromordinal(ordinal).isoformat(),
             }
+            if name in lots:
+                result[name]["lots"] = _lots_field(lots[name])
         return result
+
+    @staticmethod
+    def _add_entries(inventory, entries, batch_size: int) -> None:
+        """
+        Add (name, quantity, unit, expiry_date, lots) entries in batches;
+        entries with lots go to inventories that keep lots one by one.
+        """
+        keeps_lots = hasattr(inventory, "restore_lots")
+        batch = []
+        for name, quantity, unit, expiry, lots in entries:
+            if lots is not None and keeps_lots:
+                _restore_item(inventory, name, quantity, unit, expiry, lots)
+                continue
+            batch.append((name, quantity, unit, expiry))
+            if len(batch) >= batch_size:
+                InventoryPersistence._add_batch(inventory, batch)
+                batch = []
+        if batch:
+            InventoryPersistence._add_batch(inventory, batch)
+
+    @staticmethod
+    def _add_batch(inventory, rows) -> None:
+        """Add loaded rows, raising the error of the first invalid one."""
+        result = inventory.add_items(rows)
+        for index, name, error in result.errors:
+            quantity = rows[index][1]
+            if not (isinstance(quantity, (int, float)) and quantity == 0):
+                raise error
+            # Used-up items are saved with quantity 0
+            _restore_item(inventory, *rows[index])
+
+    @staticmethod
+    def _write_records(inventory, f, fmt: str, thresholds: ThresholdStore = None) -> None:
+        """Write every inventory record (and 'thresholds') to an open file in 'fmt'."""
+        lots = _saved_lots(inventory)
+        entries = (
+            (name, quantity, unit, ordinal, _lots_field(lots[name]) if name in lots else None)
+            for name, quantity, unit, ordinal in inventory.iter_records()
+        )
+        InventoryPersistence._write_entries(entries, f, fmt, lambda: thresholds)
+
+    @staticmethod
+    def _write_entries(entries, f, fmt: str, thresholds) -> None:
+        """
+        Write (name, quantity, unit, expiry_ordinal, lots field or None)
+        entries to an open file in "json" or "jsonl" format, then the store
+        returned by calling 'thresholds' once they are written, unless None.
+        """
+        if fmt == "json":
+            f.write("{")
+        separator = ""
+        dates = {}
+        for name, quantity, unit, ordinal, lots in entries:
+            expiry = dates.get(ordinal)
+            if expiry is None:
+                expiry = dates[ordinal] = date.fromordinal(ordinal).isoformat()
+            if fmt == "jsonl":
+                record = {"name": name, "quantity": quantity, "unit": unit, "expiry_date": expiry}
+                if lots is not None:
+                    record["lots"] = lots
+                f.write(_COMPACT(record))
+                f.write("\n")
+            else:
+                record = {"quantity": quantity, "unit": unit, "expiry_date": expiry}
+                if lots is not None:
+                    record["lots"] = lots
+                f.write(f"{separator}{_COMPACT(name)}:{_COMPACT(record)}")
+                separator = ","
+        thresholds = thresholds()
+        if thresholds is not None:
+            if fmt == "jsonl":
+                f.write(_COMPACT({THRESHOLDS_KEY: thresholds.to_dict()}))
+                f.write("\n")
+            else:
+                f.write(f"{separator}{_COMPACT(THRESHOLDS_KEY)}:{_COMPACT(thresholds.to_dict())}")
+        if fmt == "json":
+            f.write("}")
@@ -0,0 +1,229 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from ..alerts.expiry import ExpiryAlerts
+from ..alerts.lowstock import LowStockAlerts
+from ..alerts.thresholds import ThresholdStore
+from ..reporting.summary import SummaryReport
+from .items import FreshItem
+from .operations import InventoryOperations
+from .persistence import InventoryPersistence
+
+_SHARD_SUFFIXES = (".json", ".jsonl", ".ndjson", ".ffb")
+
+
+def _sweep_shard(location: str, records, within_days: int, thresholds: dict):
+    """
+    Process pool worker: run the expiry and low-stock alerts over one
+    shard's (name, quantity, unit, expiry_ordinal) records.
+    """
+    inventory = InventoryOperations()
+    inventory.items = {record[0]: FreshItem.from_ordinal(*record) for record in records}
+    alerts = ExpiryAlerts()
+
+    def compact(items):
+        return [(item.name, item.quantity, item.unit, item.expiry_ordinal) for item in items]
+
+    return (
+        location,
+        compact(alerts.check_expiring(inventory, within_days)),
+        compact(alerts.mark_expired(inventory)),
+        LowStockAlerts().low_stock_alert(inventory, thresholds) if thresholds else [],
+    )
+
+
+class ShardedInventory:
+    """
+    Collection of inventories keyed by location, one file per location.
+
+    Each shard is an ordinary inventory (made by 'factory') stored as
+    ``<directory>/<location><suffix>``. Shards are loaded and saved in
+    parallel by a thread pool, alert sweeps run in a process pool on compact
+    copies of the shards' records, and aggregate_summary() totals the
+    quantity of each item across all locations.
+
+    Usage::
+
+        fridges = ShardedInventory("fridges")
+        fridges.load()
+        fridges.shard("kitchen").add_item("Milk", 2, "L", "2025-12-18")
+        for alert in fridges.sweep(within_days=3, thresholds={"Milk": 1}):
+            print(alert["location"], alert["expiring"])
+        fridges.save()
+    """
+
+    def __init__(
+        self,
+        directory: str = ".",
+        factory=InventoryOperations,
+        suffix: str = ".json",
+        max_workers: int = 8,
+    ):
+        self.directory = directory
+        self.factory = factory
+        self.suffix = suffix
+        self.max_workers = max_workers
+        self._shards = {}
+        self._paths = {}
+
+    def shard(self, location: str):
+        """Return the inventory of 'location', creating an empty one if needed."""
+        inventory = self._shards.get(location)
+        if inventory is None:
+            inventory = self._shards[location] = self.factory()
+        return inventory
+
+    def remove_shard(self, location: str):
+        """Forget a location and return its inventory; its file is kept."""
+        self._paths.pop(location, None)
+        return self._shards.pop(location)
+
+    def __getitem__(self, location: str):
+        return self._shards[location]
+
+    def __contains__(self, location: str) -> bool:
+        return location in self._shards
+
+    def __iter__(self):
+        return iter(self._shards)
+
+    def __len__(self) -> int:
+        """Return the number of locations."""
+        return len(self._shards)
+
+    def locations(self):
+        """Return a sorted list of location names."""
+        return sorted(self._shards)
+
+    def path_for(self, location: str) -> str:
+        """Return the file that stores 'location'."""
+        path = self._paths.get(location)
+        if path is None:
+            path = os.path.join(self.directory, location + self.suffix)
+        return path
+
+    def discover(self):
+        """Return the locations that have a saved file in the directory."""
+        found = {}
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return []
+        for file_name in names:
+            location, suffix = os.path.splitext(file_name)
+            if suffix.lower() in _SHARD_SUFFIXES and location not in found:
+                found[location] = os.path.join(self.directory, file_name)
+        self._paths.update(found)
+        return list(found)
+
+    def load(self, locations=None):
+        """
+        Load 'locations' (by default every saved one) in parallel and return
+        the loaded location names. Items are added to any existing shard.
+        """
+        if locations is None:
+            locations = self.discover()
+        locations = list(locations)
+        shards = [self.shard(location) for location in locations]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(InventoryPersistence.load_inventory, shards, map(self.path_for, locations)))
+        return locations
+
+    def save(self, locations=None) -> None:
+        """Save 'locations' (by default every shard) in parallel."""
+        if locations is None:
+            locations = list(self._shards)
+        if locations:
+            os.makedirs(self.directory, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(
+                InventoryPersistence.save_inventory,
+                [self._shards[location] for location in locations],
+                map(self.path_for, locations),
+            ))
+
+    def total_quantity(self) -> float:
+        """Return the sum of quantities over all shards."""
+        return sum(inventory.total_quantity() for inventory in self._shards.values())
+
+    def sweep(self, within_days: int = 3, thresholds: dict = None, processes: int = None):
+        """
+        Run ExpiryAlerts and LowStockAlerts over every shard in a process
+        pool, yielding one result per location as soon as it is ready::
+
+            {"location": ..., "expiring": [FreshItem, ...],
+             "expired": [FreshItem, ...], "low_stock": [(name, qty, threshold), ...]}
+
+        A thresholds dictionary applies to every location; a ThresholdStore
+        is resolved per location, so location defaults apply. With
+        processes=0 the sweep runs in this process, which is faster for a
+        handful of small shards.
+        """
+        jobs = [
+            (location, list(inventory.iter_records()), self._shard_thresholds(thresholds, location, inventory))
+            for location, inventory in self._shards.items()
+        ]
+        if processes == 0:
+            for location, records, limits in jobs:
+                yield self._sweep_result(*_sweep_shard(location, records, within_days, limits))
+            return
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(_sweep_shard, location, records, within_days, limits)
+                for location, records, limits in jobs
+            ]
+            for future in as_completed(futures):
+                yield self._sweep_result(*future.result())
+
+    def sweep_merged(self, within_days: int = 3, thresholds: dict = None, processes: int = None) -> dict:
+        """
+        Run sweep() and merge the results of all locations into
+        {"expiring": [...], "expired": [...], "low_stock": [...]}, holding
+        (location, item) pairs soonest-expiring first and (location, name,
+        qty, threshold) tuples sorted by location and name.
+        """
+        merged = {"expiring": [], "expired": [], "low_stock": []}
+        for result in self.sweep(within_days, thresholds, processes):
+            location = result["location"]
+            for key in ("expiring", "expired"):
+                merged[key].extend((location, item) for item in result[key])
+            merged["low_stock"].extend((location,) + alert for alert in result["low_stock"])
+        for key in ("expiring", "expired"):
+            merged[key].sort(key=lambda pair: (pair[1].expiry_ordinal, pair[1].name, pair[0]))
+        merged["low_stock"].sort(key=lambda alert: alert[:2])
+        return merged
+
+    def aggregate_summary(self):
+        """
+        Return the total quantity of each item across all locations as a
+        list of {name, unit, quantity, locations} dicts sorted by name and unit.
+        """
+        totals = {}
+        for location, inventory in self._shards.items():
+            for key, quantity in SummaryReport(inventory).quantity_by_item().items():
+                entry = totals.get(key)
+                if entry is None:
+                    totals[key] = [quantity, 1]
+                else:
+                    entry[0] += quantity
+                    entry[1] += 1
+        return [
+            {"name": name, "unit": unit, "quantity": quantity, "locations": count}
+            for (name, unit), (quantity, count) in sorted(totals.items())
+        ]
+
+    @staticmethod
+    def _shard_thresholds(thresholds, location: str, inventory) -> dict:
+        """Return the plain thresholds dictionary to send with one shard."""
+        if isinstance(thresholds, ThresholdStore):
+            return dict(thresholds.for_inventory(inventory, location))
+        return dict(thresholds) if thresholds else {}
+
+    @staticmethod
+    def _sweep_result(location, expiring, expired, low_stock) -> dict:
+        return {
+            "location": location,
+            "expiring": [FreshItem.from_ordinal(*record) for record in expiring],
+            "expired": [FreshItem.from_ordinal(*record) for record in expired],
+            "low_stock": low_stock,
+        }
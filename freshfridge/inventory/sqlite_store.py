@@ -0,0 +1,212 @@
+import sqlite3
+from datetime import datetime
+
+from .items import FreshItem, cutoff_ordinal, expiry_to_ordinal
+from .operations import InventoryOperations
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    name     TEXT PRIMARY KEY,
+    quantity NUMERIC NOT NULL,
+    unit     TEXT NOT NULL,
+    expiry   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_by_expiry ON items (expiry, name);
+CREATE TEMP TABLE IF NOT EXISTS thresholds (
+    name      TEXT PRIMARY KEY,
+    threshold NUMERIC NOT NULL
+);
+"""
+
+# Statements are kept as constants so sqlite3's statement cache reuses them
+_UPSERT = (
+    "INSERT INTO items (name, quantity, unit, expiry) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (name) DO UPDATE SET "
+    "quantity = excluded.quantity, unit = excluded.unit, expiry = excluded.expiry"
+)
+_SELECT_ONE = "SELECT name, quantity, unit, expiry FROM items WHERE name = ?"
+_SELECT_ALL = "SELECT name, quantity, unit, expiry FROM items ORDER BY rowid"
+_SELECT_BY_EXPIRY = "SELECT name, quantity, unit, expiry FROM items ORDER BY expiry, name"
+_SET_QUANTITY = "UPDATE items SET quantity = ? WHERE name = ?"
+_DELETE = "DELETE FROM items WHERE name = ?"
+_EXPIRING = (
+    "SELECT name, quantity, unit, expiry FROM items "
+    "WHERE expiry < ? ORDER BY expiry, name"
+)
+_BELOW_THRESHOLDS = (
+    "SELECT i.name, i.quantity, t.threshold FROM items AS i "
+    "JOIN thresholds AS t ON t.name = i.name "
+    "WHERE i.quantity < t.threshold ORDER BY i.rowid"
+)
+
+
+class SQLiteInventory(InventoryOperations):
+    """
+    Inventory stored in an SQLite database instead of in memory.
+
+    Items live in a table keyed by name with an index on the expiry day
+    ordinal, so expiry, threshold and total queries run as SQL and only the
+    matching rows become FreshItem objects. File databases use WAL mode.
+    The public API matches InventoryOperations; ``items`` returns a freshly
+    built dictionary, so changes made to that dictionary are not written back.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        super().__init__()
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    @property
+    def items(self):
+        """Dictionary mapping item names to (newly built) FreshItem objects."""
+        return {row[0]: FreshItem.from_ordinal(*row) for row in self._conn.execute(_SELECT_ALL)}
+
+    @items.setter
+    def items(self, new_items: dict) -> None:
+        with self._transaction():
+            self._conn.execute("DELETE FROM items")
+            self._conn.executemany(
+                _UPSERT,
+                ((name, item.quantity, item.unit, item.expiry_ordinal)
+                 for name, item in new_items.items()),
+            )
+        self._notify("reset", None)
+
+    def add_item(self, name: str, quantity: float, unit: str, expiry_date: str) -> None:
+        """Create or overwrite an item in the inventory."""
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        ordinal = expiry_to_ordinal(expiry_date)
+        self._conn.execute(_UPSERT, (name, quantity, unit, ordinal))
+        if self._listeners:
+            self._notify("add", FreshItem.from_ordinal(name, quantity, unit, ordinal))
+        else:
+            self._changed("add", name)
+
+    def use_item(self, name: str, quantity: float) -> None:
+        """Reduce the quantity of an item if it exists."""
+        item = self.get_item(name)
+        if item is not None:
+            before = item.quantity
+            item.reduce_quantity(quantity)
+            self._conn.execute(_SET_QUANTITY, (item.quantity, name))
+            self._notify("use", item, before - item.quantity)
+
+    def set_quantity(self, name: str, quantity: float) -> None:
+        """Set the quantity of an item if it exists (not going below zero)."""
+        if self._conn.execute(_SET_QUANTITY, (max(0, quantity), name)).rowcount:
+            if self._listeners:
+                self._notify("set", self.get_item(name))
+            else:
+                self._changed("set", name)
+
+    def remove_item(self, name: str) -> None:
+        """Completely remove an item from the inventory."""
+        item = self.get_item(name) if self._listeners else None
+        if self._conn.execute(_DELETE, (name,)).rowcount:
+            if item is not None:
+                self._notify("remove", item)
+            else:
+                self._changed("remove", name)
+
+    def _existing(self, names) -> set:
+        """Return the subset of 'names' that are in the inventory."""
+        names = list(names)
+        found = set()
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(
+                row[0]
+                for row in self._conn.execute(f"SELECT name FROM items WHERE name IN ({marks})", chunk)
+            )
+        return found
+
+    def _apply_adds(self, rows) -> None:
+        """Store validated rows with one executemany in a single transaction."""
+        with self._transaction():
+            self._conn.executemany(_UPSERT, rows)
+        if self._listeners:
+            for row in rows:
+                self._notify("add", FreshItem.from_ordinal(*row))
+        else:
+            self._changed_many("add", [row[0] for row in rows])
+
+    def _apply_uses(self, rows) -> None:
+        """Apply validated (name, quantity) rows in a single transaction."""
+        with self._transaction():
+            if self._listeners:
+                for name, quantity in rows:
+                    self.use_item(name, quantity)
+            else:
+                self._conn.executemany(
+                    "UPDATE items SET quantity = MAX(0, quantity - ?) WHERE name = ?",
+                    ((quantity, name) for name, quantity in rows),
+                )
+                self._changed_many("use", [name for name, _ in rows])
+
+    def _apply_removes(self, names) -> None:
+        """Remove existing, distinct item names in a single transaction."""
+        removed = [self.get_item(name) for name in names] if self._listeners else ()
+        with self._transaction():
+            self._conn.executemany(_DELETE, ((name,) for name in names))
+        for item in removed:
+            self._notify("remove", item)
+        if not removed:
+            self._changed_many("remove", names)
+
+    def get_item(self, name: str):
+        """Return the item called 'name' as a FreshItem, or None."""
+        row = self._conn.execute(_SELECT_ONE, (name,)).fetchone()
+        return None if row is None else FreshItem.from_ordinal(*row)
+
+    def list_items(self):
+        """Return a list of all items as FreshItem objects."""
+        return [FreshItem.from_ordinal(*row) for row in self._conn.execute(_SELECT_ALL)]
+
+    def iter_records(self):
+        """Yield (name, quantity, unit, expiry_ordinal) for every item."""
+        return iter(self._conn.execute(_SELECT_ALL))
+
+    def iter_by_expiry(self):
+        """Yield (name, quantity, unit, expiry_ordinal) records, soonest-expiring first."""
+        return iter(self._conn.execute(_SELECT_BY_EXPIRY))
+
+    def __len__(self) -> int:
+        """Return the number of distinct items."""
+        return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def __contains__(self, name: str) -> bool:
+        """Return True if an item called 'name' exists."""
+        return self._conn.execute("SELECT 1 FROM items WHERE name = ?", (name,)).fetchone() is not None
+
+    def below_thresholds(self, thresholds: dict):
+        """Return (name, quantity, threshold) for items below their threshold."""
+        with self._transaction():
+            self._conn.execute("DELETE FROM thresholds")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO thresholds (name, threshold) VALUES (?, ?)",
+                thresholds.items(),
+            )
+            return self._conn.execute(_BELOW_THRESHOLDS).fetchall()
+
+    def total_quantity(self) -> float:
+        """Return the sum of quantities of all items."""
+        return self._conn.execute("SELECT COALESCE(SUM(quantity), 0) FROM items").fetchone()[0]
+
+    def _expiring_before(self, cutoff: datetime):
+        """Return items whose expiry date is strictly before 'cutoff'."""
+        rows = self._conn.execute(_EXPIRING, (cutoff_ordinal(cutoff),))
+        return [FreshItem.from_ordinal(*row) for row in rows]
+
+    def _transaction(self):
+        """Return a context manager running its block in one transaction."""
+        self._conn.execute("BEGIN")
+        return self._conn
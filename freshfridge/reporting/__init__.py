@@ -5,4 +5,34 @@ Includes:
 - Base report class
 - Inventory summary report
 - Shopping list report
+- Consumption tracking and forecasts
+- Waste log and report
+
+Classes are loaded from their modules on first access (PEP 562).
 """
+
+import importlib
+
+_EXPORTS = {
+    "BaseReport": "base_report",
+    "SummaryReport": "summary",
+    "ShoppingListReport": "shopping_list",
+    "ConsumptionTracker": "consumption",
+    "WasteLog": "waste",
+    "WasteReport": "waste",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
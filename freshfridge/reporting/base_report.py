@@ -1,12 +1,60 @@
+import heapq
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
+
+SORT_KEYS = (None, "name", "expiry")
+
+
+def _copy(result):
+    """Copy a cached list or dictionary, and the dictionaries in a list."""
+    if isinstance(result, list):
+        return [dict(row) if isinstance(row, dict) else row for row in result]
+    if isinstance(result, dict):
+        return dict(result)
+    return result
+
+
 class BaseReport:
-    """Parent class for different types of reports."""
+    """
+    Parent class for different types of reports.
 
-    def __init__(self, inventory):
+    Report results are cached per inventory version (see
+    InventoryOperations.version): asking for the same report with the same
+    arguments again returns the cached result until the inventory changes.
+    At most 'cache_size' results are kept, least recently used first out;
+    0 turns caching off. Every call gets its own copy of a cached list or
+    dictionary (and of the dictionaries in a list), so callers may modify
+    the result without corrupting the cache.
+    """
+
+    def __init__(self, inventory, cache_size: int = 128):
         self.inventory = inventory
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def _cached(self, key, compute):
+        """Return compute(), reusing the result cached for 'key' at this version."""
+        version = getattr(self.inventory, "version", None)
+        if not isinstance(version, int) or self.cache_size <= 0:
+            return compute()
+        key = (key, version)
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            return _copy(cache[key])
+        result = cache[key] = compute()
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return _copy(result)
+
+    def clear_cache(self) -> None:
+        """Drop all cached report results."""
+        self._cache.clear()
 
     def count_items(self) -> int:
         """Return the number of distinct items in the inventory."""
-        return len(self.inventory.items)
+        return self._cached(("count_items",), lambda: len(self.inventory))
 
     def list_all(self):
         """Return a list of all FreshItem objects."""
@@ -14,4 +62,27 @@ class BaseReport:
 
     def get_item_names(self):
         """Return a list of all item names."""
-        return list(self.inventory.items.keys())
+        return [record[0] for record in self.inventory.iter_records()]
+
+    def iter_page(self, sort: str = None, offset: int = 0, limit: int = None):
+        """
+        Yield (name, quantity, unit, expiry_ordinal) records for one page.
+
+        'sort' is None (inventory order), "name" or "expiry" (soonest first,
+        read from the inventory's expiry order). Records are produced lazily,
+        so the first page is available without visiting, or with "name"
+        without sorting, the whole inventory.
+        """
+        if sort is None:
+            records = self.inventory.iter_records()
+        elif sort == "expiry":
+            records = self.inventory.iter_by_expiry()
+        elif sort == "name":
+            records = self.inventory.iter_records()
+            if limit is None:
+                records = sorted(records, key=itemgetter(0))
+            else:
+                records = heapq.nsmallest(offset + limit, records, key=itemgetter(0))
+        else:
+            raise ValueError(f"Unknown sort key: {sort!r}")
+        return islice(records, offset, None if limit is None else offset + limit)
@@ -0,0 +1,239 @@
+"""
+Consumption tracking and stock-out forecasting.
+
+ConsumptionTracker follows an inventory through InventoryOperations.subscribe()
+and records every use_item() in a small per-item ring buffer. It keeps an
+exponentially decayed consumption rate per item, updated in O(1) per use,
+and forecasts for every item at once when days until stock-out and days
+until expiry are needed (see ShoppingListReport.forecast_shopping_list()).
+"""
+
+import math
+from array import array
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to a plain loop
+    np = None
+
+_SECONDS_PER_DAY = 86400.0
+
+
+def _days(moment: datetime) -> float:
+    """Return 'moment' as a fractional proleptic Gregorian day ordinal."""
+    seconds = moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1e6
+    return moment.toordinal() + seconds / _SECONDS_PER_DAY
+
+
+def _from_days(days: float) -> datetime:
+    """Inverse of _days()."""
+    ordinal = int(days)
+    return datetime.fromordinal(ordinal) + timedelta(days=days - ordinal)
+
+
+class ConsumptionTracker:
+    """
+    Records how fast items are used up and forecasts when they run out.
+
+    Each item has a decayed sum S of the amounts used, as of its last use:
+    a use of 'a' after 'dt' days sets S = S * exp(-dt / tau) + a, with tau
+    chosen so weights halve every 'half_life_days'. The rate at time t is
+    S decayed to t divided by tau * (1 - exp(-elapsed / tau)), the weight of
+    the time the item has been observed ('elapsed', at least 'min_days'),
+    so items seen for a short while are not underestimated.
+
+    State is columnar (array.array per field), and the last 'capacity' uses
+    of an item are kept in a ring buffer allocated on its first use. Items
+    are observed from the time they are added, or from when the tracker
+    was attached for items that were already there. History survives
+    remove_item(), so an item bought again keeps its rate.
+    """
+
+    def __init__(self, inventory, half_life_days: float = 7.0, capacity: int = 16, clock=None, min_days: float = 1.0):
+        if half_life_days <= 0 or capacity < 1:
+            raise ValueError("half_life_days and capacity must be positive")
+        self.inventory = inventory
+        self.capacity = capacity
+        self.min_days = min_days
+        self._tau = half_life_days / math.log(2)
+        self._clock = clock if clock is not None else datetime.today
+        self._since = _days(self._clock())
+        self._version = 0
+        self._row = {}                  # name -> row number
+        self._decayed = array("d")      # decayed sum of uses, as of _last
+        self._last = array("d")         # day of the last use
+        self._start = array("d")        # day observation began
+        self._slot = array("i")         # ring slot number, -1 before the first use
+        self._head = array("H")         # next ring position
+        self._filled = array("H")       # number of uses in the ring
+        self._ring_time = array("d")
+        self._ring_amount = array("d")
+        inventory.subscribe(self._on_change)
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every recorded use."""
+        return self._version
+
+    @property
+    def half_life_days(self) -> float:
+        """Days after which a use counts half as much."""
+        return self._tau * math.log(2)
+
+    def detach(self) -> None:
+        """Stop following the inventory."""
+        self.inventory.unsubscribe(self._on_change)
+
+    def record_use(self, name: str, amount: float, at: datetime = None) -> None:
+        """Record that 'amount' of an item was used (now, or 'at')."""
+        if amount <= 0:
+            return
+        t = _days(at if at is not None else self._clock())
+        row = self._row.get(name)
+        if row is None:
+            row = self._add_row(name, min(self._since, t))
+        last = self._last[row]
+        if t >= last:
+            self._decayed[row] = self._decayed[row] * math.exp((last - t) / self._tau) + amount
+            self._last[row] = t
+        else:
+            # A late event: decay it to the time of the last one instead
+            self._decayed[row] += amount * math.exp((t - last) / self._tau)
+        if t < self._start[row]:
+            self._start[row] = t
+        self._push(row, t, amount)
+        self._version += 1
+
+    def rate(self, name: str, now: datetime = None) -> float:
+        """Return the consumption rate of an item in units per day."""
+        row = self._row.get(name)
+        if row is None:
+            return 0.0
+        t = _days(now if now is not None else self._clock())
+        return self._rate(self._decayed[row], self._last[row], self._start[row], t)
+
+    def history(self, name: str):
+        """Return the recorded uses of an item as (datetime, amount), oldest first."""
+        row = self._row.get(name)
+        if row is None or self._slot[row] < 0:
+            return []
+        base, capacity = self._slot[row] * self.capacity, self.capacity
+        filled, head = self._filled[row], self._head[row]
+        positions = [(head - filled + i) % capacity for i in range(filled)]
+        return [
+            (_from_days(self._ring_time[base + p]), self._ring_amount[base + p])
+            for p in positions
+        ]
+
+    def forecast(self, now: datetime = None):
+        """
+        Return (name, quantity, unit, rate, days_to_stockout, days_to_expiry)
+        for every inventory item. days_to_stockout is infinite for items that
+        are not being used; days_to_expiry counts to midnight of the expiry
+        date and is negative for expired items.
+        """
+        t = _days(now if now is not None else self._clock())
+        names, quantities, units, ordinals = self._columns()
+        rates, stockout, expiry = self._forecast_columns(names, quantities, ordinals, t)
+        if np is not None:
+            rates, stockout, expiry = rates.tolist(), stockout.tolist(), expiry.tolist()
+        return list(zip(names, quantities, units, rates, stockout, expiry))
+
+    def due_within(self, days: float, now: datetime = None):
+        """
+        Return forecast() rows of items being used that run out or expire
+        within 'days' days, soonest first.
+        """
+        t = _days(now if now is not None else self._clock())
+        names, quantities, units, ordinals = self._columns()
+        rates, stockout, expiry = self._forecast_columns(names, quantities, ordinals, t)
+        if np is not None:
+            hits = np.flatnonzero((rates > 0) & (np.minimum(stockout, expiry) <= days)).tolist()
+            rates, stockout, expiry = rates.tolist(), stockout.tolist(), expiry.tolist()
+        else:
+            hits = [i for i, rate in enumerate(rates) if rate > 0 and min(stockout[i], expiry[i]) <= days]
+        rows = [(names[i], quantities[i], units[i], rates[i], stockout[i], expiry[i]) for i in hits]
+        rows.sort(key=lambda row: (min(row[4], row[5]), row[0]))
+        return rows
+
+    def _columns(self):
+        """Read the inventory into name, quantity, unit and expiry columns."""
+        records = list(self.inventory.iter_records())
+        if not records:
+            return [], [], [], []
+        names, quantities, units, ordinals = (list(column) for column in zip(*records))
+        return names, quantities, units, ordinals
+
+    def _forecast_columns(self, names, quantities, ordinals, t: float):
+        """
+        Return the rate, days-to-stockout and days-to-expiry columns (NumPy
+        arrays when NumPy is installed, lists otherwise).
+        """
+        get = self._row.get
+        rows = [get(name, -1) for name in names]
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.intp)
+            known = rows >= 0
+            picked = np.where(known, rows, 0)
+            if self._row:
+                decayed = np.frombuffer(self._decayed, dtype=np.float64)[picked]
+                last = np.frombuffer(self._last, dtype=np.float64)[picked]
+                start = np.frombuffer(self._start, dtype=np.float64)[picked]
+                elapsed = np.maximum(t - start, self.min_days)
+                rates = decayed * np.exp((last - t) / self._tau) / (self._tau * -np.expm1(-elapsed / self._tau))
+                rates = np.where(known, rates, 0.0)
+            else:
+                rates = np.zeros(len(names))
+            quantity = np.asarray(quantities, dtype=np.float64)
+            with np.errstate(divide="ignore"):
+                stockout = np.where(rates > 0, quantity / np.where(rates > 0, rates, 1.0), np.inf)
+            expiry = np.asarray(ordinals, dtype=np.float64) - t
+            return rates, stockout, expiry
+        decayed, last, start = self._decayed, self._last, self._start
+        rates, stockout, expiry = [], [], []
+        for row, quantity, ordinal in zip(rows, quantities, ordinals):
+            rate = 0.0 if row < 0 else self._rate(decayed[row], last[row], start[row], t)
+            rates.append(rate)
+            stockout.append(quantity / rate if rate > 0 else math.inf)
+            expiry.append(ordinal - t)
+        return rates, stockout, expiry
+
+    def _rate(self, decayed: float, last: float, start: float, t: float) -> float:
+        tau = self._tau
+        elapsed = max(t - start, self.min_days)
+        return decayed * math.exp((last - t) / tau) / (tau * -math.expm1(-elapsed / tau))
+
+    def _add_row(self, name: str, start: float) -> int:
+        row = self._row[name] = len(self._decayed)
+        self._decayed.append(0.0)
+        self._last.append(start)
+        self._start.append(start)
+        self._slot.append(-1)
+        self._head.append(0)
+        self._filled.append(0)
+        return row
+
+    def _push(self, row: int, t: float, amount: float) -> None:
+        """Write a use into the item's ring buffer, overwriting the oldest."""
+        slot = self._slot[row]
+        if slot < 0:
+            slot = self._slot[row] = len(self._ring_time) // self.capacity
+            self._ring_time.extend([0.0] * self.capacity)
+            self._ring_amount.extend([0.0] * self.capacity)
+        head = self._head[row]
+        position = slot * self.capacity + head
+        self._ring_time[position] = t
+        self._ring_amount[position] = amount
+        self._head[row] = (head + 1) % self.capacity
+        if self._filled[row] < self.capacity:
+            self._filled[row] += 1
+
+    def _on_change(self, op: str, item, amount: float = None) -> None:
+        """Inventory listener: record uses and when new items appear."""
+        if op == "use":
+            if amount:
+                self.record_use(item.name, amount)
+        elif op == "add" and item.name not in self._row:
+            self._add_row(item.name, _days(self._clock()))
+
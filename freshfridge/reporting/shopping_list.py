@@ -1,4 +1,12 @@
-from .base_report import BaseReport
+import heapq
+from itertools import islice
+from operator import itemgetter
+
+from ..alerts.thresholds import below_thresholds, threshold_key
+from .base_report import SORT_KEYS, BaseReport
+from .writers import write_rows
+
+SHOPPING_LINE = "{name}: need {needed} (current {current_qty})"
 
 
 class ShoppingListReport(BaseReport):
@@ -6,33 +14,69 @@ class ShoppingListReport(BaseReport):
 
     def generate_shopping_list(self, thresholds: dict):
         """Return a list of shopping items."""
-        if not isinstance(thresholds, dict):
-            raise TypeError("thresholds must be a dictionary")
+        return self._cached(
+            ("generate_shopping_list", threshold_key(thresholds)),
+            lambda: list(self.iter_shopping_list(thresholds)),
+        )
+
+    def iter_shopping_list(self, thresholds: dict, sort: str = None, offset: int = 0, limit: int = None):
+        """
+        Yield the generate_shopping_list() dictionaries one at a time,
+        optionally for one page sorted by "name" or "expiry".
+
+        The low-stock items are found in one pass; with a 'limit', only the
+        first offset + limit of them are picked in sort order (a heap
+        selection rather than a full sort) and dictionaries are built for
+        the page alone.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort!r}")
+        low = below_thresholds(self.inventory, thresholds)
+        if sort == "name":
+            key = itemgetter(0)
+        elif sort == "expiry":
+            get_item = self.inventory.get_item
+            key = lambda alert: (get_item(alert[0]).expiry_ordinal, alert[0])
+        if sort is not None:
+            low = sorted(low, key=key) if limit is None else heapq.nsmallest(offset + limit, low, key=key)
+        end = None if limit is None else offset + limit
+        for name, qty, threshold in islice(low, offset, end):
+            yield {"name": name, "current_qty": qty, "needed": threshold - qty}
+
+    def forecast_shopping_list(self, tracker, horizon_days: float = 7, now=None):
+        """
+        Return a shopping list predicted from consumption rates: every item
+        a ConsumptionTracker sees being used that runs out ("stockout") or
+        expires ("expiry") within 'horizon_days', whichever comes first,
+        soonest first. 'needed' is the amount used from then until the end
+        of the horizon.
+        """
         shopping_list = []
-        for name, item in self.inventory.items.items():
-            if name in thresholds and item.quantity < thresholds[name]:
-                shopping_list.append({
-                    "name": name,
-                    "current_qty": item.quantity,
-                    "needed": thresholds[name] - item.quantity,
-                })
+        for name, qty, _, rate, stockout, expiry in tracker.due_within(horizon_days, now):
+            days_left = max(0.0, min(stockout, expiry))
+            shopping_list.append({
+                "name": name,
+                "current_qty": qty,
+                "needed": round(rate * (horizon_days - days_left), 2),
+                "days_left": round(days_left, 1),
+                "reason": "stockout" if stockout <= expiry else "expiry",
+            })
         return shopping_list
 
     def display_shopping_list(self, shopping_list) -> None:
         """Print the shopping list in a readable format."""
         print("\n=== Recommended Shopping List ===")
-        if not shopping_list:
+        empty = True
+        for s in shopping_list:
+            print(SHOPPING_LINE.format_map(s))
+            empty = False
+        if empty:
             print("No items need to be purchased.")
-        else:
-            for s in shopping_list:
-                print(
-                    f"{s['name']}: need {s['needed']} "
-                    f"(current {s['current_qty']})"
-                )
         print("=================================\n")
 
-    def export_shopping_list(self, shopping_list, path: str = "shopping_list.txt") -> None:
-        """Export the shopping list to a text file."""
-        with open(path, "w") as f:
-            for s in shopping_list:
-                f.write(f"{s['name']}: need {s['needed']} (current {s['current_qty']})\n")
+    def export_shopping_list(self, shopping_list, path: str = "shopping_list.txt", fmt: str = "text") -> int:
+        """
+        Export the shopping list (a list or an iter_shopping_list() generator)
+        to a "text", "csv" or "jsonl" file; return the number of items written.
+        """
+        return write_rows(shopping_list, path, fmt, SHOPPING_LINE)
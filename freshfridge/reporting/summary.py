@@ -1,4 +1,9 @@
+from datetime import date
+
 from .base_report import BaseReport
+from .writers import write_rows
+
+SUMMARY_LINE = "{name} — {quantity} {unit} (expires {expiry_date})"
 
 
 class SummaryReport(BaseReport):
@@ -9,26 +14,41 @@ class SummaryReport(BaseReport):
         Return a list of dictionaries with item information.
         Each dict: {name, quantity, unit, expiry_date}
         """
-        summary = []
-        for item in self.inventory.items.values():
-            summary.append({
-                "name": item.name,
-                "quantity": item.quantity,
-                "unit": item.unit,
-                "expiry_date": item.expiry_date.strftime("%Y-%m-%d"),
-            })
-        return summary
+        return self._cached(("request_summary",), lambda: list(self.iter_summary()))
+
+    def iter_summary(self, sort: str = None, offset: int = 0, limit: int = None):
+        """
+        Yield the request_summary() dictionaries one at a time, optionally
+        for one page sorted by "name" or "expiry" (see BaseReport.iter_page).
+        """
+        dates = {}
+        for name, quantity, unit, ordinal in self.iter_page(sort, offset, limit):
+            expiry_date = dates.get(ordinal)
+            if expiry_date is None:
+                expiry_date = dates[ordinal] = date.fromordinal(ordinal).isoformat()
+            yield {"name": name, "quantity": quantity, "unit": unit, "expiry_date": expiry_date}
 
     def display_summary(self) -> None:
         """Print a formatted summary to the console."""
         print("\n=== Refrigerator Inventory Summary ===")
-        for item in self.request_summary():
-            print(
-                f"{item['name']} — {item['quantity']} {item['unit']} "
-                f"(expires {item['expiry_date']})"
-            )
+        for item in self.iter_summary():
+            print(SUMMARY_LINE.format_map(item))
         print("=====================================\n")
 
+    def export_summary(self, path: str = "summary.txt", fmt: str = "text", sort: str = None) -> int:
+        """
+        Stream the summary to a "text", "csv" or "jsonl" file without
+        building it in memory; return the number of items written.
+        """
+        return write_rows(self.iter_summary(sort), path, fmt, SUMMARY_LINE)
+
+    def quantity_by_item(self) -> dict:
+        """
+        Return a dictionary mapping (name, unit) to quantity, the form used
+        to add up the same item across several inventories.
+        """
+        return {(name, unit): quantity for name, quantity, unit, _ in self.inventory.iter_records()}
+
     def get_total_quantity(self) -> float:
         """Return the sum of quantities of all items."""
-        return sum(item.quantity for item in self.inventory.items.values())
+        return self._cached(("get_total_quantity",), self.inventory.total_quantity)
@@ -0,0 +1,306 @@
+"""
+Waste analytics: a log of discarded and expired items with rollups.
+
+WasteLog records an event whenever an item is removed with stock left or is
+reported expired, and adds each event's quantity to daily and weekly
+rollups, per item and per unit, as it is recorded. WasteReport answers
+questions such as "how much of each item did we waste last quarter" from
+those rollups: a 90-day range reads about 13 weekly and at most 12 daily
+buckets, however many events were logged.
+"""
+
+import json
+import os
+import threading
+from datetime import date, datetime
+
+from .base_report import BaseReport
+from .writers import write_rows
+
+REMOVED = "removed"
+EXPIRED = "expired"
+WASTE_LINE = "{name}: {quantity} {unit} wasted"
+
+
+class WasteEvent:
+    """
+    An item was thrown away ("removed") or found expired ("expired").
+    'expiry_ordinal' is the item's expiry date, when known.
+    """
+
+    __slots__ = ("kind", "name", "quantity", "unit", "at", "expiry_ordinal")
+
+    def __init__(self, kind: str, name: str, quantity: float, unit: str, at: datetime, expiry_ordinal: int = None):
+        self.kind = kind
+        self.name = name
+        self.quantity = quantity
+        self.unit = unit
+        self.at = at
+        self.expiry_ordinal = expiry_ordinal
+
+    def as_dict(self) -> dict:
+        data = {
+            "kind": self.kind,
+            "name": self.name,
+            "quantity": self.quantity,
+            "unit": self.unit,
+            "at": self.at.isoformat(),
+        }
+        if self.expiry_ordinal is not None:
+            data["expiry_ordinal"] = self.expiry_ordinal
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            data["kind"],
+            data["name"],
+            data["quantity"],
+            data["unit"],
+            datetime.fromisoformat(data["at"]),
+            data.get("expiry_ordinal"),
+        )
+
+    def __repr__(self) -> str:
+        return f"WasteEvent({self.kind!r}, {self.name!r}, {self.quantity!r}, {self.unit!r})"
+
+
+def _to_ordinal(day) -> int:
+    """Day ordinal of a date, datetime, 'YYYY-MM-DD' string or day ordinal."""
+    if isinstance(day, int):
+        return day
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    return day.toordinal()
+
+
+def _expiry_ordinals(inventory, name: str) -> set:
+    """Expiry ordinals of an item's lots (one for a plain inventory); empty if it is gone."""
+    if hasattr(inventory, "lots"):
+        return {lot.expiry_ordinal for lot in inventory.lots(name)}
+    item = inventory.get_item(name)
+    return set() if item is None else {item.expiry_ordinal}
+
+
+def previous_quarter(today: date = None):
+    """Return (start, end) dates of the calendar quarter before 'today's; 'end' is exclusive."""
+    if today is None:
+        today = date.today()
+    first_month = (today.month - 1) // 3 * 3 + 1
+    end = date(today.year, first_month, 1)
+    if first_month == 1:
+        return date(today.year - 1, 10, 1), end
+    return date(today.year, first_month - 3, 1), end
+
+
+class WasteLog:
+    """
+    Event log of wasted items with incrementally maintained rollups.
+
+    Attached to an inventory, it logs every remove_item() of an item that
+    still has stock: as "expired" if the item had expired by then, as
+    "removed" otherwise. ExpiryAlerts.mark_expired(inventory, waste_log)
+    logs expired items as they are found; an item is logged as expired once
+    per expiry date, and removing it afterwards counts only the quantity not
+    logged yet. With a LotInventory each lot is logged once by its own date.
+
+    With a 'path', events are appended to that JSON Lines file and the file
+    is replayed into the log when it is created. Expired events store the
+    item's expiry date, so after a restart items already logged as expired
+    (and still in the inventory with that date) are not logged again.
+    """
+
+    def __init__(self, inventory=None, path: str = None, clock=None):
+        self.inventory = inventory
+        self.path = path
+        self._clock = clock if clock is not None else datetime.today
+        self._lock = threading.Lock()
+        self._events = []
+        self._expired = {}       # name -> {expiry ordinal: quantity logged as expired}
+        self._version = 0
+        # {day or week-start ordinal: {(name, unit) or unit: quantity}}
+        self._daily_items, self._daily_units = {}, {}
+        self._weekly_items, self._weekly_units = {}, {}
+        if path is not None and os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        self._add(WasteEvent.from_dict(json.loads(line)))
+        if inventory is not None:
+            # Forget expired items (or lots) that were removed or restocked since
+            for name, logged in list(self._expired.items()):
+                current = _expiry_ordinals(inventory, name)
+                for ordinal in [ordinal for ordinal in logged if ordinal not in current]:
+                    del logged[ordinal]
+                if not logged:
+                    del self._expired[name]
+            inventory.subscribe(self._on_change)
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every logged event."""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def detach(self) -> None:
+        """Stop following the inventory."""
+        if self.inventory is not None:
+            self.inventory.unsubscribe(self._on_change)
+
+    def record(
+        self, kind: str, name: str, quantity: float, unit: str, at: datetime = None, expiry_ordinal: int = None
+    ) -> WasteEvent:
+        """Log a waste event (now, or 'at') and return it."""
+        event = WasteEvent(kind, name, quantity, unit, at if at is not None else self._clock(), expiry_ordinal)
+        with self._lock:
+            self._add(event)
+            if self.path is not None:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(event.as_dict()) + "\n")
+        return event
+
+    def record_expired(self, item, at: datetime = None):
+        """Log an expired item unless it was logged for this expiry date; return the event or None."""
+        if item.quantity <= 0 or item.expiry_ordinal in self._expired.get(item.name, ()):
+            return None
+        return self.record(EXPIRED, item.name, item.quantity, item.unit, at, item.expiry_ordinal)
+
+    def events(self, start=None, end=None):
+        """Return the logged events from day 'start' up to (not including) day 'end'."""
+        low = None if start is None else _to_ordinal(start)
+        high = None if end is None else _to_ordinal(end)
+        return [
+            event for event in self._events
+            if (low is None or event.at.toordinal() >= low) and (high is None or event.at.toordinal() < high)
+        ]
+
+    def totals(self, start, end, by: str = "item") -> dict:
+        """
+        Return the wasted quantities from day 'start' up to (not including)
+        day 'end', keyed by (name, unit) for by="item" or by unit for
+        by="unit". Whole weeks are read from the weekly rollup and the days
+        around them from the daily one.
+        """
+        if by == "item":
+            daily, weekly = self._daily_items, self._weekly_items
+        elif by == "unit":
+            daily, weekly = self._daily_units, self._weekly_units
+        else:
+            raise ValueError(f"Unknown waste grouping: {by!r}")
+        day, end = _to_ordinal(start), _to_ordinal(end)
+        totals = {}
+        while day < end:
+            # date.fromordinal(d).weekday() == (d - 1) % 7; 0 is Monday
+            if (day - 1) % 7 == 0 and day + 7 <= end:
+                bucket, day = weekly.get(day), day + 7
+            else:
+                bucket, day = daily.get(day), day + 1
+            if bucket:
+                for key, quantity in bucket.items():
+                    totals[key] = totals.get(key, 0) + quantity
+        return totals
+
+    def rollup(self, period: str = "day"):
+        """Return the per-unit rollup for "day" or "week" as {(period start, unit): quantity}."""
+        if period == "day":
+            buckets = self._daily_units
+        elif period == "week":
+            buckets = self._weekly_units
+        else:
+            raise ValueError(f"Unknown waste period: {period!r}")
+        return {
+            (date.fromordinal(day), unit): quantity
+            for day, units in sorted(buckets.items())
+            for unit, quantity in units.items()
+        }
+
+    def first_day(self):
+        """Return the date of the earliest logged event, or None."""
+        if not self._daily_units:
+            return None
+        return date.fromordinal(min(self._daily_units))
+
+    def _add(self, event: WasteEvent) -> None:
+        """Append an event and add it to the rollups."""
+        self._events.append(event)
+        if event.kind == EXPIRED and event.expiry_ordinal is not None:
+            self._expired.setdefault(event.name, {})[event.expiry_ordinal] = event.quantity
+        day = event.at.toordinal()
+        week = day - (day - 1) % 7
+        item_key, quantity = (event.name, event.unit), event.quantity
+        for buckets, period in ((self._daily_items, day), (self._weekly_items, week)):
+            bucket = buckets.setdefault(period, {})
+            bucket[item_key] = bucket.get(item_key, 0) + quantity
+        for buckets, period in ((self._daily_units, day), (self._weekly_units, week)):
+            bucket = buckets.setdefault(period, {})
+            bucket[event.unit] = bucket.get(event.unit, 0) + quantity
+        self._version += 1
+
+    def _on_change(self, op: str, item, amount: float = None) -> None:
+        """Inventory listener: log the stock of removed items not logged as expired yet."""
+        if op != "remove":
+            return
+        logged = self._expired.pop(item.name, {})
+        quantity = item.quantity - sum(logged.values())
+        if quantity > 0:
+            now = self._clock()
+            kind = EXPIRED if item.expiry_ordinal <= now.toordinal() else REMOVED
+            self.record(kind, item.name, quantity, item.unit, now, item.expiry_ordinal)
+            self._expired.pop(item.name, None)
+
+
+class WasteReport(BaseReport):
+    """Reports wasted quantities from a WasteLog's rollups."""
+
+    def __init__(self, inventory, waste_log: WasteLog = None, cache_size: int = 128):
+        super().__init__(inventory, cache_size)
+        self.waste_log = waste_log if waste_log is not None else WasteLog(inventory)
+
+    def waste_by_item(self, start=None, end=None):
+        """
+        Return {name, unit, quantity} dictionaries of the waste from day
+        'start' (default: the first logged event) up to, not including,
+        'end' (default: tomorrow), most wasted first.
+        """
+        return self._waste("item", start, end)
+
+    def waste_by_unit(self, start=None, end=None):
+        """Return {unit, quantity} dictionaries, like waste_by_item()."""
+        return self._waste("unit", start, end)
+
+    def display_waste(self, rows) -> None:
+        """Print waste_by_item() rows in a readable format."""
+        print("\n=== Wasted Items ===")
+        empty = True
+        for row in rows:
+            print(WASTE_LINE.format_map(row))
+            empty = False
+        if empty:
+            print("Nothing was wasted.")
+        print("====================\n")
+
+    def export_waste(self, rows, path: str = "waste.txt", fmt: str = "text") -> int:
+        """Write waste_by_item() rows to a "text", "csv" or "jsonl" file; return the row count."""
+        return write_rows(rows, path, fmt, WASTE_LINE)
+
+    def _waste(self, by: str, start, end):
+        log = self.waste_log
+        today = log._clock().toordinal()
+        start = _to_ordinal(start if start is not None else log.first_day() or today)
+        end = _to_ordinal(end) if end is not None else today + 1
+        return self._cached(
+            ("waste", by, start, end, log, log.version),
+            lambda: self._rows(by, log.totals(start, end, by)),
+        )
+
+    @staticmethod
+    def _rows(by: str, totals: dict):
+        if by == "item":
+            rows = [{"name": name, "unit": unit, "quantity": quantity} for (name, unit), quantity in totals.items()]
+            rows.sort(key=lambda row: (-row["quantity"], row["name"], row["unit"]))
+        else:
+            rows = [{"unit": unit, "quantity": quantity} for unit, quantity in totals.items()]
+            rows.sort(key=lambda row: (-row["quantity"], row["unit"]))
+        return rows
@@ -0,0 +1,81 @@
+"""
+Buffered writers that stream report rows (dictionaries) to a file.
+
+Rows are consumed one at a time, so they can come straight from a report
+generator such as SummaryReport.iter_summary() without building a list.
+Each writer returns the number of rows written.
+"""
+
+import csv
+import json
+from itertools import chain
+
+FORMATS = ("text", "csv", "jsonl")
+_BUFFER_SIZE = 1 << 20
+_COMPACT = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class _Counter:
+    """Iterator wrapper that counts the rows passing through it."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self._rows)
+        self.count += 1
+        return row
+
+
+def write_text(rows, path: str, template: str) -> int:
+    """Write one line per row, formatted with template.format_map(row)."""
+    counter = _Counter(rows)
+    with open(path, "w", buffering=_BUFFER_SIZE) as f:
+        f.writelines(template.format_map(row) + "\n" for row in counter)
+    return counter.count
+
+
+def write_csv(rows, path: str, fieldnames=None) -> int:
+    """
+    Write rows as CSV with a header line. Without 'fieldnames', the keys of
+    the first row are used.
+    """
+    rows = iter(rows)
+    if fieldnames is None:
+        first = next(rows, None)
+        if first is None:
+            fieldnames = []
+        else:
+            fieldnames = list(first)
+            rows = chain([first], rows)
+    counter = _Counter(rows)
+    with open(path, "w", newline="", buffering=_BUFFER_SIZE) as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(counter)
+    return counter.count
+
+
+def write_jsonl(rows, path: str) -> int:
+    """Write each row as one compact JSON object per line."""
+    counter = _Counter(rows)
+    with open(path, "w", buffering=_BUFFER_SIZE) as f:
+        f.writelines(_COMPACT(row) + "\n" for row in counter)
+    return counter.count
+
+
+def write_rows(rows, path: str, fmt: str = "text", template: str = None) -> int:
+    """Write rows as 'fmt' ("text", "csv" or "jsonl"); text needs a 'template'."""
+    if fmt == "text":
+        if template is None:
+            raise ValueError("Text output needs a line template")
+        return write_text(rows, path, template)
+    if fmt == "csv":
+        return write_csv(rows, path)
+    if fmt == "jsonl":
+        return write_jsonl(rows, path)
+    raise ValueError(f"Unknown report format: {fmt!r}")
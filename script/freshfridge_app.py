@@ -11,21 +11,37 @@ Users can type simple commands like:
 - help : see all available commands
 - quit : save and exit
 
+It can also run non-interactively, applying many commands with a single
+load and save of the inventory and printing one JSON result per command:
+
+    freshfridge -c "add Milk 2 L 2030-01-01" -c "use Milk 0.5"
+    freshfridge --batch commands.txt
+    consume-events | freshfridge --batch -
+
 This file demonstrates how to use the FreshFridge package for DATA 533 Step 3.
 """
 
 # freshfridge_app.py
-from datetime import datetime
-from freshfridge.inventory.operations import InventoryOperations
-from freshfridge.inventory.persistence import InventoryPersistence
-from freshfridge.alerts.expiry import ExpiryAlerts
-from freshfridge.alerts.lowstock import LowStockAlerts
-from freshfridge.reporting.summary import SummaryReport
-from freshfridge.reporting.shopping_list import ShoppingListReport
-from freshfridge.inventory.items import InvalidExpiryDateError  
-
-INVENTORY_PATH = "inventory_app.json"
-SHOPPING_LIST_PATH = "shopping_list_app.txt"
+# Only lightweight modules are imported at start-up; the freshfridge classes
+# are imported when a command first needs them (see Session), so '--help'
+# and other short runs do not pay for them.
+import json
+import os
+import shlex
+import sys
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from freshfridge.inventory.operations import InventoryOperations
+    from freshfridge.alerts.thresholds import ThresholdStore
+    from freshfridge.alerts.expiry import ExpiryAlerts
+    from freshfridge.alerts.lowstock import LowStockAlerts
+    from freshfridge.reporting.summary import SummaryReport
+    from freshfridge.reporting.shopping_list import ShoppingListReport
+
+# Set to a file path to record call metrics (Prometheus text if it ends in .prom)
+METRICS_PATH = os.environ.get("FRESHFRIDGE_METRICS")
 
 INVENTORY_PATH = "inventory_app.json"
 SHOPPING_LIST_PATH = "shopping_list_app.txt"
@@ -41,6 +57,28 @@ def print_welcome():
     print("Type 'help' to see a list of commands.\n")
 
 
+DESCRIPTION = """Interactive FreshFridge inventory manager. The inventory is read when
+the first command needs it and saved on 'quit'. With -c or --batch the
+commands are applied without prompting and one JSON result is printed per
+command."""
+
+EPILOG = """batch commands, one per line as text or as a JSON object:
+  add NAME QUANTITY UNIT EXPIRY_DATE   {"cmd": "add", "name": ..., "quantity": ..., "unit": ..., "expiry_date": ...}
+  use NAME QUANTITY                    {"cmd": "use", "name": ..., "quantity": ...}
+  set NAME QUANTITY                    {"cmd": "set", "name": ..., "quantity": ...}
+  remove NAME                          {"cmd": "remove", "name": ...}
+  threshold NAME QUANTITY              {"cmd": "threshold", "name": ..., "quantity": ...}
+  category NAME CATEGORY               {"cmd": "category", "name": ..., "category": ...}
+  category-threshold CATEGORY QUANTITY {"cmd": "category-threshold", "category": ..., "quantity": ...}
+  show [SORT]  exp [DAYS]  expired  low  shop
+Text lines are split like a shell command line, so quote names with spaces.
+Blank lines and lines starting with '#' are skipped.
+
+environment:
+  FRESHFRIDGE_METRICS  write call metrics to this file on quit
+                       (Prometheus text if it ends in .prom)"""
+
+
 def print_help():
     print("\nAvailable commands:")
     print("  add   - Add a new item to the fridge")
@@ -53,7 +91,7 @@ def print_help():
     print("  quit  - Save your inventory and exit the program\n")
 
 
-def handle_add(inventory: InventoryOperations):
+def handle_add(inventory: "InventoryOperations"):
     print("\n[ADD ITEM]")
     name = input("Item name: ").strip()
     if not name:
@@ -76,14 +114,14 @@ def handle_add(inventory: InventoryOperations):
         print(f"  ❌ Error adding item: {e}")
 
 
-def handle_use(inventory: InventoryOperations):
+def handle_use(inventory: "InventoryOperations"):
     print("\n[USE ITEM]")
-    if not inventory.items:
+    if not len(inventory):
         print("  ℹ️ Inventory is empty. Nothing to use.")
         return
 
     name = input("Item name to use: ").strip()
-    if name not in inventory.items:
+    if name not in inventory:
         print(f"  ❌ Item '{name}' not found in inventory.")
         return
 
@@ -97,17 +135,17 @@ def handle_use(inventory: InventoryOperations):
     print(f"  ✅ Used {quantity} from '{name}'.")
 
 
-def handle_show(summary_report: SummaryReport):
+def handle_show(summary_report: "SummaryReport"):
     print("\n[SHOW INVENTORY]")
-    if not summary_report.inventory.items:
+    if not len(summary_report.inventory):
         print("  ℹ️ Your fridge is currently empty.")
     else:
         summary_report.display_summary()
 
 
-def handle_expiry(inventory: InventoryOperations, expiry_alerts: ExpiryAlerts):
+def handle_expiry(inventory: "InventoryOperations", expiry_alerts: "ExpiryAlerts"):
     print("\n[EXPIRY CHECK]")
-    if not inventory.items:
+    if not len(inventory):
         print("  ℹ️ Inventory is empty.")
         return
 
@@ -130,7 +168,7 @@ def handle_expiry(inventory: InventoryOperations, expiry_alerts: ExpiryAlerts):
             print(f"   - {item.name} (quantity: {item.quantity}, unit: {item.unit})")
 
 
-def handle_low_stock(inventory: InventoryOperations, lowstock_alerts: LowStockAlerts, thresholds: dict):
+def handle_low_stock(inventory: "InventoryOperations", lowstock_alerts: "LowStockAlerts", thresholds: "ThresholdStore"):
     print("\n[LOW-STOCK SETTINGS]")
     print("You can:")
     print("  1. Set/update a threshold for an item")
@@ -144,7 +182,7 @@ def handle_low_stock(inventory: InventoryOperations, lowstock_alerts: LowStockAl
         except ValueError:
             print("  ❌ Invalid threshold.")
             return
-        thresholds[name] = th
+        thresholds.set_item(name, th)
         print(f"  ✅ Threshold for '{name}' set to {th}.")
 
     elif sub_choice == "2":
@@ -164,9 +202,9 @@ def handle_low_stock(inventory: InventoryOperations, lowstock_alerts: LowStockAl
 
 
 def handle_shopping_list(
-    inventory: InventoryOperations,
-    shopping_report: ShoppingListReport,
-    thresholds: dict,
+    inventory: "InventoryOperations",
+    shopping_report: "ShoppingListReport",
+    thresholds: "ThresholdStore",
     export_path: str = SHOPPING_LIST_PATH,
 ):
     print("\n[SHOPPING LIST]")
@@ -188,21 +226,284 @@ def handle_shopping_list(
         print("  ℹ️ Shopping list not exported.")
 
 
-def main():
-    inventory = InventoryOperations()
-    expiry_alerts = ExpiryAlerts()
-    lowstock_alerts = LowStockAlerts()
-    summary_report = SummaryReport(inventory)
-    shopping_report = ShoppingListReport(inventory)
-    thresholds: dict[str, float] = {}  
+def save_metrics(path: str = METRICS_PATH):
+    from freshfridge import instrumentation
+
+    with open(path, "w") as f:
+        f.write(instrumentation.to_prometheus() if path.endswith(".prom") else instrumentation.to_json())
+
 
+def load_inventory(path: str = INVENTORY_PATH, log=None, thresholds: "ThresholdStore" = None) -> "InventoryOperations":
+    from freshfridge.inventory.operations import InventoryOperations
+    from freshfridge.inventory.persistence import InventoryPersistence
+
+    inventory = InventoryOperations()
     try:
-        InventoryPersistence.load_inventory(inventory, INVENTORY_PATH)
-        print("Inventory loaded successfully.")
+        InventoryPersistence.load_inventory(inventory, path, thresholds=thresholds)
+        print("Inventory loaded successfully.", file=log)
     except ValueError as e:
-        print(f"Warning: {e}. Starting with empty inventory.")
+        print(f"Warning: {e}. Starting with empty inventory.", file=log)
     except Exception as e:
-        print(f"Unexpected error loading inventory: {e}. Starting with empty inventory.")
+        print(f"Unexpected error loading inventory: {e}. Starting with empty inventory.", file=log)
+    return inventory
+
+
+class Session:
+    """
+    Objects shared by the commands. Each one is created (and its module
+    imported) the first time a command uses it; in particular the inventory
+    file (which also holds the low-stock thresholds) is only read by the
+    first command that needs the inventory or the thresholds.
+    """
+
+    def __init__(self, path: str = INVENTORY_PATH, log=None):
+        self.path = path
+        self.log = log
+
+    @property
+    def loaded(self) -> bool:
+        """True once the inventory has been read."""
+        return "_data" in self.__dict__
+
+    @cached_property
+    def _data(self):
+        from freshfridge.alerts.thresholds import ThresholdStore
+
+        thresholds = ThresholdStore()
+        return load_inventory(self.path, self.log, thresholds), thresholds
+
+    @property
+    def inventory(self) -> "InventoryOperations":
+        return self._data[0]
+
+    @property
+    def thresholds(self) -> "ThresholdStore":
+        return self._data[1]
+
+    @cached_property
+    def expiry_alerts(self) -> "ExpiryAlerts":
+        from freshfridge.alerts.expiry import ExpiryAlerts
+        return ExpiryAlerts()
+
+    @cached_property
+    def lowstock_alerts(self) -> "LowStockAlerts":
+        from freshfridge.alerts.lowstock import LowStockAlerts
+        return LowStockAlerts()
+
+    @cached_property
+    def summary_report(self) -> "SummaryReport":
+        from freshfridge.reporting.summary import SummaryReport
+        return SummaryReport(self.inventory)
+
+    @cached_property
+    def shopping_report(self) -> "ShoppingListReport":
+        from freshfridge.reporting.shopping_list import ShoppingListReport
+        return ShoppingListReport(self.inventory)
+
+    def save(self) -> bool:
+        """
+        Save the inventory if it was loaded; return whether it was saved.
+        Only the changed items are written (see InventoryPersistence.save_delta).
+        """
+        if not self.loaded:
+            return False
+        from freshfridge.inventory.persistence import InventoryPersistence
+        InventoryPersistence.save_delta(self.inventory, self.path, thresholds=self.thresholds)
+        return True
+
+
+def _item_row(item) -> dict:
+    return {"name": item.name, "quantity": item.quantity, "unit": item.unit,
+            "expiry_date": item.expiry_date.strftime("%Y-%m-%d")}
+
+
+def _existing_item(session: Session, name: str):
+    item = session.inventory.get_item(name)
+    if item is None:
+        raise ValueError(f"Item '{name}' not found in inventory")
+    return item
+
+
+def batch_add(session: Session, name: str, quantity, unit: str, expiry_date: str) -> dict:
+    session.inventory.add_item(name, float(quantity), unit, expiry_date)
+    return _item_row(session.inventory.get_item(name))
+
+
+def batch_use(session: Session, name: str, quantity) -> dict:
+    _existing_item(session, name)
+    session.inventory.use_item(name, float(quantity))
+    return _item_row(session.inventory.get_item(name))
+
+
+def batch_set(session: Session, name: str, quantity) -> dict:
+    _existing_item(session, name)
+    session.inventory.set_quantity(name, float(quantity))
+    return _item_row(session.inventory.get_item(name))
+
+
+def batch_remove(session: Session, name: str) -> dict:
+    row = _item_row(_existing_item(session, name))
+    session.inventory.remove_item(name)
+    return row
+
+
+def batch_threshold(session: Session, name: str, quantity) -> dict:
+    session.thresholds.set_item(name, float(quantity))
+    return {"name": name, "threshold": session.thresholds.resolve(name)}
+
+
+def batch_category(session: Session, name: str, category: str) -> dict:
+    session.thresholds.assign_category(name, category)
+    return {"name": name, "category": category, "threshold": session.thresholds.resolve(name)}
+
+
+def batch_category_threshold(session: Session, category: str, quantity) -> dict:
+    session.thresholds.set_category(category, float(quantity))
+    return {"category": category, "threshold": float(quantity)}
+
+
+def batch_show(session: Session, sort: str = None) -> dict:
+    return {"items": list(session.summary_report.iter_summary(sort=sort))}
+
+
+def batch_expiring(session: Session, days=3) -> dict:
+    items = session.expiry_alerts.check_expiring(session.inventory, within_days=int(days))
+    return {"days": int(days), "items": [_item_row(item) for item in items]}
+
+
+def batch_expired(session: Session) -> dict:
+    return {"items": [_item_row(item) for item in session.expiry_alerts.mark_expired(session.inventory)]}
+
+
+def batch_low(session: Session) -> dict:
+    low = session.lowstock_alerts.low_stock_alert(session.inventory, session.thresholds)
+    return {"items": [{"name": name, "quantity": qty, "threshold": th} for name, qty, th in low]}
+
+
+def batch_shop(session: Session) -> dict:
+    return {"items": session.shopping_report.generate_shopping_list(session.thresholds)}
+
+
+# Batch command name -> (handler, changes the saved inventory or thresholds)
+BATCH_COMMANDS = {
+    "add": (batch_add, True),
+    "use": (batch_use, True),
+    "set": (batch_set, True),
+    "remove": (batch_remove, True),
+    "threshold": (batch_threshold, True),
+    "category": (batch_category, True),
+    "category-threshold": (batch_category_threshold, True),
+    "show": (batch_show, False),
+    "exp": (batch_expiring, False),
+    "expired": (batch_expired, False),
+    "low": (batch_low, False),
+    "shop": (batch_shop, False),
+}
+
+
+def parse_command(line: str):
+    """
+    Parse one batch line into (command, args, kwargs), or None for blank
+    and comment lines. JSON objects name the command in "cmd".
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        kwargs = json.loads(line)
+        if not isinstance(kwargs, dict) or "cmd" not in kwargs:
+            raise ValueError("JSON commands must be objects with a 'cmd' key")
+        return str(kwargs.pop("cmd")).lower(), (), kwargs
+    # shlex is only needed for quoted arguments
+    words = shlex.split(line) if ('"' in line or "'" in line or "\\" in line) else line.split()
+    return words[0].lower(), words[1:], {}
+
+
+def run_batch(session: Session, lines, out=None) -> int:
+    """
+    Apply the commands in 'lines' to the session, writing one JSON result
+    per command to 'out' (default: stdout)::
+
+        {"line": 1, "cmd": "use", "ok": true, "result": {...}}
+        {"line": 2, "cmd": "use", "ok": false, "error": "..."}
+
+    A failing command does not stop the run. The inventory is saved once at
+    the end if any command changed it, and a final {"summary": {...}} line
+    reports the counts. Return the number of failed commands.
+    """
+    if out is None:
+        out = sys.stdout
+    encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+    total = failed = 0
+    changed = False
+    for number, line in enumerate(lines, 1):
+        cmd = None
+        try:
+            parsed = parse_command(line)
+            if parsed is None:
+                continue
+            cmd, args, kwargs = parsed
+            total += 1
+            entry = BATCH_COMMANDS.get(cmd)
+            if entry is None:
+                raise ValueError(f"Unknown command: {cmd!r}")
+            handler, mutates = entry
+            try:
+                result = handler(session, *args, **kwargs)
+            except TypeError as e:
+                raise ValueError(f"Wrong arguments for {cmd!r}: {e}") from e
+            changed = changed or mutates
+            out.write(encode({"line": number, "cmd": cmd, "ok": True, "result": result}) + "\n")
+        except Exception as e:
+            failed += 1
+            out.write(encode({"line": number, "cmd": cmd, "ok": False, "error": str(e)}) + "\n")
+    saved = changed and session.save()
+    out.write(encode({"summary": {"commands": total, "failed": failed, "saved": saved}}) + "\n")
+    return failed
+
+
+def _batch_lines(args):
+    """Yield the batch lines given by -c options and the --batch file."""
+    yield from args.commands or ()
+    if args.batch == "-":
+        yield from sys.stdin
+    elif args.batch:
+        with open(args.batch, encoding="utf-8") as f:
+            yield from f
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="freshfridge",
+        description=DESCRIPTION,
+        epilog=EPILOG,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("-c", "--command", dest="commands", action="append", metavar="COMMAND",
+                        help="run a batch command (may be repeated)")
+    parser.add_argument("--batch", metavar="FILE", help="run batch commands from FILE ('-' for stdin)")
+    parser.add_argument("--inventory", default=INVENTORY_PATH, metavar="PATH",
+                        help=f"inventory file (default: {INVENTORY_PATH})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if METRICS_PATH:
+        from freshfridge import instrumentation
+        instrumentation.enable()
+
+    if args.commands or args.batch:
+        # Keep stdout machine-readable: load messages go to stderr
+        session = Session(args.inventory, log=sys.stderr)
+        failed = run_batch(session, _batch_lines(args))
+        if METRICS_PATH:
+            save_metrics()
+        return 1 if failed else 0
+
+    session = Session(args.inventory)
 
     print_welcome()
 
@@ -210,8 +511,11 @@ def main():
         cmd = input("What would you like to do? (type 'help' for options): ").strip().lower()
 
         if cmd in ("quit", "q", "exit"):
-            InventoryPersistence.save_inventory(inventory, INVENTORY_PATH)
-            print(f"\n💾 Inventory saved to '{INVENTORY_PATH}'.")
+            if session.save():
+                print(f"\n💾 Inventory saved to '{session.path}'.")
+            if METRICS_PATH:
+                save_metrics()
+                print(f"📈 Metrics written to '{METRICS_PATH}'.")
             print("Goodbye! 👋")
             break
 
@@ -219,26 +523,26 @@ def main():
             print_help()
 
         elif cmd in ("add", "a"):
-            handle_add(inventory)
+            handle_add(session.inventory)
 
         elif cmd in ("use", "u"):
-            handle_use(inventory)
+            handle_use(session.inventory)
 
         elif cmd in ("show", "s"):
-            handle_show(summary_report)
+            handle_show(session.summary_report)
 
         elif cmd in ("exp", "expiry", "e"):
-            handle_expiry(inventory, expiry_alerts)
+            handle_expiry(session.inventory, session.expiry_alerts)
 
         elif cmd in ("low", "l"):
-            handle_low_stock(inventory, lowstock_alerts, thresholds)
+            handle_low_stock(session.inventory, session.lowstock_alerts, session.thresholds)
 
         elif cmd in ("shop", "shopping", "list"):
-            handle_shopping_list(inventory, shopping_report, thresholds)
+            handle_shopping_list(session.inventory, session.shopping_report, session.thresholds)
 
         else:
             print("❓ I did not understand that command. Type 'help' to see options.")
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
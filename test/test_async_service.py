@@ -0,0 +1,78 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from freshfridge.inventory.async_service import AsyncInventoryService
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.inventory.persistence import InventoryPersistence
+
+
+class TestAsyncInventoryService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "inventory.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    async def test_burst_of_changes_is_saved_once(self):
+        service = AsyncInventoryService(path=self.path, save_delay=0.05)
+        for i in range(50):
+            await service.add_item(f"Item{i}", i + 1, "pcs", "2025-12-18")
+        await service.use_item("Item0", 1)
+        await service.remove_item("Item1")
+        await asyncio.sleep(0.2)
+        self.assertEqual(service.save_count, 1)
+        with open(self.path) as f:
+            data = json.load(f)
+        self.assertEqual(len(data), 49)
+        self.assertEqual(data["Item0"]["quantity"], 0)
+
+    async def test_flush_and_load(self):
+        service = AsyncInventoryService(path=self.path, save_delay=60)
+        await service.add_items([("Milk", 2, "L", "2025-12-18")])
+        await service.close()
+        self.assertEqual(service.save_count, 1)
+
+        restored = AsyncInventoryService(path=self.path)
+        await restored.load()
+        self.assertEqual(
+            InventoryPersistence.inventory_to_dict(restored.inventory),
+            {"Milk": {"quantity": 2, "unit": "L", "expiry_date": "2025-12-18"}},
+        )
+        await restored.close()
+        self.assertEqual(restored.save_count, 0)
+
+    async def test_save_supersedes_delta_saves(self):
+        inventory = InventoryOperations()
+        inventory.add_item("Milk", 2, "L", "2025-12-18")
+        InventoryPersistence.save_inventory(inventory, self.path)
+        inventory.use_item("Milk", 1)
+        InventoryPersistence.save_delta(inventory, self.path)
+        service = AsyncInventoryService(path=self.path)
+        await service.load()
+        await service.use_item("Milk", 0.5)
+        await service.close()
+        self.assertFalse(os.path.exists(self.path + ".delta"))
+        restored = AsyncInventoryService(path=self.path)
+        await restored.load()
+        self.assertEqual(restored.inventory.get_item("Milk").quantity, 0.5)
+
+    async def test_queries(self):
+        inventory = InventoryOperations()
+        inventory.add_item("Milk", 2, "L", "2000-01-01")
+        service = AsyncInventoryService(inventory, path=self.path)
+        self.assertEqual([i.name for i in await service.mark_expired()], ["Milk"])
+        self.assertEqual(len(await service.check_expiring(3)), 1)
+        self.assertEqual(await service.low_stock_alert({"Milk": 3}), [("Milk", 2, 3)])
+        shopping = await service.generate_shopping_list({"Milk": 3})
+        self.assertEqual(shopping[0]["needed"], 1)
+        self.assertEqual((await service.request_summary())[0]["name"], "Milk")
+
+
+if __name__ == "__main__":
+    unittest.main()
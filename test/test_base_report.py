@@ -1,8 +1,11 @@
 from datetime import datetime
 import unittest
+from unittest.mock import patch
 from freshfridge.inventory.operations import InventoryOperations
 from freshfridge.inventory.items import FreshItem
 from freshfridge.reporting.base_report import BaseReport
+from freshfridge.reporting.shopping_list import ShoppingListReport
+from freshfridge.reporting.summary import SummaryReport
 
 class TestBaseReport(unittest.TestCase):
 
@@ -34,5 +37,42 @@ class TestBaseReport(unittest.TestCase):
         expected = ["Milk", "Eggs", "Butter", "Yogurt", "Cheese"]
         self.assertCountEqual(names, expected)
 
+    def test_results_are_cached_per_version(self):
+        inventory = InventoryOperations()
+        inventory.add_item("Milk", 2, "L", "2025-02-18")
+        report = SummaryReport(inventory, cache_size=2)
+        first = report.request_summary()
+        with patch.object(report, "iter_summary") as iter_summary:
+            self.assertEqual(report.request_summary(), first)
+            iter_summary.assert_not_called()
+        self.assertEqual(report.count_items(), 1)
+
+        first[0]["quantity"] = 99  # callers get copies of cached results
+        first.clear()
+        self.assertEqual(report.request_summary()[0]["quantity"], 2)
+
+        inventory.use_item("Milk", 1)
+        second = report.request_summary()
+        self.assertIsNot(second, first)
+        self.assertEqual(second[0]["quantity"], 1)
+        self.assertEqual(report.get_total_quantity(), 1)
+        self.assertEqual(len(report._cache), 2)  # LRU bound
+
+        report.clear_cache()
+        self.assertEqual(report._cache, {})
+        self.assertEqual(report.request_summary(), second)
+
+    def test_cache_can_be_disabled(self):
+        inventory = InventoryOperations()
+        report = ShoppingListReport(inventory, cache_size=0)
+        self.assertIsNot(report.generate_shopping_list({}), report.generate_shopping_list({}))
+
+    def test_shopping_list_cache_is_keyed_by_thresholds(self):
+        inventory = InventoryOperations()
+        inventory.add_item("Milk", 2, "L", "2025-02-18")
+        report = ShoppingListReport(inventory)
+        self.assertEqual(len(report.generate_shopping_list({"Milk": 3})), 1)
+        self.assertEqual(report.generate_shopping_list({"Milk": 1}), [])
+
 if __name__ == "__main__":
     unittest.main()
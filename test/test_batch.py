@@ -0,0 +1,87 @@
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("freshfridge_app", os.path.join(ROOT, "script", "freshfridge_app.py"))
+app = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(app)
+
+
+class TestBatchMode(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "inventory.json")
+        self.log = io.StringIO()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_lines(self, lines):
+        out = io.StringIO()
+        failed = app.run_batch(app.Session(self.path, log=self.log), lines, out)
+        return failed, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_parse_command(self):
+        self.assertIsNone(app.parse_command("  # comment"))
+        self.assertIsNone(app.parse_command(""))
+        self.assertEqual(app.parse_command('USE "Oat milk" 2'), ("use", ["Oat milk", "2"], {}))
+        self.assertEqual(
+            app.parse_command('{"cmd": "use", "name": "Milk", "quantity": 1}'),
+            ("use", (), {"name": "Milk", "quantity": 1}),
+        )
+
+    def test_text_and_json_commands(self):
+        failed, results = self.run_lines([
+            'add "Oat milk" 2 L 2030-01-01',
+            '{"cmd": "use", "name": "Oat milk", "quantity": 0.5}',
+            "",
+            "threshold 'Oat milk' 3",
+            "shop",
+        ])
+        self.assertEqual(failed, 0)
+        self.assertEqual([r.get("cmd") for r in results], ["add", "use", "threshold", "shop", None])
+        self.assertEqual(results[1]["result"]["quantity"], 1.5)
+        self.assertEqual(results[3]["result"]["items"], [{"name": "Oat milk", "current_qty": 1.5, "needed": 1.5}])
+        self.assertEqual(results[-1], {"summary": {"commands": 4, "failed": 0, "saved": True}})
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved["Oat milk"]["quantity"], 1.5)
+        self.assertEqual(saved["__thresholds__"], {"items": {"Oat milk": 3.0}})
+        _, results = self.run_lines(["category Jam sweets", "category-threshold sweets 2", "low"])
+        self.assertEqual(results[0]["result"]["threshold"], None)
+        self.assertEqual(results[2]["result"]["items"], [{"name": "Oat milk", "quantity": 1.5, "threshold": 3.0}])
+
+    def test_errors_do_not_stop_the_run(self):
+        failed, results = self.run_lines(["add Milk 1 L 2030-01-01", "use Eggs 1", "bogus", "add Milk", "use Milk 1"])
+        self.assertEqual(failed, 3)
+        self.assertEqual([r.get("ok") for r in results[:-1]], [True, False, False, False, True])
+        self.assertIn("not found", results[1]["error"])
+        self.assertEqual(results[4]["line"], 5)
+
+    def test_read_only_run_does_not_save(self):
+        failed, results = self.run_lines(["show", "low", "expired"])
+        self.assertEqual(failed, 0)
+        self.assertFalse(results[-1]["summary"]["saved"])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_main_with_command_file(self):
+        commands = os.path.join(self.tmpdir.name, "commands.txt")
+        with open(commands, "w") as f:
+            f.write("add Jam 1 jar 2030-01-01\nuse Jam 2\n")
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as out, \
+                unittest.mock.patch("sys.stderr", new_callable=io.StringIO):
+            status = app.main(["--inventory", self.path, "--batch", commands, "-c", "add Ham 1 kg 2030-01-01"])
+        self.assertEqual(status, 0)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line.get("cmd") for line in lines], ["add", "add", "use", None])
+        self.assertEqual(lines[2]["result"]["quantity"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
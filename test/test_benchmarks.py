@@ -0,0 +1,55 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from benchmarks import bench_freshfridge as bench
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_generate_rows_is_reproducible(self):
+        rows = bench.generate_rows(200)
+        self.assertEqual(rows, bench.generate_rows(200))
+        self.assertEqual(len(set(name for name, _, _, _ in rows)), 200)
+        self.assertTrue(all(quantity > 0 for _, quantity, _, _ in rows))
+
+    def test_run_benchmarks_structure(self):
+        for backend in ("operations", "sqlite"):
+            result = bench.run_benchmarks(sizes=[50], backend=backend, repeat=1)
+            self.assertEqual(result["backend"], backend)
+            timings = result["results"]["50"]
+            self.assertIn("load_inventory", timings)
+            self.assertIn("generate_shopping_list", timings)
+            self.assertGreaterEqual(timings["check_expiring"]["seconds"], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"10": {"add_item": {"seconds": 1.0}, "use_item": {"seconds": 1.0}}}}
+        current = {"results": {"10": {"add_item": {"seconds": 1.1}, "use_item": {"seconds": 2.0}}}}
+        regressions = bench.compare(current, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("use_item", regressions[0])
+
+    def test_main_fails_on_regression(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(bench.main(["--sizes", "20", "--repeat", "1", "--save-baseline", path]), 0)
+            with open(path) as f:
+                baseline = json.load(f)
+            for timing in baseline["results"]["20"].values():
+                timing["seconds"] = 1e-12
+            with open(path, "w") as f:
+                json.dump(baseline, f)
+            with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()) as err:
+                self.assertEqual(bench.main(["--sizes", "20", "--repeat", "1", "--baseline", path]), 1)
+            self.assertIn("REGRESSION", err.getvalue())
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
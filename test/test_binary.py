@@ -0,0 +1,109 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from freshfridge.inventory import binary
+from freshfridge.inventory.binary import MappedInventory
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.inventory.persistence import InventoryPersistence
+
+
+def days_from_today(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class TestBinarySnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "inventory.ffb")
+        self.inventory = InventoryOperations()
+        self.inventory.add_item("Milk", 2, "L", days_from_today(2))
+        self.inventory.add_item("Eggs", 12, "pcs", days_from_today(30))
+        self.inventory.add_item("Crème fraîche", 0.5, "tub", days_from_today(-1))
+        self.inventory.add_item("Butter", 1, "pcs", days_from_today(2))
+        InventoryPersistence.save_inventory(self.inventory, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_queries_match_in_memory_inventory(self):
+        mapped = InventoryPersistence.open_binary(self.path)
+        try:
+            self.assertTrue(mapped.mapped)
+            self.assertEqual(len(mapped), 4)
+            self.assertEqual(list(mapped.iter_records()), list(self.inventory.iter_records()))
+            self.assertEqual(
+                [i.name for i in mapped.expiring_within(3)],
+                [i.name for i in self.inventory.expiring_within(3)],
+            )
+            self.assertEqual([i.name for i in mapped.expired_items()], ["Crème fraîche"])
+            self.assertEqual(list(mapped.iter_by_expiry()), list(self.inventory.iter_by_expiry()))
+            thresholds = {"Eggs": 6, "Milk": 3, "Butter": 2, "Apple": 1}
+            self.assertEqual(mapped.below_thresholds(thresholds), self.inventory.below_thresholds(thresholds))
+            self.assertEqual(mapped.total_quantity(), self.inventory.total_quantity())
+            self.assertEqual(mapped.get_item("Crème fraîche").unit, "tub")
+            self.assertIsNone(mapped.get_item("Apple"))
+            self.assertEqual(sorted(mapped.items), sorted(self.inventory.items))
+        finally:
+            mapped.close()
+
+    def test_first_change_copies_items_into_memory(self):
+        mapped = MappedInventory(self.path)
+        result = mapped.use_items([("Milk", 1), ("Apple", 1)])
+        self.assertEqual(len(result.errors), 1)
+        self.assertFalse(mapped.mapped)
+        self.assertEqual(mapped.get_item("Milk").quantity, 1)
+        mapped.add_item("Jam", 1, "jar", days_from_today(1))
+        self.assertEqual(
+            [i.name for i in mapped.expiring_within(3)],
+            ["Crème fraîche", "Jam", "Butter", "Milk"],
+        )
+        mapped.close()  # nothing left to release
+        self.assertEqual(len(mapped), 5)
+
+    def test_load_into_other_inventory_and_convert(self):
+        loaded = InventoryOperations()
+        InventoryPersistence.load_inventory(loaded, self.path)
+        self.assertEqual(list(loaded.iter_records()), list(self.inventory.iter_records()))
+
+        json_path = os.path.join(self.tmpdir, "inventory.json")
+        back_path = os.path.join(self.tmpdir, "back.ffb")
+        self.assertEqual(InventoryPersistence.convert(self.path, json_path), 4)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(binary.main(["to-binary", json_path, back_path]), 0)
+        with open(self.path, "rb") as a, open(back_path, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_empty_inventory(self):
+        InventoryPersistence.save_inventory(InventoryOperations(), self.path)
+        mapped = MappedInventory(self.path)
+        self.assertEqual((len(mapped), mapped.total_quantity(), mapped.expired_items()), (0, 0, []))
+        mapped.close()
+
+    def test_without_numpy(self):
+        with patch.object(binary, "np", None):
+            mapped = MappedInventory(self.path)
+            self.assertEqual(mapped.total_quantity(), 15.5)
+            mapped.close()
+
+    def test_invalid_files(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data[:-3])
+        with self.assertRaises(ValueError):
+            MappedInventory(self.path)
+        with open(self.path, "wb") as f:
+            f.write(b"{}" * 20)
+        with self.assertRaises(ValueError):
+            MappedInventory(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from freshfridge.alerts.expiry import ExpiryAlerts
+from freshfridge.alerts.lowstock import LowStockAlerts
+from freshfridge.inventory import columnar
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.items import FreshItem, InvalidExpiryDateError
+from freshfridge.reporting.shopping_list import ShoppingListReport
+from freshfridge.reporting.summary import SummaryReport
+
+
+def days_from_today(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class TestColumnarInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = ColumnarInventory()
+        self.inventory.add_item("Milk", 2, "L", days_from_today(2))
+        self.inventory.add_item("Eggs", 12, "pcs", days_from_today(30))
+        self.inventory.add_item("Butter", 1, "pack", days_from_today(-1))
+
+    def test_public_api_matches_inventory_operations(self):
+        self.assertEqual(len(self.inventory), 3)
+        self.assertIn("Milk", self.inventory.items)
+        milk = self.inventory.items["Milk"]
+        self.assertIsInstance(milk, FreshItem)
+        self.assertEqual((milk.quantity, milk.unit), (2, "L"))
+
+        self.inventory.use_item("Milk", 5)
+        self.assertEqual(self.inventory.items["Milk"].quantity, 0)
+
+        self.inventory.remove_item("Milk")
+        self.assertNotIn("Milk", self.inventory.items)
+        self.assertEqual(sorted(i.name for i in self.inventory.list_items()), ["Butter", "Eggs"])
+
+    def test_items_view_is_cached_and_read_only(self):
+        view = self.inventory.items
+        self.assertIs(self.inventory.items, view)
+        with self.assertRaises(TypeError):
+            view["Tea"] = FreshItem("Tea", 1, "box", days_from_today(9))
+        self.inventory.use_item("Milk", 1)
+        self.assertIsNot(self.inventory.items, view)
+        self.assertEqual(self.inventory.items["Milk"].quantity, 1)
+        self.assertIn("Milk", self.inventory)
+        self.assertNotIn("Tea", self.inventory)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            self.inventory.add_item("Cheese", 0, "block", days_from_today(3))
+        with self.assertRaises(InvalidExpiryDateError):
+            self.inventory.add_item("Cheese", 1, "block", "soon")
+
+    def test_remove_keeps_other_rows_intact(self):
+        self.inventory.remove_item("Milk")  # the last row moves into slot 0
+        self.assertEqual(self.inventory.items["Butter"].unit, "pack")
+        self.inventory.use_item("Butter", 1)
+        self.assertEqual(self.inventory.items["Butter"].quantity, 0)
+
+    def test_version_changes_without_listeners(self):
+        versions = [self.inventory.version]
+        self.inventory.use_item("Milk", 1)
+        versions.append(self.inventory.version)
+        self.inventory.use_items([("Milk", 1)])
+        versions.append(self.inventory.version)
+        self.inventory.remove_items(["Eggs"])
+        versions.append(self.inventory.version)
+        self.assertEqual(sorted(set(versions)), versions)
+
+    def test_changes_tracked_without_listeners(self):
+        self.inventory.mark_clean()
+        self.inventory.use_item("Milk", 1)
+        self.inventory.remove_items(["Eggs"])
+        self.inventory.add_items([("Jam", 1, "jar", days_from_today(5))])
+        self.assertEqual(self.inventory.changes(), ({"Milk", "Jam"}, {"Eggs"}))
+
+    def test_bulk_operations(self):
+        result = self.inventory.add_items([("Jam", 1, "jar", days_from_today(5)), ("Milk", 4, "L", days_from_today(1))])
+        self.assertEqual(result.applied, 2)
+        self.assertEqual(self.inventory.items["Milk"].quantity, 4)
+        result = self.inventory.use_items([("Milk", 1), ("Tea", 1)])
+        self.assertEqual((result.applied, len(result.errors)), (1, 1))
+        self.assertEqual(self.inventory.items["Milk"].quantity, 3)
+        self.assertEqual(self.inventory.remove_items(["Milk", "Jam"]).applied, 2)
+        self.assertEqual(len(self.inventory), 2)
+
+    def check_queries(self):
+        expiring = ExpiryAlerts().check_expiring(self.inventory, within_days=3)
+        self.assertEqual([i.name for i in expiring], ["Butter", "Milk"])
+        expired = ExpiryAlerts().mark_expired(self.inventory)
+        self.assertEqual([i.name for i in expired], ["Butter"])
+
+        thresholds = {"Milk": 3, "Eggs": 6, "Apple": 1}
+        self.assertEqual(
+            LowStockAlerts().low_stock_alert(self.inventory, thresholds),
+            [("Milk", 2, 3)],
+        )
+        shopping = ShoppingListReport(self.inventory).generate_shopping_list(thresholds)
+        self.assertEqual(shopping, [{"name": "Milk", "current_qty": 2, "needed": 1}])
+        self.assertEqual(SummaryReport(self.inventory).get_total_quantity(), 15)
+        self.assertEqual([r[0] for r in self.inventory.iter_by_expiry()], ["Butter", "Milk", "Eggs"])
+
+    def test_queries(self):
+        self.check_queries()
+
+    def test_total_quantity_is_exact(self):
+        inventory = ColumnarInventory()
+        for name, quantity in (("a", 0.1), ("b", 0.2), ("c", 0.3)):
+            inventory.add_item(name, quantity, "kg", days_from_today(5))
+        self.assertEqual(inventory.total_quantity(), 0.6)
+        inventory.set_quantity("c", 0.7)
+        inventory.add_item("b", 0.4, "kg", days_from_today(5))
+        inventory.use_item("a", 0.05)
+        inventory.remove_items(["b", "c"])
+        self.assertEqual(inventory.total_quantity(), 0.05)
+        inventory.items = {}
+        self.assertEqual(inventory.total_quantity(), 0)
+
+    def test_queries_without_numpy(self):
+        with patch.object(columnar, "np", None):
+            self.check_queries()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from freshfridge.alerts.expiry import ExpiryAlerts
+from freshfridge.alerts.lowstock import LowStockAlerts
+from freshfridge.inventory.concurrent import ConcurrentInventory
+from freshfridge.reporting.summary import SummaryReport
+
+
+def days_from_today(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def run_threads(target, count=8):
+    errors = []
+
+    def wrapper(index):
+        try:
+            target(index)
+        except Exception as e:  # collected so the test can report it
+            errors.append(e)
+
+    threads = [threading.Thread(target=wrapper, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class TestConcurrentInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = ConcurrentInventory(stripes=4)
+        self.inventory.add_item("Milk", 10000, "mL", days_from_today(2))
+
+    def test_use_item_is_atomic(self):
+        def consume(_):
+            for _ in range(1000):
+                self.inventory.use_item("Milk", 1)
+
+        self.assertEqual(run_threads(consume), [])
+        self.assertEqual(self.inventory.get_item("Milk").quantity, 2000)
+
+    def test_queries_while_writing(self):
+        done = threading.Event()
+
+        def work(index):
+            if index % 2:
+                for i in range(300):
+                    name = f"Item{index}-{i}"
+                    self.inventory.add_item(name, 1, "pcs", days_from_today(i % 5))
+                    self.inventory.remove_item(name)
+                done.set()
+            else:
+                while not done.is_set():
+                    ExpiryAlerts().check_expiring(self.inventory, within_days=3)
+                    LowStockAlerts().low_stock_alert(self.inventory, {"Milk": 1})
+                    SummaryReport(self.inventory).request_summary()
+                    SummaryReport(self.inventory).get_total_quantity()
+
+        self.assertEqual(run_threads(work), [])
+        self.assertEqual(list(self.inventory.items), ["Milk"])
+        self.assertEqual([i.name for i in self.inventory.expiring_within(10)], ["Milk"])
+
+    def test_changes_are_tracked_under_one_lock(self):
+        self.inventory.mark_clean()
+        version = self.inventory.version
+
+        def work(index):
+            for i in range(500):
+                self.inventory.add_item(f"Item{index}-{i}", 1, "pcs", days_from_today(3))
+                if i % 2:
+                    self.inventory.remove_item(f"Item{index}-{i}")
+
+        self.assertEqual(run_threads(work), [])
+        self.assertEqual(self.inventory.version, version + 8 * 750)
+        dirty, removed = self.inventory.changes()
+        self.assertEqual((len(dirty), len(removed)), (8 * 250, 8 * 250))
+
+    def test_listeners_run_outside_item_locks(self):
+        inventory = ConcurrentInventory(stripes=1)
+        inventory.add_item("Milk", 2, "L", days_from_today(2))
+
+        def restock(op, item, amount):
+            if op == "use" and item.quantity == 0:
+                inventory.add_item("Milk (new)", 2, "L", days_from_today(9))
+
+        inventory.subscribe(restock)
+        inventory.use_item("Milk", 2)  # would deadlock on the only stripe lock
+        self.assertIn("Milk (new)", inventory)
+
+    def test_total_quantity_is_exact(self):
+        def work(index):
+            for i in range(100):
+                self.inventory.add_item(f"Item{index}-{i}", 0.1, "g", days_from_today(3))
+                self.inventory.set_quantity(f"Item{index}-{i}", 0.7)
+                self.inventory.use_item(f"Item{index}-{i}", 0.3)
+            for i in range(100):
+                self.inventory.remove_item(f"Item{index}-{i}")
+
+        self.assertEqual(run_threads(work), [])
+        self.assertEqual(self.inventory.total_quantity(), 10000)
+
+    def test_items_is_a_snapshot(self):
+        snapshot = self.inventory.items
+        self.inventory.add_item("Eggs", 12, "pcs", days_from_today(9))
+        self.assertNotIn("Eggs", snapshot)
+        self.inventory.items = {}
+        self.assertEqual(len(self.inventory), 0)
+        self.assertEqual(self.inventory.expiring_within(30), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
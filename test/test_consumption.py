@@ -0,0 +1,101 @@
+import math
+import unittest
+from datetime import datetime, timedelta
+
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.reporting.consumption import ConsumptionTracker
+
+START = datetime(2026, 3, 1)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, days):
+        self.now += timedelta(days=days)
+
+
+class TestConsumptionTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock(START)
+        self.inventory = InventoryOperations()
+        self.inventory.add_item("Milk", 10, "L", "2026-03-20")
+        self.inventory.add_item("Eggs", 12, "pcs", "2026-03-05")
+        self.tracker = ConsumptionTracker(self.inventory, half_life_days=7, capacity=4, clock=self.clock)
+
+    def use_daily(self, name, amount, days):
+        for _ in range(days):
+            self.clock.advance(1)
+            self.inventory.use_item(name, amount)
+
+    def test_steady_rate(self):
+        self.use_daily("Milk", 0.5, 20)
+        self.assertAlmostEqual(self.tracker.rate("Milk"), 0.5, delta=0.05)
+        self.assertEqual(self.tracker.rate("Eggs"), 0.0)
+        self.assertEqual(self.tracker.rate("Butter"), 0.0)
+
+    def test_rate_decays_without_uses(self):
+        self.use_daily("Milk", 0.5, 10)
+        before = self.tracker.rate("Milk")
+        later = self.tracker.rate("Milk", now=self.clock.now + timedelta(days=7))
+        self.assertLess(later, before)
+
+    def test_ring_buffer_keeps_latest_uses(self):
+        for amount in (1, 2, 3, 4, 5, 6):
+            self.clock.advance(1)
+            self.tracker.record_use("Milk", amount)
+        history = self.tracker.history("Milk")
+        self.assertEqual([amount for _, amount in history], [3, 4, 5, 6])
+        self.assertEqual(history[-1][0], self.clock.now)
+        self.assertEqual(self.tracker.history("Eggs"), [])
+
+    def test_forecast(self):
+        self.use_daily("Milk", 1, 4)  # 6 L left, about 1 L a day
+        rows = {row[0]: row for row in self.tracker.forecast()}
+        _, quantity, unit, rate, stockout, expiry = rows["Milk"]
+        self.assertEqual((quantity, unit), (6, "L"))
+        self.assertAlmostEqual(stockout, quantity / rate)
+        self.assertEqual(expiry, 15)
+        self.assertTrue(math.isinf(rows["Eggs"][4]))
+        self.assertEqual(rows["Eggs"][5], 0)
+
+    def test_due_within(self):
+        self.use_daily("Milk", 1, 4)
+        self.use_daily("Eggs", 3, 2)  # 6 eggs left, expires today
+        due = self.tracker.due_within(7)
+        self.assertEqual([row[0] for row in due], ["Eggs"])
+        self.assertEqual([row[0] for row in self.tracker.due_within(30)], ["Eggs", "Milk"])
+
+    def test_new_items_and_detach(self):
+        self.clock.advance(10)
+        self.inventory.add_item("Butter", 2, "pack", "2026-04-01")
+        self.clock.advance(1)
+        self.inventory.use_item("Butter", 1)
+        # observed for one day since it was added, not since the tracker started
+        self.assertAlmostEqual(self.tracker.rate("Butter"), 1, delta=0.1)
+        self.tracker.detach()
+        self.inventory.use_item("Butter", 1)
+        self.assertEqual(len(self.tracker.history("Butter")), 1)
+
+    def test_columnar_backend(self):
+        inventory = ColumnarInventory()
+        inventory.add_item("Milk", 10, "L", "2026-03-20")
+        tracker = ConsumptionTracker(inventory, clock=self.clock)
+        self.clock.advance(2)
+        inventory.use_item("Milk", 2)
+        self.assertEqual(tracker.history("Milk"), [(self.clock.now, 2)])
+        self.assertEqual(tracker.version, 1)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            ConsumptionTracker(self.inventory, half_life_days=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
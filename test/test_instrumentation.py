@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from freshfridge import instrumentation
+from freshfridge.alerts.expiry import ExpiryAlerts
+from freshfridge.inventory import operations
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.items import expiry_to_ordinal
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.inventory.persistence import InventoryPersistence
+from freshfridge.reporting.shopping_list import ShoppingListReport
+
+
+def days_from_today(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+        self.inventory = InventoryOperations()
+        self.inventory.add_item("Milk", 2, "L", days_from_today(2))
+        self.inventory.add_item("Eggs", 12, "pcs", days_from_today(30))
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled_leaves_methods_untouched(self):
+        original = InventoryOperations.add_item
+        instrumentation.enable()
+        self.assertIsNot(InventoryOperations.add_item, original)
+        instrumentation.disable()
+        self.assertIs(InventoryOperations.add_item, original)
+        self.assertIs(operations.expiry_to_ordinal, expiry_to_ordinal)
+        self.inventory.use_item("Milk", 1)
+        self.assertEqual(instrumentation.snapshot()["metrics"], {})
+
+    def test_enabled_flag_and_cache_methods(self):
+        class Quiet:
+            def _private(self):
+                pass
+
+        instrumentation.enable(classes=[Quiet])
+        self.assertTrue(instrumentation.enabled())
+        instrumentation.disable()
+        self.assertFalse(instrumentation.enabled())
+
+        instrumentation.enable()
+        self.assertIsNot(operations.expiry_to_ordinal, expiry_to_ordinal)
+        operations.expiry_to_ordinal.cache_clear()
+        operations.expiry_to_ordinal("2026-01-01")
+        self.assertEqual(operations.expiry_to_ordinal.cache_info().currsize, 1)
+
+    def test_records_calls_items_and_errors(self):
+        instrumentation.enable()
+        self.assertTrue(instrumentation.enabled())
+        self.inventory.add_item("Jam", 1, "jar", days_from_today(5))
+        with self.assertRaises(ValueError):
+            self.inventory.add_item("Tea", 0, "box", days_from_today(5))
+        expiring = ExpiryAlerts().check_expiring(self.inventory, within_days=3)
+        ShoppingListReport(self.inventory).generate_shopping_list({"Milk": 5})
+        columnar = ColumnarInventory()
+        columnar.add_items([("Jam", 1, "jar", days_from_today(5))])
+
+        metrics = instrumentation.snapshot()["metrics"]
+        self.assertEqual(metrics["InventoryOperations.add_item"]["calls"], 2)
+        self.assertEqual(metrics["InventoryOperations.add_item"]["errors"], 1)
+        self.assertEqual(metrics["ExpiryAlerts.check_expiring"]["items"], len(expiring))
+        self.assertEqual(metrics["ShoppingListReport.generate_shopping_list"]["items"], 1)
+        self.assertEqual(metrics["InventoryOperations.add_items"]["items"], 1)
+        self.assertGreaterEqual(metrics["expiry_to_ordinal"]["calls"], 1)
+        add = metrics["InventoryOperations.add_item"]
+        self.assertEqual(add["buckets"]["+Inf"], add["calls"])
+
+    def test_persistence_and_generators(self):
+        instrumentation.enable()
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            InventoryPersistence.save_inventory(self.inventory, path)
+            entries = list(InventoryPersistence.iter_entries(path))
+        finally:
+            os.remove(path)
+        metrics = instrumentation.snapshot()["metrics"]
+        self.assertEqual(metrics["InventoryPersistence.save_inventory"]["calls"], 1)
+        self.assertEqual(metrics["InventoryPersistence.iter_entries"]["items"], len(entries))
+
+    def test_dumps(self):
+        instrumentation.enable()
+        self.inventory.use_item("Milk", 1)
+        data = json.loads(instrumentation.to_json())
+        self.assertEqual(data["metrics"]["InventoryOperations.use_item"]["calls"], 1)
+        text = instrumentation.to_prometheus()
+        self.assertIn("# TYPE freshfridge_call_seconds histogram", text)
+        self.assertIn('freshfridge_call_seconds_count{function="InventoryOperations.use_item"} 1', text)
+        self.assertIn('le="+Inf"', text)
+
+    def test_profile_block(self):
+        with instrumentation.profile_block("shop", memory=True, top=5):
+            ShoppingListReport(self.inventory).generate_shopping_list({"Milk": 5})
+        result = instrumentation.snapshot()["profiles"]["shop"]
+        self.assertIn("generate_shopping_list", result["cprofile"])
+        self.assertGreater(result["peak_bytes"], 0)
+        self.assertLessEqual(len(result["top_allocations"]), 5)
+        self.assertEqual(instrumentation.snapshot()["metrics"]["block.shop"]["calls"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 
 from datetime import datetime, timedelta
-from freshfridge.inventory.items import FreshItem
+from freshfridge.inventory.items import FreshItem, InvalidExpiryDateError
 
 class TestFreshItem(unittest.TestCase):
 
@@ -57,6 +57,27 @@ class TestFreshItem(unittest.TestCase):
         # within 3 days → False
         self.assertFalse(cheese.is_expiring_within(3))
 
+    def test_slots_and_ordinal_storage(self):
+        self.assertFalse(hasattr(self.item, "__dict__"))
+        self.assertEqual(self.item.expiry_ordinal, datetime(2025, 12, 18).toordinal())
+        self.assertEqual(self.item.expiry_date, datetime(2025, 12, 18))
+
+    def test_from_ordinal(self):
+        item = FreshItem.from_ordinal("Milk", 2, "L", self.item.expiry_ordinal)
+        self.assertEqual(item.expiry_date, self.item.expiry_date)
+        self.assertEqual((item.name, item.quantity, item.unit), ("Milk", 2, "L"))
+
+    def test_expiry_date_is_read_only(self):
+        with self.assertRaises(AttributeError):
+            self.item.expiry_date = datetime(2026, 1, 2)
+
+    def test_expiry_date_parsing(self):
+        # non zero-padded dates are still accepted, as with strptime
+        self.assertEqual(FreshItem("Jam", 1, "jar", "2025-1-5").expiry_date, datetime(2025, 1, 5))
+        for bad in ("2025/12/18", "2025-13-01", "2025-02-30", "tomorrow"):
+            with self.assertRaises(InvalidExpiryDateError):
+                FreshItem("Jam", 1, "jar", bad)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,120 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from freshfridge.alerts.thresholds import ThresholdStore
+from freshfridge.inventory.journal import InventoryJournal
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.inventory.persistence import InventoryPersistence
+
+
+class TestInventoryJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.snapshot = os.path.join(self.tmpdir, "inventory.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def reopen(self):
+        inventory = InventoryOperations()
+        journal = InventoryJournal(inventory, self.snapshot).open()
+        journal.close()
+        return InventoryPersistence.inventory_to_dict(inventory)
+
+    def test_changes_survive_without_a_save(self):
+        inventory = InventoryOperations()
+        journal = InventoryJournal(inventory, self.snapshot, commit_every=2).open()
+        inventory.add_item("Milk", 2, "L", "2025-12-18")
+        inventory.add_item("Eggs", 12, "pcs", "2025-12-20")
+        inventory.use_item("Eggs", 5)
+        inventory.remove_item("Milk")
+        journal.commit()
+        # simulate a crash: the journal is never closed and nothing is saved
+        self.assertFalse(os.path.exists(self.snapshot))
+        state = self.reopen()
+        self.assertEqual(state, {"Eggs": {"quantity": 7, "unit": "pcs", "expiry_date": "2025-12-20"}})
+        journal.close()
+
+    def test_compaction_writes_snapshot_and_trims_log(self):
+        inventory = InventoryOperations()
+        with InventoryJournal(inventory, self.snapshot, commit_every=1, compact_every=3) as journal:
+            for i in range(10):
+                inventory.add_item(f"Item{i}", i + 1, "pcs", "2025-12-18")
+            journal.compact()
+            with open(journal.log_path) as f:
+                self.assertEqual(f.read(), "")
+        with open(self.snapshot) as f:
+            self.assertEqual(len(json.load(f)), 10)
+        self.assertEqual(len(self.reopen()), 10)
+
+    def test_thresholds_are_journaled(self):
+        inventory, store = InventoryOperations(), ThresholdStore()
+        journal = InventoryJournal(inventory, self.snapshot, commit_every=1, thresholds=store).open()
+        inventory.add_item("Milk", 2, "L", "2025-12-18")
+        store.set_item("Milk", 3)
+        store.set_category("dairy", 1)
+        journal.commit()
+        restored = ThresholdStore()
+        InventoryJournal(InventoryOperations(), self.snapshot, thresholds=restored).open().close()
+        self.assertEqual(restored.to_dict(), {"items": {"Milk": 3}, "categories": {"dairy": 1}})
+        journal.compact()
+        journal.close()
+        with open(self.snapshot) as f:
+            self.assertEqual(json.load(f)["__thresholds__"], store.to_dict())
+
+    def test_replay_is_idempotent(self):
+        inventory = InventoryOperations()
+        with InventoryJournal(inventory, self.snapshot):
+            inventory.add_item("Milk", 2, "L", "2025-12-18")
+            inventory.use_item("Milk", 0.5)
+        log_path = self.snapshot + ".log"
+        restored = InventoryOperations()
+        InventoryJournal.replay(restored, log_path)
+        InventoryJournal.replay(restored, log_path)
+        self.assertEqual(restored.items["Milk"].quantity, 1.5)
+
+    def test_torn_record_is_truncated(self):
+        log_path = self.snapshot + ".log"
+        with open(log_path, "w") as f:
+            f.write('["a","Milk",2,"L","2025-12-18"]\n["q","Mi')
+        inventory = InventoryOperations()
+        with InventoryJournal(inventory, self.snapshot, commit_every=1):
+            inventory.use_item("Milk", 1)
+        self.assertEqual(self.reopen()["Milk"]["quantity"], 1)
+
+    def test_failed_snapshot_is_raised_and_keeps_the_log(self):
+        inventory = InventoryOperations()
+        journal = InventoryJournal(inventory, self.snapshot, commit_every=1).open()
+        inventory.add_item("Milk", 2, "L", "2025-12-18")
+        with patch.object(InventoryPersistence, "save_inventory", side_effect=OSError("disk full")):
+            with self.assertLogs("freshfridge.inventory.journal", "ERROR"):
+                with self.assertRaises(OSError):
+                    journal.compact()
+        self.assertTrue(os.path.exists(journal.log_path + ".old"))
+        inventory.add_item("Eggs", 12, "pcs", "2025-12-20")
+        journal.compact()  # the background thread is still running
+        journal.close()
+        self.assertFalse(os.path.exists(journal.log_path + ".old"))
+        self.assertEqual(sorted(self.reopen()), ["Eggs", "Milk"])
+
+    def test_snapshot_supersedes_delta_saves(self):
+        inventory = InventoryOperations()
+        inventory.add_item("Milk", 2, "L", "2025-12-18")
+        InventoryPersistence.save_inventory(inventory, self.snapshot)
+        inventory.use_item("Milk", 1)
+        InventoryPersistence.save_delta(inventory, self.snapshot)
+        inventory = InventoryOperations()
+        with InventoryJournal(inventory, self.snapshot) as journal:
+            inventory.use_item("Milk", 0.5)
+            journal.compact()
+        self.assertFalse(os.path.exists(self.snapshot + ".delta"))
+        self.assertEqual(self.reopen()["Milk"]["quantity"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
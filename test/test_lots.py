@@ -0,0 +1,180 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from freshfridge.alerts.expiry import ExpiryAlerts
+from freshfridge.inventory.items import FreshItem
+from freshfridge.inventory.journal import InventoryJournal
+from freshfridge.inventory.lots import LotInventory
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.inventory.persistence import InventoryPersistence
+from freshfridge.reporting.summary import SummaryReport
+
+
+def days_from_today(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class TestLotInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = LotInventory()
+        self.inventory.add_item("Milk", 1, "L", days_from_today(10))
+        self.inventory.add_item("Milk", 2, "L", days_from_today(2))
+        self.inventory.add_item("Eggs", 12, "pcs", days_from_today(30))
+
+    def test_lots_are_kept_and_aggregated(self):
+        milk = self.inventory.get_item("Milk")
+        self.assertEqual(milk.quantity, 3)
+        self.assertEqual(milk.expiry_ordinal, datetime.today().toordinal() + 2)
+        self.assertEqual([lot.quantity for lot in self.inventory.lots("Milk")], [2, 1])
+        self.assertEqual(self.inventory.lot_count(), 3)
+        self.assertEqual(len(self.inventory), 2)
+        self.assertEqual(self.inventory.total_quantity(), 15)
+        self.assertEqual(SummaryReport(self.inventory).request_summary()[0]["quantity"], 3)
+
+    def test_use_item_is_first_expired_first_out(self):
+        self.inventory.use_item("Milk", 2.5)
+        self.assertEqual([(lot.quantity, lot.expiry_ordinal) for lot in self.inventory.lots("Milk")],
+                         [(0.5, datetime.today().toordinal() + 10)])
+        milk = self.inventory.get_item("Milk")
+        self.assertEqual(milk.quantity, 0.5)
+        self.assertEqual((milk.expiry_date - datetime.today()).days, 9)
+
+        self.inventory.use_item("Milk", 5)  # the last lot stays, empty
+        self.assertEqual([lot.quantity for lot in self.inventory.lots("Milk")], [0])
+        self.assertEqual(self.inventory.get_item("Milk").quantity, 0)
+        self.inventory.add_item("Milk", 4, "L", days_from_today(5))
+        self.assertEqual([lot.quantity for lot in self.inventory.lots("Milk")], [4])
+        self.assertEqual(self.inventory.total_quantity(), 16)
+
+    def test_expiry_alerts_are_per_lot(self):
+        self.inventory.add_item("Milk", 1, "L", days_from_today(-1))
+        expiring = ExpiryAlerts().check_expiring(self.inventory, within_days=3)
+        self.assertEqual([(i.name, i.quantity) for i in expiring], [("Milk", 1), ("Milk", 2)])
+        expired = ExpiryAlerts().mark_expired(self.inventory)
+        self.assertEqual(len(expired), 1)
+        self.assertEqual([r[0] for r in self.inventory.iter_lots()], ["Milk", "Milk", "Milk", "Eggs"])
+        self.assertEqual([r[0] for r in self.inventory.iter_by_expiry()], ["Milk", "Eggs"])
+
+    def test_set_quantity(self):
+        self.inventory.set_quantity("Milk", 5)
+        self.assertEqual([lot.quantity for lot in self.inventory.lots("Milk")], [2, 3])
+        self.inventory.set_quantity("Milk", 1)
+        self.assertEqual([lot.quantity for lot in self.inventory.lots("Milk")], [1])
+        self.assertEqual(self.inventory.total_quantity(), 13)
+
+    def test_remove_and_bulk(self):
+        result = self.inventory.add_items([("Jam", 1, "jar", days_from_today(1)), ("Jam", 1, "jar", days_from_today(4))])
+        self.assertEqual((result.applied, self.inventory.get_item("Jam").quantity), (2, 2))
+        self.inventory.use_items([("Jam", 1)])
+        self.assertEqual(self.inventory.lots("Jam")[0].expiry_ordinal, datetime.today().toordinal() + 4)
+        self.inventory.remove_item("Milk")
+        self.assertEqual(self.inventory.remove_items(["Jam"]).applied, 1)
+        self.assertEqual(self.inventory.lot_count(), 1)
+        self.assertEqual([i.name for i in self.inventory.expiring_within(60)], ["Eggs"])
+        self.assertEqual(self.inventory.total_quantity(), 12)
+
+    def test_set_expiry_merges_lots(self):
+        self.inventory.set_expiry("Milk", days_from_today(20))
+        self.assertEqual([lot.quantity for lot in self.inventory.lots("Milk")], [3])
+        self.assertEqual(self.inventory.lot_count(), 2)
+        self.assertEqual([i.name for i in self.inventory.expiring_within(35)], ["Milk", "Eggs"])
+        self.assertEqual(self.inventory.total_quantity(), 15)
+
+    def test_bulk_add_notifies_after_indexing(self):
+        seen = []
+        self.inventory.subscribe(lambda op, item, amount: seen.append(len(self.inventory.expiring_within(5))))
+        self.inventory.add_items([("Jam", 1, "jar", days_from_today(1)), ("Jam", 1, "jar", days_from_today(3))])
+        self.assertEqual(seen, [3, 3])
+
+    def test_items_assignment(self):
+        self.inventory.items = {"Tea": FreshItem("Tea", 1, "box", days_from_today(100))}
+        self.assertEqual(self.inventory.lot_count(), 1)
+        self.assertEqual([i.name for i in self.inventory.expiring_within(365)], ["Tea"])
+        self.inventory.add_item("Tea", 1, "box", days_from_today(50))
+        self.assertEqual(self.inventory.get_item("Tea").quantity, 2)
+
+    def test_expiry_heap_stays_compact(self):
+        for day in range(2000):
+            self.inventory.add_item("Jam", 1, "jar", days_from_today(day % 40))
+            self.inventory.use_item("Jam", 1)
+        self.assertEqual(self.inventory.lot_count(), 4)
+        self.assertLessEqual(len(self.inventory._expiry_index), 2 * self.inventory.lot_count() + 64)
+        expiring = self.inventory.expiring_within(5)
+        self.assertEqual([(i.name, i.quantity) for i in expiring], [("Milk", 2)])
+        self.assertEqual([r[0] for r in self.inventory.iter_lots()], ["Milk", "Milk", "Eggs", "Jam"])
+
+
+
+class TestLotPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.inventory = LotInventory()
+        self.inventory.add_item("Milk", 1, "L", days_from_today(1))
+        self.inventory.add_item("Milk", 2, "L", days_from_today(10))
+        self.inventory.add_item("Eggs", 12, "pcs", days_from_today(30))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def lots(self, inventory):
+        return sorted(inventory.iter_lots())
+
+    def test_round_trip_keeps_lots(self):
+        for file_name in ("inv.json", "inv.jsonl", "inv.ffb", "inv.parts"):
+            path = os.path.join(self.tmpdir, file_name)
+            InventoryPersistence.save_inventory(self.inventory, path)
+            loaded = LotInventory()
+            InventoryPersistence.load_inventory(loaded, path)
+            self.assertEqual(self.lots(loaded), self.lots(self.inventory), file_name)
+        path = os.path.join(self.tmpdir, "inv.json")
+        InventoryPersistence.save_inventory(self.inventory, path, streaming=True)
+        loaded = LotInventory()
+        InventoryPersistence.load_inventory(loaded, path, streaming=True)
+        self.assertEqual(self.lots(loaded), self.lots(self.inventory))
+        converted = os.path.join(self.tmpdir, "converted.jsonl")
+        InventoryPersistence.convert(path, converted)
+        loaded = LotInventory()
+        InventoryPersistence.load_inventory(loaded, converted)
+        self.assertEqual(self.lots(loaded), self.lots(self.inventory))
+
+    def test_other_backends_load_the_aggregate(self):
+        path = os.path.join(self.tmpdir, "inv.json")
+        InventoryPersistence.save_inventory(self.inventory, path)
+        loaded = InventoryOperations()
+        InventoryPersistence.load_inventory(loaded, path)
+        self.assertEqual(sorted(loaded.iter_records()), sorted(self.inventory.iter_records()))
+
+    def test_delta_save_keeps_lots(self):
+        path = os.path.join(self.tmpdir, "inv.json")
+        InventoryPersistence.save_inventory(self.inventory, path)
+        self.inventory.add_item("Milk", 3, "L", days_from_today(20))
+        self.inventory.use_item("Milk", 0.5)
+        InventoryPersistence.save_delta(self.inventory, path, compact_ratio=10)
+        self.assertTrue(os.path.exists(path + ".delta"))
+        loaded = LotInventory()
+        InventoryPersistence.load_inventory(loaded, path)
+        self.assertEqual(self.lots(loaded), self.lots(self.inventory))
+        self.assertEqual([lot.quantity for lot in loaded.lots("Milk")], [0.5, 2, 3])
+
+    def test_journal_replay_keeps_lots(self):
+        path = os.path.join(self.tmpdir, "inv.json")
+        with InventoryJournal(LotInventory(), path) as journal:
+            journal.inventory.add_item("Milk", 1, "L", days_from_today(1))
+            journal.inventory.add_item("Milk", 2, "L", days_from_today(10))
+            journal.inventory.use_item("Milk", 0.5)
+            expected = self.lots(journal.inventory)
+            journal.compact()
+            journal.inventory.add_item("Milk", 4, "L", days_from_today(5))
+            expected = self.lots(journal.inventory)
+        loaded = LotInventory()
+        with InventoryJournal(loaded, path):
+            self.assertEqual(self.lots(loaded), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
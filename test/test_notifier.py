@@ -0,0 +1,112 @@
+import json
+import os
+import queue
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from freshfridge.alerts.expiry import ExpiryAlerts
+from freshfridge.alerts.notifier import EXPIRED, EXPIRING, ExpiryNotifier, FileSink
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.lots import LotInventory
+from freshfridge.inventory.operations import InventoryOperations
+
+
+def days_from_today(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def at(days, hour=12):
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today + timedelta(days=days, hours=hour)
+
+
+class TestExpiryNotifier(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = InventoryOperations()
+        self.inventory.add_item("Milk", 2, "L", days_from_today(5))
+        self.inventory.add_item("Eggs", 12, "pcs", days_from_today(30))
+        self.notifier = ExpiryNotifier(self.inventory, within_days=3)
+        self.events = []
+        self.notifier.subscribe(self.events.append)
+
+    def tearDown(self):
+        self.notifier.detach()
+
+    def kinds(self, events):
+        return [(event.kind, event.name) for event in events]
+
+    def test_events_fire_at_boundaries(self):
+        self.assertEqual(self.notifier.poll(at(0)), [])
+        self.assertEqual(self.notifier.next_boundary(), at(1, hour=0))
+        self.assertEqual(self.kinds(self.notifier.poll(at(1))), [(EXPIRING, "Milk")])
+        self.assertEqual(self.notifier.poll(at(2)), [])  # fires once
+        self.assertEqual(self.kinds(self.notifier.poll(at(5))), [(EXPIRED, "Milk")])
+        self.assertEqual(self.kinds(self.events), [(EXPIRING, "Milk"), (EXPIRED, "Milk")])
+
+    def test_boundaries_match_expiry_alerts(self):
+        for days in range(0, 8):
+            now = at(days)
+            events = self.notifier.poll(now)
+            alerted = [i.name for i in self.inventory.expiring_within(3, now)]
+            for event in events:
+                if event.kind == EXPIRING:
+                    self.assertIn(event.name, alerted)
+                else:
+                    self.assertIn(event.name, [i.name for i in self.inventory.expired_items(now)])
+
+    def test_follows_inventory_changes(self):
+        self.inventory.add_item("Jam", 1, "jar", days_from_today(1))
+        self.inventory.add_item("Milk", 2, "L", days_from_today(60))   # new expiry date
+        self.inventory.remove_item("Eggs")
+        self.assertEqual(self.kinds(self.notifier.poll(at(0))), [(EXPIRING, "Jam")])
+        self.assertEqual(self.kinds(self.notifier.poll(at(40))), [(EXPIRED, "Jam")])
+        self.inventory.items = {}
+        self.assertIsNone(self.notifier.next_boundary())
+
+    def test_lot_consumption_moves_the_boundary(self):
+        lots = LotInventory()
+        notifier = ExpiryNotifier(lots, within_days=0)
+        lots.add_item("Milk", 1, "L", days_from_today(2))
+        lots.add_item("Milk", 1, "L", days_from_today(9))
+        lots.use_item("Milk", 1)
+        self.assertEqual(notifier.poll(at(3)), [])
+        self.assertEqual(self.kinds(notifier.poll(at(9))), [(EXPIRING, "Milk"), (EXPIRED, "Milk")])
+        notifier.detach()
+
+    def test_queue_and_file_sinks(self):
+        events = queue.Queue()
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        try:
+            self.notifier.subscribe(events)
+            self.notifier.subscribe(FileSink(path))
+            self.notifier.poll(at(40))
+            self.assertEqual(events.qsize(), 4)
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+        finally:
+            os.remove(path)
+        self.assertEqual(lines[0]["kind"], EXPIRING)
+        self.assertEqual(lines[0]["expiry_date"], days_from_today(5))
+
+    def test_background_thread(self):
+        inventory = ColumnarInventory()
+        notifier = ExpiryNotifier(inventory, within_days=3)
+        events = queue.Queue()
+        notifier.subscribe(events)
+        notifier.start()
+        try:
+            inventory.add_item("Butter", 1, "pack", days_from_today(-1))
+            first = events.get(timeout=5)
+            second = events.get(timeout=5)
+        finally:
+            notifier.detach()
+        self.assertEqual({first.kind, second.kind}, {EXPIRING, EXPIRED})
+        self.assertEqual(ExpiryAlerts().mark_expired(inventory)[0].name, first.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -58,6 +58,202 @@ class TestInventoryOperations(unittest.TestCase):
         self.assertIsInstance(items[0], FreshItem)
         self.assertEqual(items[0].name, "Eggs")
 
+    def test_expiring_within_uses_index_order(self):
+        today = datetime.today()
+        soon = (today + timedelta(days=2)).strftime("%Y-%m-%d")
+        sooner = (today + timedelta(days=1)).strftime("%Y-%m-%d")
+        self.inventory.add_item("Milk", 1, "L", soon)
+        self.inventory.add_item("Cream", 1, "cup", sooner)
+
+        names = [item.name for item in self.inventory.expiring_within(3)]
+        self.assertEqual(names, ["Cream", "Milk"])
+
+        # overwriting an item moves its index entry
+        later = (today + timedelta(days=20)).strftime("%Y-%m-%d")
+        self.inventory.add_item("Cream", 1, "cup", later)
+        names = [item.name for item in self.inventory.expiring_within(3)]
+        self.assertEqual(names, ["Milk"])
+
+        self.inventory.remove_item("Milk")
+        self.assertEqual(self.inventory.expiring_within(3), [])
+
+    def test_set_expiry_moves_index_entry(self):
+        today = datetime.today()
+        self.inventory.add_item("Milk", 1, "L", (today + timedelta(days=2)).strftime("%Y-%m-%d"))
+        self.inventory.set_expiry("Eggs", (today + timedelta(days=1)).strftime("%Y-%m-%d"))
+        names = [item.name for item in self.inventory.expiring_within(3)]
+        self.assertEqual(names, ["Eggs", "Milk"])
+        self.assertEqual(self.inventory.items["Eggs"].quantity, 12)
+
+        self.inventory.set_expiry("Eggs", (today + timedelta(days=20)).strftime("%Y-%m-%d"))
+        names = [item.name for item in self.inventory.expiring_within(3)]
+        self.assertEqual(names, ["Milk"])
+        self.assertEqual(self.inventory.total_quantity(), 13)
+
+    def test_expired_items(self):
+        yesterday = (datetime.today() - timedelta(days=1)).strftime("%Y-%m-%d")
+        self.inventory.add_item("Old Milk", 1, "L", yesterday)
+        expired = self.inventory.expired_items()
+        self.assertEqual([item.name for item in expired], ["Old Milk"])
+
+    def test_add_items(self):
+        today = datetime.today()
+        soon = (today + timedelta(days=1)).strftime("%Y-%m-%d")
+        later = (today + timedelta(days=9)).strftime("%Y-%m-%d")
+        result = self.inventory.add_items([
+            ("Milk", 1, "L", later),
+            ("Cream", 1, "cup", soon),
+            ("Milk", 2, "L", soon),
+        ])
+        self.assertEqual(result.applied, 3)
+        self.assertTrue(result.ok)
+        self.assertEqual(self.inventory.items["Milk"].quantity, 2)
+        names = [item.name for item in self.inventory.expiring_within(5)]
+        self.assertEqual(names, ["Cream", "Milk"])
+
+    def test_add_items_notifies_after_indexing(self):
+        soon = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+        seen = []
+        self.inventory.subscribe(
+            lambda op, item, amount: seen.append([i.name for i in self.inventory.expiring_within(3)])
+        )
+        self.inventory.add_items([("Milk", 1, "L", soon), ("Cream", 1, "cup", soon)])
+        self.assertEqual(seen, [["Cream", "Milk"], ["Cream", "Milk"]])
+
+    def test_add_items_reports_bad_rows(self):
+        soon = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+        rows = [("Milk", 1, "L", soon), ("Tea", 0, "box", soon), ("Jam", 1, "jar", "soon"), ("bad",)]
+        result = self.inventory.add_items(rows, atomic=True)
+        self.assertEqual(result.applied, 0)
+        self.assertNotIn("Milk", self.inventory.items)
+
+        result = self.inventory.add_items(rows)
+        self.assertEqual(result.applied, 1)
+        self.assertEqual([index for index, _, _ in result.errors], [1, 2, 3])
+        self.assertIsInstance(result.errors[2][2], ValueError)
+        self.assertIn("Milk", self.inventory.items)
+
+    def test_add_items_columns(self):
+        soon = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+        result = self.inventory.add_items(
+            names=["Milk", "Cream"], quantities=[1, 2], units=["L", "cup"], expiry_dates=[soon, soon]
+        )
+        self.assertEqual(result.applied, 2)
+        self.assertEqual(self.inventory.items["Cream"].quantity, 2)
+        with self.assertRaises(ValueError):
+            self.inventory.add_items(names=["Milk"], quantities=[1, 2], units=["L"], expiry_dates=[soon])
+
+    def test_use_items(self):
+        result = self.inventory.use_items([("Eggs", 2), ("Milk", 1), ("Eggs", -1), ("Eggs", 3)])
+        self.assertEqual(result.applied, 2)
+        self.assertEqual([(index, name) for index, name, _ in result.errors], [(1, "Milk"), (2, "Eggs")])
+        self.assertEqual(self.inventory.items["Eggs"].quantity, 7)
+
+        result = self.inventory.use_items(names=["Eggs", "Milk"], quantities=[1, 1], atomic=True)
+        self.assertEqual(result.applied, 0)
+        self.assertEqual(self.inventory.items["Eggs"].quantity, 7)
+
+    def test_remove_items(self):
+        soon = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+        self.inventory.add_item("Milk", 1, "L", soon)
+        result = self.inventory.remove_items(["Milk", "Tea", "Eggs"], atomic=True)
+        self.assertEqual(result.applied, 0)
+
+        result = self.inventory.remove_items(["Milk", "Tea", "Eggs"])
+        self.assertEqual(result.applied, 2)
+        self.assertEqual(result.errors[0][1], "Tea")
+        self.assertEqual(len(self.inventory), 0)
+        self.assertEqual(self.inventory.expiring_within(5), [])
+
+    def test_remove_items_ignores_duplicates(self):
+        soon = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+        self.inventory.add_item("Milk", 1, "L", soon)
+        result = self.inventory.remove_items(["Milk", "Eggs", "Milk"], atomic=True)
+        self.assertEqual((result.applied, result.errors), (2, []))
+        self.assertEqual(len(self.inventory), 0)
+
+    def test_subscribe_reports_changes(self):
+        events = []
+        listener = lambda op, item, amount: events.append((op, item and item.name, amount))
+        self.inventory.subscribe(listener)
+        self.inventory.use_item("Eggs", 20)
+        self.inventory.set_quantity("Eggs", 3)
+        self.inventory.remove_item("Eggs")
+        self.inventory.use_item("Eggs", 1)  # missing items are not reported
+        self.inventory.unsubscribe(listener)
+        self.inventory.remove_item("Eggs")
+        self.assertEqual(events, [("use", "Eggs", 12), ("set", "Eggs", None), ("remove", "Eggs", None)])
+
+    def test_get_item(self):
+        self.assertEqual(self.inventory.get_item("Eggs").quantity, 12)
+        self.assertIsNone(self.inventory.get_item("Milk"))
+
+    def test_iter_by_expiry(self):
+        soon = (datetime.today() + timedelta(days=2)).strftime("%Y-%m-%d")
+        self.inventory.add_item("Milk", 2, "L", soon)
+        self.inventory.add_item("Butter", 1, "pack", soon)
+        self.assertEqual([r[0] for r in self.inventory.iter_by_expiry()], ["Butter", "Milk", "Eggs"])
+        self.assertEqual(next(self.inventory.iter_by_expiry())[1:3], (1, "pack"))
+
+    def test_version_and_running_total(self):
+        future = (datetime.today() + timedelta(days=5)).strftime("%Y-%m-%d")
+        version = self.inventory.version
+        steps = [
+            lambda: self.inventory.add_item("Milk", 2, "L", future),
+            lambda: self.inventory.add_item("Eggs", 6, "pcs", future),   # replaces 12
+            lambda: self.inventory.use_item("Milk", 5),                  # only 2 used
+            lambda: self.inventory.set_quantity("Eggs", 4),
+            lambda: self.inventory.add_items([("Jam", 1, "jar", future), ("Tea", 3, "box", future)]),
+            lambda: self.inventory.remove_items(["Tea"]),
+            lambda: self.inventory.remove_item("Jam"),
+        ]
+        for step in steps:
+            step()
+            self.assertGreater(self.inventory.version, version)
+            version = self.inventory.version
+            self.assertEqual(
+                self.inventory.total_quantity(),
+                sum(item.quantity for item in self.inventory.list_items()),
+            )
+        self.inventory.items = {"Old Milk": FreshItem("Old Milk", 1, "L", future)}
+        self.assertGreater(self.inventory.version, version)
+        self.assertEqual(self.inventory.total_quantity(), 1)
+
+    def test_running_total_does_not_drift(self):
+        inventory = InventoryOperations()
+        future = (datetime.today() + timedelta(days=5)).strftime("%Y-%m-%d")
+        for name, quantity in (("a", 0.1), ("b", 0.2), ("c", 0.3)):
+            inventory.add_item(name, quantity, "kg", future)
+        self.assertEqual(inventory.total_quantity(), 0.6)
+        inventory.remove_item("c")
+        inventory.remove_item("b")
+        self.assertEqual(inventory.total_quantity(), 0.1)
+        inventory.remove_item("a")
+        self.assertEqual(inventory.total_quantity(), 0)
+
+    def test_changes_are_tracked(self):
+        future = (datetime.today() + timedelta(days=5)).strftime("%Y-%m-%d")
+        self.inventory.add_item("Milk", 2, "L", future)
+        self.inventory.mark_clean("inventory.json")
+        self.inventory.add_item("Jam", 1, "jar", future)
+        self.inventory.use_item("Milk", 1)
+        self.inventory.remove_item("Eggs")
+        self.inventory.add_item("Tea", 1, "box", future)
+        self.inventory.remove_items(["Tea"])
+        self.assertEqual(self.inventory.changes(), ({"Jam", "Milk"}, {"Eggs", "Tea"}))
+        self.assertEqual(self.inventory.synced_path, "inventory.json")
+        self.inventory.add_item("Eggs", 6, "pcs", future)
+        self.assertEqual(self.inventory.changes(), ({"Jam", "Milk", "Eggs"}, {"Tea"}))
+        self.inventory.items = {}
+        self.assertEqual(self.inventory.changes(), (set(), set()))
+        self.assertIsNone(self.inventory.synced_path)
+
+    def test_items_assignment_rebuilds_index(self):
+        yesterday = (datetime.today() - timedelta(days=1)).strftime("%Y-%m-%d")
+        self.inventory.items = {"Old Milk": FreshItem("Old Milk", 1, "L", yesterday)}
+        self.assertEqual(len(self.inventory.expired_items()), 1)
+        self.assertEqual(self.inventory.expiring_within(365)[0].name, "Old Milk")
+
 
 if __name__ == "__main__":
     unittest.main()
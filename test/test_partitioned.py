@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from freshfridge.alerts.thresholds import ThresholdStore
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.concurrent import ConcurrentInventory
+from freshfridge.inventory.lots import LotInventory
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.inventory.partitioned import (
+    decode_part,
+    load_partitioned,
+    partition_of,
+    read_manifest,
+    save_partitioned,
+)
+from freshfridge.inventory.persistence import InventoryPersistence
+from freshfridge.inventory.sqlite_store import SQLiteInventory
+
+
+def build_inventory(count=50):
+    inv = InventoryOperations()
+    inv.add_items([(f"item{i}", i + 1, "pcs" if i % 2 else "g", f"2026-01-{i % 28 + 1:02d}") for i in range(count)])
+    inv.add_item("Milk", 2, "L", "2025-12-18")
+    inv.use_item("Milk", 2)  # used up items are kept with quantity 0
+    return inv
+
+
+class TestPartitioned(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "inventory.parts")
+        self.inventory = build_inventory()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_save_writes_parts_and_manifest(self):
+        manifest = save_partitioned(self.inventory, self.path, partitions=4)
+        self.assertEqual(manifest, read_manifest(self.path))
+        self.assertEqual(manifest["items"], 51)
+        self.assertEqual(len(manifest["parts"]), 4)
+        for number, part in enumerate(manifest["parts"]):
+            names = decode_part(os.path.join(self.path, part["file"]))[0]
+            self.assertEqual(len(names), part["items"])
+            self.assertTrue(all(partition_of(name, 4) == number for name in names))
+
+    def test_decode_part_is_columnar(self):
+        save_partitioned(self.inventory, self.path, partitions=1)
+        names, quantities, expiry, codes, units, lots = decode_part(os.path.join(self.path, "part-00000.jsonl"))
+        self.assertEqual(len(names), 51)
+        self.assertEqual(quantities.typecode, "d")
+        self.assertEqual(expiry.typecode, "i")
+        self.assertEqual(sorted(units), ["L", "g", "pcs"])
+        milk = names.index("Milk")
+        self.assertEqual(quantities[milk], 0)
+        self.assertEqual(units[codes[milk]], "L")
+        self.assertEqual(lots, {})
+
+    def test_roundtrip_inline_and_in_processes(self):
+        save_partitioned(self.inventory, self.path, partitions=3)
+        expected = sorted(self.inventory.iter_records())
+        for processes in (0, 2):
+            for factory in (InventoryOperations, ColumnarInventory):
+                inv = factory()
+                self.assertEqual(load_partitioned(inv, self.path, processes=processes), 51)
+                self.assertEqual(sorted(inv.iter_records()), expected)
+                self.assertEqual(inv.changes(), (set(), set()))
+
+    def test_every_backend_loads_parts(self):
+        lots = LotInventory()
+        lots.add_item("Eggs", 6, "pcs", "2026-02-01")
+        lots.add_item("Eggs", 12, "pcs", "2026-02-15")
+        lots.add_item("Tea", 1, "box", "2027-01-01")
+        lots.add_item("Milk", 2, "L", "2025-12-18")
+        lots.use_item("Milk", 2)
+        save_partitioned(lots, self.path, partitions=2)
+        expected = sorted(lots.iter_records())
+        for factory in (ColumnarInventory, SQLiteInventory, ConcurrentInventory, LotInventory):
+            inv = factory()
+            self.assertEqual(load_partitioned(inv, self.path, processes=0), 3)
+            self.assertEqual(sorted(inv.iter_records()), expected)
+        self.assertEqual([lot.quantity for lot in inv.lots("Eggs")], [6, 12])
+
+    def test_resave_drops_unused_parts(self):
+        save_partitioned(self.inventory, self.path, partitions=8)
+        save_partitioned(self.inventory, self.path, partitions=2)
+        self.assertEqual(sorted(os.listdir(self.path)), ["manifest.json", "part-00000.jsonl", "part-00001.jsonl"])
+
+    def test_thresholds_in_manifest(self):
+        store = ThresholdStore(items={"Milk": 1}, default=3)
+        save_partitioned(self.inventory, self.path, thresholds=store)
+        loaded = ThresholdStore()
+        load_partitioned(InventoryOperations(), self.path, processes=0, thresholds=loaded)
+        self.assertEqual(loaded.to_dict(), store.to_dict())
+
+    def test_invalid_part(self):
+        save_partitioned(self.inventory, self.path, partitions=1)
+        with open(os.path.join(self.path, "part-00000.jsonl"), "a") as f:
+            f.write('{"name": "Bad", "quantity": -1, "unit": "g", "expiry_date": "2026-01-01"}\n')
+        with self.assertRaises(ValueError):
+            load_partitioned(InventoryOperations(), self.path, processes=0)
+
+    def test_unsupported_manifest(self):
+        os.makedirs(self.path)
+        with open(os.path.join(self.path, "manifest.json"), "w") as f:
+            json.dump({"format": "something-else"}, f)
+        with self.assertRaises(ValueError):
+            read_manifest(self.path)
+
+    def test_persistence_detects_partitioned(self):
+        InventoryPersistence.save_inventory(self.inventory, self.path)
+        self.assertTrue(os.path.isdir(self.path))
+        inv = InventoryOperations()
+        InventoryPersistence.load_inventory(inv, self.path)
+        self.assertEqual(sorted(inv.iter_records()), sorted(self.inventory.iter_records()))
+        self.assertIsNone(inv.synced_path)
+
+        dst = os.path.join(self.tmpdir, "inventory.jsonl")
+        self.assertEqual(InventoryPersistence.convert(self.path, dst), 51)
+        inv = InventoryOperations()
+        InventoryPersistence.load_inventory(inv, dst)
+        self.assertEqual(sorted(inv.iter_records()), sorted(self.inventory.iter_records()))
+
+    def test_load_missing_directory(self):
+        inv = InventoryOperations()
+        InventoryPersistence.load_inventory(inv, self.path)
+        self.assertEqual(len(inv), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
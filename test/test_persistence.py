@@ -1,9 +1,14 @@
+import io
+import json
 import os
+import shutil
 import tempfile
 import unittest
+from unittest.mock import patch
 
+from freshfridge.alerts.thresholds import ThresholdStore
 from freshfridge.inventory.operations import InventoryOperations
-from freshfridge.inventory.persistence import InventoryPersistence
+from freshfridge.inventory.persistence import InventoryPersistence, _iter_object_members
 
 
 def build_sample_inventory() -> InventoryOperations:
@@ -70,6 +75,175 @@ class TestInventoryPersistence(unittest.TestCase):
         InventoryPersistence.load_inventory(new_inventory, path)
         self.assertEqual(len(new_inventory.items), 0)
 
+    def roundtrip(self, suffix, **kwargs):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        try:
+            InventoryPersistence.save_inventory(self.inventory, path, **kwargs)
+            new_inventory = InventoryOperations()
+            InventoryPersistence.load_inventory(new_inventory, path, batch_size=1, **kwargs)
+            with open(path) as f:
+                content = f.read()
+        finally:
+            os.remove(path)
+        self.assertEqual(
+            InventoryPersistence.inventory_to_dict(new_inventory),
+            InventoryPersistence.inventory_to_dict(self.inventory),
+        )
+        return content
+
+    def test_streaming_json_roundtrip(self):
+        content = self.roundtrip(".json", streaming=True)
+        self.assertNotIn("\n", content)
+        self.assertEqual(json.loads(content)["Milk"]["expiry_date"], "2025-12-18")
+
+    def test_jsonl_roundtrip(self):
+        content = self.roundtrip(".jsonl")
+        lines = content.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["name"], "Milk")
+
+    def test_thresholds_saved_with_inventory(self):
+        store = ThresholdStore(items={"Milk": 3}, categories={"dairy": 1}, item_categories={"Eggs": "dairy"})
+        for suffix, streaming in ((".json", False), (".json", True), (".jsonl", False), (".ffb", False)):
+            fd, path = tempfile.mkstemp(suffix=suffix)
+            os.close(fd)
+            try:
+                InventoryPersistence.save_inventory(self.inventory, path, streaming=streaming, thresholds=store)
+                loaded, restored = InventoryOperations(), ThresholdStore()
+                InventoryPersistence.load_inventory(loaded, path, streaming=streaming, thresholds=restored)
+                plain = InventoryOperations()
+                InventoryPersistence.load_inventory(plain, path, streaming=streaming)
+                converted = path + ".jsonl"
+                InventoryPersistence.convert(path, converted)
+                via_convert = ThresholdStore()
+                InventoryPersistence.load_inventory(InventoryOperations(), converted, thresholds=via_convert)
+                os.remove(converted)
+            finally:
+                os.remove(path)
+            self.assertEqual(restored.to_dict(), store.to_dict())
+            self.assertEqual(via_convert.to_dict(), store.to_dict())
+            self.assertEqual(sorted(plain.items), ["Eggs", "Milk"])
+            self.assertEqual(loaded.get_item("Eggs").quantity, 12)
+
+    def test_delta_saves(self):
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, "inventory.json")
+        delta_path = path + ".delta"
+        try:
+            InventoryPersistence.save_inventory(self.inventory, path)
+            with open(path) as f:
+                base = f.read()
+            inventory = InventoryOperations()
+            InventoryPersistence.load_inventory(inventory, path)
+            inventory.use_item("Eggs", 12)           # used up: quantity 0
+            inventory.remove_item("Milk")
+            inventory.add_item("Jam", 1, "jar", "2026-01-01")
+            store = ThresholdStore(items={"Jam": 2})
+            self.assertEqual(InventoryPersistence.save_delta(inventory, path, thresholds=store, compact_ratio=10), 4)
+            self.assertEqual(InventoryPersistence.save_delta(inventory, path, compact_ratio=10), 0)
+            with open(path) as f:
+                self.assertEqual(f.read(), base)   # only the patch was written
+            with open(delta_path) as f:
+                self.assertEqual(len(f.read().splitlines()), 4)
+
+            loaded, restored = InventoryOperations(), ThresholdStore()
+            InventoryPersistence.load_inventory(loaded, path, thresholds=restored)
+            self.assertEqual(InventoryPersistence.inventory_to_dict(loaded), InventoryPersistence.inventory_to_dict(inventory))
+            self.assertEqual(restored.to_dict(), store.to_dict())
+
+            # A patch larger than compact_ratio times the file is folded in
+            loaded.set_quantity("Jam", 3)
+            self.assertEqual(InventoryPersistence.save_delta(loaded, path, compact_ratio=0.01), 2)
+            self.assertFalse(os.path.exists(delta_path))
+
+            # An inventory not loaded from or saved to the file gets a full save
+            other = os.path.join(tmpdir, "other.json")
+            InventoryPersistence.save_delta(loaded, other)
+            InventoryPersistence.save_delta(self.inventory, other)
+            self.assertFalse(os.path.exists(other + ".delta"))
+            with open(other) as f:
+                self.assertEqual(sorted(json.load(f)), ["Eggs", "Milk"])
+            self.assertEqual(loaded.synced_path, os.path.abspath(other))
+            InventoryPersistence.save_inventory(loaded, path)
+
+            loaded.add_item("Tea", 1, "box", "2026-01-01")
+            InventoryPersistence.save_delta(loaded, path, compact_ratio=10)
+            self.assertTrue(InventoryPersistence.compact(InventoryOperations, path))
+            self.assertFalse(InventoryPersistence.compact(InventoryOperations, path))
+            final = InventoryOperations()
+            InventoryPersistence.load_inventory(final, path)
+            self.assertEqual(sorted(final.items), ["Eggs", "Jam", "Tea"])
+            self.assertEqual(final.get_item("Eggs").quantity, 0)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_delta_save_writes_changed_thresholds_only(self):
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, "inventory.json")
+        try:
+            store = ThresholdStore(items={"Milk": 3})
+            InventoryPersistence.save_inventory(self.inventory, path, thresholds=store)
+            inventory, restored = InventoryOperations(), ThresholdStore()
+            InventoryPersistence.load_inventory(inventory, path, thresholds=restored)
+            self.assertEqual(restored.synced_path, os.path.abspath(path))
+            for _ in range(3):
+                inventory.use_item("Eggs", 1)
+                self.assertEqual(InventoryPersistence.save_delta(inventory, path, thresholds=restored, compact_ratio=10), 1)
+            restored.set_item("Eggs", 6)
+            self.assertIsNone(restored.synced_path)
+            self.assertEqual(InventoryPersistence.save_delta(inventory, path, thresholds=restored, compact_ratio=10), 1)
+            self.assertEqual(InventoryPersistence.save_delta(inventory, path, thresholds=restored, compact_ratio=10), 0)
+            with open(path + ".delta") as f:
+                self.assertEqual([json.loads(line)[0] for line in f], ["a", "a", "a", "t"])
+            reloaded = ThresholdStore()
+            InventoryPersistence.load_inventory(InventoryOperations(), path, thresholds=reloaded)
+            self.assertEqual(reloaded.to_dict(), restored.to_dict())
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_convert_streams_between_formats(self):
+        tmpdir = tempfile.mkdtemp()
+        src = os.path.join(tmpdir, "inventory.json")
+        try:
+            store = ThresholdStore(items={"Milk": 3})
+            InventoryPersistence.save_inventory(self.inventory, src, thresholds=store)
+            with patch("freshfridge.inventory.persistence.RecordSnapshot", side_effect=AssertionError):
+                for name in ("copy.jsonl", "copy.ffb", "copy.json"):
+                    dst = os.path.join(tmpdir, name)
+                    self.assertEqual(InventoryPersistence.convert(src, dst), 2)
+                    loaded, restored = InventoryOperations(), ThresholdStore()
+                    InventoryPersistence.load_inventory(loaded, dst, thresholds=restored)
+                    self.assertEqual(InventoryPersistence.inventory_to_dict(loaded), InventoryPersistence.inventory_to_dict(self.inventory))
+                    self.assertEqual(restored.to_dict(), store.to_dict())
+                    src = dst
+
+            # A bad entry part-way through leaves no half-written file
+            with open(src, "w") as f:
+                f.write('{"Milk": {"quantity": 1, "unit": "L", "expiry_date": "2026-01-01"}, "Bad": {"quantity": 1}}')
+            dst = os.path.join(tmpdir, "bad.jsonl")
+            with self.assertRaises(KeyError):
+                InventoryPersistence.convert(src, dst)
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["copy.ffb", "copy.json", "copy.jsonl", "inventory.json"])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_iter_object_members_small_chunks(self):
+        text = ' { "a" : {"x": [1, 2]}, "b":12345 ,"c": "}" } '
+        members = list(_iter_object_members(io.StringIO(text), chunk_size=3))
+        self.assertEqual(members, [("a", {"x": [1, 2]}), ("b", 12345), ("c", "}")])
+        self.assertEqual(list(_iter_object_members(io.StringIO("{}"))), [])
+
+    def test_streaming_load_invalid_json(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            f.write('{"Milk": {"quantity": 2, "unit": "L", "expiry_date": "2025-12-18"}')
+        try:
+            with self.assertRaises(ValueError):
+                InventoryPersistence.load_inventory(InventoryOperations(), path, streaming=True)
+        finally:
+            os.remove(path)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from freshfridge.alerts.thresholds import ThresholdStore
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.sharded import ShardedInventory
+from freshfridge.reporting.summary import SummaryReport
+
+
+def days_from_today(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class TestShardedInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.fridges = ShardedInventory(self.tmpdir)
+        kitchen = self.fridges.shard("kitchen")
+        kitchen.add_item("Milk", 2, "L", days_from_today(2))
+        kitchen.add_item("Eggs", 12, "pcs", days_from_today(30))
+        garage = self.fridges.shard("garage")
+        garage.add_item("Milk", 3, "L", days_from_today(1))
+        garage.add_item("Butter", 1, "pack", days_from_today(-1))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_shards(self):
+        self.assertEqual(self.fridges.locations(), ["garage", "kitchen"])
+        self.assertIn("kitchen", self.fridges)
+        self.assertIs(self.fridges["kitchen"], self.fridges.shard("kitchen"))
+        self.assertEqual(len(self.fridges), 2)
+        self.assertEqual(self.fridges.total_quantity(), 18)
+        self.assertEqual(len(self.fridges.remove_shard("garage")), 2)
+        self.assertEqual(list(self.fridges), ["kitchen"])
+
+    def test_save_and_load_in_parallel(self):
+        self.fridges.save()
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir, "garage.json")))
+        loaded = ShardedInventory(self.tmpdir, factory=ColumnarInventory)
+        self.assertEqual(sorted(loaded.load()), ["garage", "kitchen"])
+        self.assertIsInstance(loaded["kitchen"], ColumnarInventory)
+        self.assertEqual(loaded["garage"].get_item("Butter").quantity, 1)
+        self.assertEqual(ShardedInventory(os.path.join(self.tmpdir, "missing")).load(), [])
+
+    def check_sweep(self, processes):
+        results = {r["location"]: r for r in self.fridges.sweep(3, {"Milk": 2.5}, processes)}
+        self.assertEqual([i.name for i in results["garage"]["expiring"]], ["Butter", "Milk"])
+        self.assertEqual([i.name for i in results["garage"]["expired"]], ["Butter"])
+        self.assertEqual(results["kitchen"]["low_stock"], [("Milk", 2, 2.5)])
+        self.assertEqual(results["garage"]["low_stock"], [])
+
+    def test_sweep_in_process(self):
+        self.check_sweep(processes=0)
+
+    def test_sweep_in_process_pool(self):
+        self.check_sweep(processes=2)
+
+    def test_sweep_with_location_defaults(self):
+        store = ThresholdStore(items={"Eggs": 20}, locations={"garage": 5})
+        results = {r["location"]: r for r in self.fridges.sweep(3, store, processes=0)}
+        self.assertEqual(results["kitchen"]["low_stock"], [("Eggs", 12, 20)])
+        self.assertEqual(results["garage"]["low_stock"], [("Milk", 3, 5), ("Butter", 1, 5)])
+
+    def test_sweep_merged(self):
+        merged = self.fridges.sweep_merged(3, {"Milk": 5}, processes=0)
+        self.assertEqual(
+            [(location, item.name) for location, item in merged["expiring"]],
+            [("garage", "Butter"), ("garage", "Milk"), ("kitchen", "Milk")],
+        )
+        self.assertEqual(merged["low_stock"], [("garage", "Milk", 3, 5), ("kitchen", "Milk", 2, 5)])
+
+    def test_aggregate_summary(self):
+        self.assertEqual(
+            SummaryReport(self.fridges["kitchen"]).quantity_by_item(),
+            {("Milk", "L"): 2, ("Eggs", "pcs"): 12},
+        )
+        self.assertEqual(self.fridges.aggregate_summary(), [
+            {"name": "Butter", "unit": "pack", "quantity": 1, "locations": 1},
+            {"name": "Eggs", "unit": "pcs", "quantity": 12, "locations": 1},
+            {"name": "Milk", "unit": "L", "quantity": 5, "locations": 2},
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
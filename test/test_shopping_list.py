@@ -40,6 +40,37 @@ class TestShoppingListReport(unittest.TestCase):
             self.assertTrue(len(output) > 0)
             self.assertIn("Milk", output)
 
+    def test_iter_shopping_list_pages(self):
+        thresholds = {"Milk": 3, "Butter": 1, "Cheese": 1}
+        pages = self.report.iter_shopping_list(thresholds, sort="name", offset=1, limit=1)
+        self.assertEqual([s["name"] for s in pages], ["Cheese"])
+        by_expiry = self.report.iter_shopping_list(thresholds, sort="expiry")
+        self.assertEqual([s["name"] for s in by_expiry], ["Milk", "Butter", "Cheese"])
+        page = self.report.iter_shopping_list(thresholds, sort="expiry", offset=1, limit=5)
+        self.assertEqual([s["name"] for s in page], ["Butter", "Cheese"])
+        with patch("freshfridge.reporting.shopping_list.sorted", side_effect=AssertionError, create=True):
+            page = self.report.iter_shopping_list(thresholds, sort="name", limit=2)
+            self.assertEqual([s["name"] for s in page], ["Butter", "Cheese"])
+        with self.assertRaises(ValueError):
+            list(self.report.iter_shopping_list(thresholds, sort="price"))
+
+    def test_rejects_non_dictionary_thresholds(self):
+        for thresholds in (["Milk"], "Milk", None, 3):
+            with self.assertRaises(TypeError):
+                self.report.generate_shopping_list(thresholds)
+            with self.assertRaises(TypeError):
+                list(self.report.iter_shopping_list(thresholds))
+
+    def test_export_shopping_list_jsonl(self):
+        import json
+        import os
+        stream = self.report.iter_shopping_list({"Milk": 3, "Butter": 1})
+        self.assertEqual(self.report.export_shopping_list(stream, "temp_shopping.jsonl", fmt="jsonl"), 2)
+        with open("temp_shopping.jsonl") as f:
+            rows = [json.loads(line) for line in f]
+        os.remove("temp_shopping.jsonl")
+        self.assertEqual(rows[0], {"name": "Milk", "current_qty": 2, "needed": 1})
+
     def test_export_shopping_list_writes_file(self):
         thresholds = {"Milk": 3}
         shopping_list = self.report.generate_shopping_list(thresholds)
@@ -53,6 +84,25 @@ class TestShoppingListReport(unittest.TestCase):
         import os
         os.remove("temp_shopping.txt")
 
+    def test_forecast_shopping_list(self):
+        from datetime import datetime, timedelta
+        from freshfridge.reporting.consumption import ConsumptionTracker
+
+        now = datetime(2025, 12, 10)
+        tracker = ConsumptionTracker(self.inventory, clock=lambda: now)
+        for day in range(1, 5):
+            tracker.record_use("Eggs", 2, at=now - timedelta(days=day))
+        tracker.record_use("Milk", 0.1, at=now - timedelta(days=1))
+        shopping_list = self.report.forecast_shopping_list(tracker, horizon_days=7, now=now)
+        self.assertEqual([s["name"] for s in shopping_list], ["Eggs"])
+        eggs = shopping_list[0]
+        self.assertEqual(eggs["reason"], "stockout")
+        self.assertLess(eggs["days_left"], 7)
+        self.assertGreater(eggs["needed"], 0)
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            self.report.display_shopping_list(shopping_list)
+            self.assertIn("Eggs", fake_out.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from freshfridge.alerts.expiry import ExpiryAlerts
+from freshfridge.alerts.lowstock import LowStockAlerts
+from freshfridge.inventory.items import FreshItem
+from freshfridge.inventory.persistence import InventoryPersistence
+from freshfridge.inventory.sqlite_store import SQLiteInventory
+from freshfridge.reporting.shopping_list import ShoppingListReport
+from freshfridge.reporting.summary import SummaryReport
+
+
+def days_from_today(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class TestSQLiteInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = SQLiteInventory()
+        self.inventory.add_item("Milk", 2, "L", days_from_today(2))
+        self.inventory.add_item("Eggs", 12, "pcs", days_from_today(30))
+        self.inventory.add_item("Butter", 1, "pack", days_from_today(-1))
+
+    def tearDown(self):
+        self.inventory.close()
+
+    def test_public_api_matches_inventory_operations(self):
+        self.assertEqual(len(self.inventory), 3)
+        milk = self.inventory.items["Milk"]
+        self.assertIsInstance(milk, FreshItem)
+        self.assertEqual((milk.quantity, milk.unit), (2, "L"))
+
+        self.inventory.use_item("Milk", 5)
+        self.assertEqual(self.inventory.get_item("Milk").quantity, 0)
+
+        self.inventory.add_item("Eggs", 6, "pcs", days_from_today(10))
+        self.assertEqual(self.inventory.get_item("Eggs").quantity, 6)
+
+        self.inventory.remove_item("Milk")
+        self.assertIsNone(self.inventory.get_item("Milk"))
+        self.assertEqual([i.name for i in self.inventory.list_items()], ["Eggs", "Butter"])
+
+    def test_queries(self):
+        expiring = ExpiryAlerts().check_expiring(self.inventory, within_days=3)
+        self.assertEqual([i.name for i in expiring], ["Butter", "Milk"])
+        self.assertEqual([i.name for i in ExpiryAlerts().mark_expired(self.inventory)], ["Butter"])
+
+        thresholds = {"Milk": 3, "Eggs": 6, "Apple": 1}
+        self.assertEqual(LowStockAlerts().low_stock_alert(self.inventory, thresholds), [("Milk", 2, 3)])
+        shopping = ShoppingListReport(self.inventory).generate_shopping_list(thresholds)
+        self.assertEqual(shopping, [{"name": "Milk", "current_qty": 2, "needed": 1}])
+        self.assertEqual(SummaryReport(self.inventory).get_total_quantity(), 15)
+        self.assertEqual([r[0] for r in self.inventory.iter_by_expiry()], ["Butter", "Milk", "Eggs"])
+
+    def test_version_changes_without_listeners(self):
+        versions = [self.inventory.version]
+        self.inventory.use_item("Milk", 1)
+        versions.append(self.inventory.version)
+        self.inventory.use_items([("Milk", 1)])
+        versions.append(self.inventory.version)
+        self.inventory.remove_items(["Eggs"])
+        versions.append(self.inventory.version)
+        self.assertEqual(sorted(set(versions)), versions)
+
+    def test_bulk_operations(self):
+        rows = [("Jam", 1, "jar", days_from_today(5)), ("Tea", 0, "box", days_from_today(5))]
+        self.assertEqual(self.inventory.add_items(rows, atomic=True).applied, 0)
+        self.assertIsNone(self.inventory.get_item("Jam"))
+        self.assertEqual(self.inventory.add_items(rows).applied, 1)
+
+        result = self.inventory.use_items([("Jam", 0.5), ("Eggs", 20), ("Tea", 1)])
+        self.assertEqual((result.applied, result.errors[0][1]), (2, "Tea"))
+        self.assertEqual(self.inventory.get_item("Jam").quantity, 0.5)
+        self.assertEqual(self.inventory.get_item("Eggs").quantity, 0)
+
+        self.assertEqual(self.inventory.remove_items(["Jam", "Eggs"]).applied, 2)
+        self.assertEqual(len(self.inventory), 2)
+
+    def test_file_database_persists(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "inventory.db")
+            inventory = SQLiteInventory(path)
+            inventory.add_item("Milk", 2.5, "L", "2025-12-18")
+            inventory.close()
+
+            reopened = SQLiteInventory(path)
+            self.assertEqual(
+                InventoryPersistence.inventory_to_dict(reopened),
+                {"Milk": {"quantity": 2.5, "unit": "L", "expiry_date": "2025-12-18"}},
+            )
+            reopened.close()
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "script", "freshfridge_app.py")
+
+# Modules that short runs must not import
+HEAVY_MODULES = (
+    "freshfridge.inventory.operations",
+    "freshfridge.inventory.persistence",
+    "freshfridge.reporting.summary",
+    "sqlite3",
+    "asyncio",
+    "concurrent.futures",
+)
+
+# Prints which HEAVY_MODULES are in sys.modules once the code before it ran
+REPORT = "import sys; print(sorted(m for m in {modules!r} if m in sys.modules))"
+
+
+def heavy_modules_after(code):
+    """Run 'code' in a fresh interpreter; return the HEAVY_MODULES it imported and its output."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("FRESHFRIDGE_METRICS", None)
+    script = code + "\n" + REPORT.format(modules=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True, text=True, env=env, cwd=ROOT, check=True,
+    )
+    *output, loaded = result.stdout.rstrip("\n").split("\n")
+    return loaded, "\n".join(output)
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_package_import_is_lazy(self):
+        loaded, _ = heavy_modules_after("import freshfridge.inventory, freshfridge.alerts, freshfridge.reporting")
+        self.assertEqual(loaded, "[]")
+
+    def test_lazy_attributes(self):
+        import freshfridge
+        from freshfridge.inventory import InventoryOperations, MappedInventory
+        from freshfridge.alerts import ExpiryNotifier
+        from freshfridge.reporting import SummaryReport
+        from freshfridge.inventory.binary import MappedInventory as mapped
+
+        self.assertIs(MappedInventory, mapped)
+        self.assertEqual(InventoryOperations.__module__, "freshfridge.inventory.operations")
+        self.assertEqual(ExpiryNotifier.__module__, "freshfridge.alerts.notifier")
+        self.assertEqual(SummaryReport.__module__, "freshfridge.reporting.summary")
+        self.assertIn("reporting", dir(freshfridge))
+        with self.assertRaises(AttributeError):
+            freshfridge.inventory.NoSuchClass
+
+    def test_cli_help_is_lazy(self):
+        loaded, output = heavy_modules_after(
+            "import runpy, sys\n"
+            f"sys.argv = [{APP!r}, '--help']\n"
+            "try:\n"
+            f"    runpy.run_path({APP!r}, run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        self.assertIn("usage: freshfridge", output)
+        self.assertEqual(loaded, "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
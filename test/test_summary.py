@@ -1,3 +1,6 @@
+import csv
+import os
+import tempfile
 import unittest
 from datetime import datetime, timedelta
 from io import StringIO
@@ -57,6 +60,35 @@ class TestSummaryReport(unittest.TestCase):
         self.assertIn("Milk", output)
         self.assertIn("Eggs", output)
 
+    def test_iter_summary_pages(self):
+        first = list(self.report.iter_summary(sort="name", limit=2))
+        self.assertEqual([row["name"] for row in first], ["Apple", "Butter"])
+        second = list(self.report.iter_summary(sort="name", offset=2, limit=2))
+        self.assertEqual([row["name"] for row in second], ["Eggs", "Milk"])
+        self.assertEqual(list(self.report.iter_summary()), self.report.request_summary())
+        self.assertEqual(len(list(self.report.iter_summary(sort="expiry", offset=4))), 1)
+        with self.assertRaises(ValueError):
+            list(self.report.iter_summary(sort="price"))
+
+    def test_export_summary_formats(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "summary.csv")
+            self.assertEqual(self.report.export_summary(path, fmt="csv", sort="name"), 5)
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[0]["name"], "Apple")
+            self.assertEqual(rows[0]["quantity"], "5")
+
+            path = os.path.join(tmpdir, "summary.txt")
+            self.report.export_summary(path)
+            with open(path) as f:
+                self.assertTrue(f.readline().startswith("Milk — 2 L (expires "))
+
+    def test_quantity_by_item(self):
+        totals = self.report.quantity_by_item()
+        self.assertEqual(totals[("Milk", "L")], 2)
+        self.assertEqual(len(totals), 5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+import freshfridge.alerts
+from freshfridge.alerts.lowstock import LowStockAlerts
+from freshfridge.alerts.thresholds import ThresholdRegistry, ThresholdStore
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.inventory.persistence import InventoryPersistence
+from freshfridge.reporting.shopping_list import ShoppingListReport
+
+
+class TestThresholdRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = InventoryOperations()
+        self.inventory.add_item("Milk", 2, "L", "2025-12-18")
+        self.inventory.add_item("Eggs", 12, "pcs", "2025-12-20")
+        self.registry = ThresholdRegistry(self.inventory, {"Milk": 3, "Eggs": 6})
+        self.alerts = LowStockAlerts()
+
+    def test_tracks_quantity_changes(self):
+        self.assertEqual(self.registry.low_items(), [("Milk", 2, 3)])
+        self.inventory.use_item("Eggs", 10)
+        self.inventory.add_item("Milk", 5, "L", "2025-12-18")
+        self.assertEqual(self.alerts.low_stock_alert(self.inventory, self.registry), [("Eggs", 2, 6)])
+        self.inventory.remove_item("Eggs")
+        self.assertEqual(self.registry.low_items(), [])
+
+    def test_tracks_threshold_changes(self):
+        self.alerts.update_thresholds(self.registry, {"Eggs": 20, "Butter": 1})
+        self.assertEqual(sorted(self.registry.low_items()), [("Eggs", 12, 20), ("Milk", 2, 3)])
+        del self.registry["Milk"]
+        self.registry.pop("Eggs")
+        self.assertEqual(self.registry.low_items(), [])
+
+        self.registry["Butter"] = 2
+        self.inventory.add_item("Butter", 1, "pack", "2025-12-30")
+        shopping = ShoppingListReport(self.inventory).generate_shopping_list(self.registry)
+        self.assertEqual(shopping, [{"name": "Butter", "current_qty": 1, "needed": 1}])
+
+    def test_reset_and_other_backends(self):
+        self.inventory.items = {}
+        self.assertEqual(self.registry.low_items(), [])
+        self.registry.detach()
+
+        columnar = ColumnarInventory()
+        registry = ThresholdRegistry(columnar, {"Milk": 3})
+        columnar.add_item("Milk", 1, "L", "2025-12-18")
+        self.assertEqual(registry.low_items(), [("Milk", 1, 3)])
+        # a registry built for another inventory falls back to a normal query
+        self.assertEqual(self.alerts.low_stock_alert(self.inventory, registry), [])
+
+    def test_registry_version_keys_the_report_cache(self):
+        report = ShoppingListReport(self.inventory)
+        version = self.registry.version
+        first = report.generate_shopping_list(self.registry)
+        self.registry["Eggs"] = 20
+        self.assertGreater(self.registry.version, version)
+        self.assertEqual(len(report.generate_shopping_list(self.registry)), len(first) + 1)
+
+    def test_plain_dictionary_still_required(self):
+        with self.assertRaises(TypeError):
+            self.alerts.low_stock_alert(self.inventory, [("Milk", 3)])
+
+
+class TestThresholdStore(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = InventoryOperations()
+        self.inventory.add_item("Milk", 2, "L", "2025-12-18")
+        self.inventory.add_item("Yogurt", 1, "cup", "2025-12-20")
+        self.inventory.add_item("Eggs", 12, "pcs", "2025-12-20")
+        self.store = ThresholdStore(
+            items={"Milk": 3},
+            categories={"dairy": 2},
+            item_categories={"Milk": "dairy", "Yogurt": "dairy"},
+            locations={"garage": 20},
+        )
+
+    def test_resolution_order(self):
+        self.assertEqual(self.store.resolve("Milk"), 3)            # own threshold
+        self.assertEqual(self.store.resolve("Yogurt"), 2)          # category
+        self.assertIsNone(self.store.resolve("Eggs"))
+        self.assertEqual(self.store.resolve("Eggs", "garage"), 20)  # location
+        self.store.default = 13
+        self.assertEqual(self.store.resolve("Eggs"), 13)           # global default
+        self.assertEqual(self.store.resolve("Yogurt", "garage"), 2)
+
+    def test_alerts_and_shopping_list_accept_a_store(self):
+        alerts = LowStockAlerts()
+        self.assertEqual(alerts.low_stock_alert(self.inventory, self.store), [("Milk", 2, 3), ("Yogurt", 1, 2)])
+        report = ShoppingListReport(self.inventory)
+        self.assertEqual(len(report.generate_shopping_list(self.store)), 2)
+        self.store.set_category("dairy", 0.5)
+        self.assertEqual([s["name"] for s in report.generate_shopping_list(self.store)], ["Milk"])
+
+    def test_resolved_thresholds_are_cached(self):
+        self.store.default = 13
+        first = self.store.for_inventory(self.inventory)
+        self.assertEqual(first, {"Milk": 3, "Yogurt": 2, "Eggs": 13})
+        self.assertIs(self.store.for_inventory(self.inventory), first)
+        self.inventory.add_item("Jam", 1, "jar", "2026-01-01")
+        self.assertEqual(self.store.for_inventory(self.inventory)["Jam"], 13)
+        version = self.store.version
+        self.store.discard_item("Milk")
+        self.assertGreater(self.store.version, version)
+        self.assertEqual(self.store.for_inventory(self.inventory)["Milk"], 2)
+
+    def test_round_trip_and_listeners(self):
+        changes = []
+        copy = self.store.copy()
+        copy.subscribe(changes.append)
+        copy.assign_category("Eggs", "dairy")
+        self.assertEqual(changes, [copy])
+        self.assertIsNone(self.store.category_of("Eggs"))
+        self.assertEqual(ThresholdStore.from_dict(copy.to_dict()).to_dict(), copy.to_dict())
+        self.assertFalse(ThresholdStore())
+        self.assertTrue(self.store)
+
+    def test_item_categories_alone_are_kept(self):
+        self.assertIs(freshfridge.alerts.ThresholdStore, ThresholdStore)
+        store = ThresholdStore()
+        store.assign_category("Eggs", "dairy")
+        self.assertTrue(store)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "inventory.json")
+            InventoryPersistence.save_inventory(self.inventory, path)
+            InventoryPersistence.save_delta(self.inventory, path, thresholds=store)
+            self.assertTrue(InventoryPersistence.compact(InventoryOperations, path))
+            restored = ThresholdStore()
+            InventoryPersistence.load_inventory(InventoryOperations(), path, thresholds=restored)
+        self.assertEqual(restored.category_of("Eggs"), "dairy")
+
+
+if __name__ == "__main__":
+    unittest.main()
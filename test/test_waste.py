@@ -0,0 +1,171 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from freshfridge.alerts.expiry import ExpiryAlerts
+from freshfridge.inventory.columnar import ColumnarInventory
+from freshfridge.inventory.lots import LotInventory
+from freshfridge.inventory.operations import InventoryOperations
+from freshfridge.reporting.waste import EXPIRED, REMOVED, WasteLog, WasteReport, previous_quarter
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestWasteLog(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock(datetime(2026, 3, 10, 18, 0))  # a Tuesday
+        self.inventory = InventoryOperations()
+        self.inventory.add_item("Milk", 2, "L", "2026-03-08")
+        self.inventory.add_item("Eggs", 12, "pcs", "2099-03-20")
+        self.inventory.add_item("Butter", 1, "pack", "2099-03-20")
+        self.log = WasteLog(self.inventory, clock=self.clock)
+
+    def test_removals_are_logged(self):
+        self.inventory.remove_item("Milk")
+        self.inventory.use_item("Butter", 1)
+        self.inventory.remove_item("Butter")  # used up, nothing wasted
+        self.inventory.remove_item("Eggs")
+        self.assertEqual(
+            [(e.kind, e.name, e.quantity, e.unit) for e in self.log.events()],
+            [(EXPIRED, "Milk", 2, "L"), (REMOVED, "Eggs", 12, "pcs")],
+        )
+        self.assertEqual(self.log.events()[0].at, self.clock.now)
+
+    def test_mark_expired_logs_once(self):
+        alerts = ExpiryAlerts()
+        self.assertEqual(len(alerts.mark_expired(self.inventory, self.log)), 1)
+        alerts.mark_expired(self.inventory, self.log)
+        self.inventory.remove_item("Milk")
+        self.assertEqual(len(self.log), 1)
+        self.assertEqual(self.log.events()[0].kind, EXPIRED)
+
+    def test_rollups(self):
+        start = datetime(2026, 1, 1, 12)
+        for day in range(90):
+            self.log.record(REMOVED, "Milk", 0.5, "L", at=start + timedelta(days=day))
+            self.log.record(REMOVED, "Eggs", 2, "pcs", at=start + timedelta(days=day))
+        self.assertEqual(self.log.totals("2026-01-01", "2026-04-01"), {("Milk", "L"): 45, ("Eggs", "pcs"): 180})
+        self.assertEqual(self.log.totals(date(2026, 1, 5), date(2026, 1, 12), by="unit"), {"L": 3.5, "pcs": 14})
+        self.assertEqual(self.log.totals("2026-01-03", "2026-01-04", by="unit"), {"L": 0.5, "pcs": 2})
+        weekly = self.log.rollup("week")
+        self.assertEqual(weekly[(date(2026, 1, 5), "L")], 3.5)
+        self.assertEqual(weekly[(date(2025, 12, 29), "pcs")], 8)  # Thursday to Sunday
+        self.assertEqual(self.log.rollup()[(date(2026, 1, 1), "L")], 0.5)
+        with self.assertRaises(ValueError):
+            self.log.totals("2026-01-01", "2026-02-01", by="shelf")
+
+    def test_events_file_is_replayed(self):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        os.remove(path)
+        try:
+            log = WasteLog(self.inventory, path=path, clock=self.clock)
+            self.inventory.remove_item("Eggs")
+            log.detach()
+            reloaded = WasteLog(path=path)
+            self.assertEqual(len(reloaded), 1)
+            self.assertEqual(reloaded.totals("2026-03-10", "2026-03-11"), {("Eggs", "pcs"): 12})
+        finally:
+            os.remove(path)
+
+    def test_restart_does_not_relog_expired(self):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        os.remove(path)
+        try:
+            log = WasteLog(self.inventory, path=path, clock=self.clock)
+            ExpiryAlerts().mark_expired(self.inventory, log)
+            log.detach()
+            restarted = WasteLog(self.inventory, path=path, clock=self.clock)
+            self.assertEqual(restarted.events()[0].expiry_ordinal, self.inventory.get_item("Milk").expiry_ordinal)
+            ExpiryAlerts().mark_expired(self.inventory, restarted)
+            self.inventory.remove_item("Milk")
+            self.assertEqual(len(restarted), 1)
+            restarted.detach()
+            self.inventory.add_item("Milk", 1, "L", "2026-03-09")
+            again = WasteLog(self.inventory, path=path, clock=self.clock)
+            ExpiryAlerts().mark_expired(self.inventory, again)  # restocked with another date
+            self.assertEqual(len(again), 2)
+        finally:
+            os.remove(path)
+
+    def test_columnar_backend(self):
+        inventory = ColumnarInventory()
+        inventory.add_item("Milk", 2, "L", "2026-03-08")
+        log = WasteLog(inventory, clock=self.clock)
+        inventory.remove_item("Milk")
+        self.assertEqual([(e.kind, e.quantity) for e in log.events()], [(EXPIRED, 2)])
+
+    def test_lots_are_logged_once_each(self):
+        inventory = LotInventory()
+        inventory.add_item("Milk", 2, "L", "2020-01-01")
+        inventory.add_item("Milk", 3, "L", "2020-02-01")
+        inventory.add_item("Milk", 4, "L", "2099-02-01")
+        log = WasteLog(inventory, clock=self.clock)
+        for _ in range(3):
+            ExpiryAlerts().mark_expired(inventory, log)
+        self.assertEqual(sorted(e.quantity for e in log.events()), [2, 3])
+        inventory.remove_item("Milk")
+        self.assertEqual(sum(e.quantity for e in log.events()), 9)
+        self.assertEqual(len(log), 3)
+
+    def test_previous_quarter(self):
+        self.assertEqual(previous_quarter(date(2026, 5, 17)), (date(2026, 1, 1), date(2026, 4, 1)))
+        self.assertEqual(previous_quarter(date(2026, 2, 1)), (date(2025, 10, 1), date(2026, 1, 1)))
+
+
+class TestWasteReport(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock(datetime(2026, 4, 15, 9))
+        self.inventory = InventoryOperations()
+        self.log = WasteLog(self.inventory, clock=self.clock)
+        self.report = WasteReport(self.inventory, self.log)
+        start = datetime(2026, 1, 1)
+        for i in range(20000):
+            self.log.record(REMOVED, f"item{i % 500}", 1, "pcs" if i % 2 else "g", at=start + timedelta(days=i % 100))
+
+    def test_waste_by_item_last_quarter(self):
+        started = time.perf_counter()
+        rows = self.report.waste_by_item(*previous_quarter(self.clock.now.date()))
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(len(rows), 450)  # item k is wasted on day k % 100
+        self.assertEqual(sum(row["quantity"] for row in rows), 18000)  # days 0-89
+        self.assertEqual(set(rows[0]), {"name", "unit", "quantity"})
+        self.assertEqual(self.report.waste_by_item(*previous_quarter(self.clock.now.date())), rows)
+
+    def test_waste_by_unit_defaults(self):
+        rows = self.report.waste_by_unit()
+        self.assertEqual(rows, [{"unit": "g", "quantity": 10000}, {"unit": "pcs", "quantity": 10000}])
+        self.log.record(REMOVED, "Milk", 1, "L")
+        self.assertEqual(len(self.report.waste_by_unit()), 3)
+
+    def test_display_and_export(self):
+        rows = self.report.waste_by_item("2026-01-01", "2026-01-02")
+        with patch("sys.stdout", new=StringIO()) as fake_out:
+            self.report.display_waste(rows)
+            self.assertIn("item0: 40 g wasted", fake_out.getvalue())
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            self.assertEqual(self.report.export_waste(rows, path, fmt="csv"), len(rows))
+        finally:
+            os.remove(path)
+        with patch("sys.stdout", new=StringIO()) as fake_out:
+            self.report.display_waste([])
+            self.assertIn("Nothing was wasted.", fake_out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from freshfridge.reporting.writers import write_csv, write_jsonl, write_rows, write_text
+
+
+class TestWriters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.rows = [{"name": "Milk", "needed": 1}, {"name": "Jam, strawberry", "needed": 2}]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def read(self, name):
+        with open(os.path.join(self.tmpdir, name), newline="") as f:
+            return f.read()
+
+    def test_writers_stream_generators(self):
+        path = os.path.join(self.tmpdir, "out.txt")
+        self.assertEqual(write_text(iter(self.rows), path, "{name}: {needed}"), 2)
+        self.assertEqual(self.read("out.txt"), "Milk: 1\nJam, strawberry: 2\n")
+
+        path = os.path.join(self.tmpdir, "out.csv")
+        self.assertEqual(write_csv((row for row in self.rows), path), 2)
+        self.assertEqual(self.read("out.csv"), 'name,needed\r\nMilk,1\r\n"Jam, strawberry",2\r\n')
+
+        path = os.path.join(self.tmpdir, "out.jsonl")
+        self.assertEqual(write_jsonl(self.rows, path), 2)
+        self.assertEqual(self.read("out.jsonl").splitlines()[0], '{"name":"Milk","needed":1}')
+
+    def test_empty_and_invalid(self):
+        path = os.path.join(self.tmpdir, "empty.csv")
+        self.assertEqual(write_csv([], path), 0)
+        with self.assertRaises(ValueError):
+            write_rows(self.rows, path, fmt="xml")
+        with self.assertRaises(ValueError):
+            write_rows(self.rows, path, fmt="text")
+
+
+if __name__ == "__main__":
+    unittest.main()